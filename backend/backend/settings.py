@@ -89,13 +89,23 @@ if USE_CLOUDINARY and CLOUDINARY_PACKAGES_READY:
     ]
 
 
+# "fast" renders JSON through orjson (same output except NaN/Infinity, which become null;
+# falls back to json if orjson is missing).
+API_JSON_RENDERER = os.getenv("API_JSON_RENDERER", "fast").strip().lower()
+
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
         "rest_framework_simplejwt.authentication.JWTAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": (
         "rest_framework.permissions.IsAuthenticated",
-    )
+    ),
+    "DEFAULT_RENDERER_CLASSES": (
+        "skills.renderers.FastJSONRenderer"
+        if API_JSON_RENDERER == "fast"
+        else "rest_framework.renderers.JSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ),
 }
 
 AUTHENTICATION_BACKENDS = [
@@ -120,15 +130,18 @@ EMAIL_TIMEOUT = int(os.getenv("EMAIL_TIMEOUT", "15"))
 
 
 MIDDLEWARE = [
+    "skills.middleware.TracingMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     'django.middleware.security.SecurityMiddleware',
     "whitenoise.middleware.WhiteNoiseMiddleware",
+    "skills.middleware.SQLBudgetMiddleware",
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    "skills.middleware.RequestProfilerMiddleware",
 ]
 CORS_ALLOW_ALL_ORIGINS = False
 CORS_ALLOWED_ORIGINS = get_list_env(
@@ -279,6 +292,61 @@ SIMPLE_JWT = {
 }
 
 GROQ_API_KEY = os.getenv("GROQ_API_KEY")
+YOUTUBE_BASE_URL = os.getenv("YOUTUBE_BASE_URL", "https://www.youtube.com").strip()
+# Link validation for AI-generated courses runs concurrently (set to 1 for sequential).
+LINK_CHECK_CONCURRENCY = int(os.getenv("LINK_CHECK_CONCURRENCY", "16"))
+LINK_CHECK_DEADLINE_SECONDS = float(os.getenv("LINK_CHECK_DEADLINE_SECONDS", "45"))
+# Minimum similarity (pg_trgm or token-set) for reusing a generated course for a new skill name.
+SKILL_MATCH_THRESHOLD = float(os.getenv("SKILL_MATCH_THRESHOLD", "0.6"))
+# Background ai-generate jobs: "process" spawns a worker per job, "worker" leaves them for
+# a long-running `manage.py process_generation_jobs --loop`.
+COURSE_JOB_RUNNER = os.getenv("COURSE_JOB_RUNNER", "process").strip().lower()
+COURSE_JOB_STALE_SECONDS = int(os.getenv("COURSE_JOB_STALE_SECONDS", "900"))
+# How long a synchronous ai-generate waits for an identical in-flight generation before
+# answering 202 with that job's id.
+COURSE_JOB_COALESCE_WAIT_SECONDS = float(os.getenv("COURSE_JOB_COALESCE_WAIT_SECONDS", "30"))
+# Exams are sampled from a per-roadmap question bank, refilled in the background (see
+# COURSE_JOB_RUNNER) when fewer than EXAM_BANK_MIN_SIZE questions are active.
+EXAM_QUESTION_COUNT = int(os.getenv("EXAM_QUESTION_COUNT", "10"))
+EXAM_SHORT_ANSWER_COUNT = int(os.getenv("EXAM_SHORT_ANSWER_COUNT", "4"))
+EXAM_BANK_MIN_SIZE = int(os.getenv("EXAM_BANK_MIN_SIZE", "15"))
+EXAM_BANK_TARGET_SIZE = int(os.getenv("EXAM_BANK_TARGET_SIZE", "30"))
+EXAM_BANK_MAX_ROUNDS = int(os.getenv("EXAM_BANK_MAX_ROUNDS", "5"))
+# Retire a question after it was served this many times (0 = never).
+EXAM_QUESTION_MAX_SERVES = int(os.getenv("EXAM_QUESTION_MAX_SERVES", "0"))
+# Exam sessions: "signed" puts the encrypted answer key in the single-use session_key token,
+# "database" stores an ExamSession row per started exam. Both expire after EXAM_SESSION_MAX_AGE_SECONDS.
+EXAM_SESSION_BACKEND = os.getenv("EXAM_SESSION_BACKEND", "signed").strip().lower()
+EXAM_SESSION_MAX_AGE_SECONDS = int(os.getenv("EXAM_SESSION_MAX_AGE_SECONDS", "7200"))
+# Completed sub-maps per learner: "list" (JSON ids) or "bitmap" (compact bytes over the
+# course's sub-map ids). Rows keep their encoding until their progress is next saved.
+PROGRESS_ENCODING = os.getenv("PROGRESS_ENCODING", "list").strip().lower()
+# Rendered course detail JSON is cached per tree_version (0 disables the cache).
+COURSE_RESPONSE_CACHE_SECONDS = int(os.getenv("COURSE_RESPONSE_CACHE_SECONDS", str(24 * 3600)))
+# Per-request query counts, SQL time and repeated statements (Server-Timing header and the
+# "skills.sql" log); a statement run SQL_DUPLICATE_THRESHOLD times in one request is reported.
+SQL_INSTRUMENTATION = get_bool_env("SQL_INSTRUMENTATION", default=DEBUG)
+SQL_DUPLICATE_THRESHOLD = int(os.getenv("SQL_DUPLICATE_THRESHOLD", "3"))
+# Staff-only request profiling (X-Profile: 1 | memory, or ?profile=), stored as RequestProfile rows.
+REQUEST_PROFILING = get_bool_env("REQUEST_PROFILING", default=False)
+REQUEST_PROFILE_MAX_PER_HOUR = int(os.getenv("REQUEST_PROFILE_MAX_PER_HOUR", "20"))
+REQUEST_PROFILE_KEEP = int(os.getenv("REQUEST_PROFILE_KEEP", "200"))
+
+# Tracing spans (request, LLM calls, link checks, DB writes). The exporter is
+# "console" (stderr) or "file" (TRACING_FILE), both OTLP/JSON lines, or "otel"
+# for an OpenTelemetry SDK configured by the deployment.
+TRACING = get_bool_env("TRACING", default=False)
+TRACING_EXPORTER = os.getenv("TRACING_EXPORTER", "console").strip().lower()
+TRACING_FILE = os.getenv("TRACING_FILE", str(BASE_DIR / "traces.jsonl"))
+TRACING_SERVICE_NAME = os.getenv("OTEL_SERVICE_NAME", "skills-backend")
+# Cache of validated links: "local" LRU, "django" (CACHES) or "database" (VideoMetadata table).
+LINK_CACHE = {
+    "BACKEND": os.getenv("LINK_CACHE_BACKEND", "database").strip().lower(),
+    "MAX_ENTRIES": int(os.getenv("LINK_CACHE_MAX_ENTRIES", "5000")),
+    "TTL_SECONDS": int(os.getenv("LINK_CACHE_TTL_SECONDS", str(7 * 24 * 3600))),
+    "NEGATIVE_TTL_SECONDS": int(os.getenv("LINK_CACHE_NEGATIVE_TTL_SECONDS", str(6 * 3600))),
+    "DJANGO_CACHE_ALIAS": "default",
+}
 GOOGLE_CLIENT_ID = os.getenv("GOOGLE_CLIENT_ID", "")
 
 if IS_PRODUCTION:
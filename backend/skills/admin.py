@@ -1,13 +1,50 @@
 # skils/admin.py
 import nested_admin
 from django.contrib import admin
-from .models import CourseCard, Path, Roadmap, SubMap,Resource
+from django.core.exceptions import PermissionDenied
+from django.http import HttpResponse
+from django.shortcuts import get_object_or_404
+from django.urls import path, reverse
+from django.utils.html import format_html
+from .counters import deferred_counters
+from .models import (
+    CourseCard,
+    Path,
+    Roadmap,
+    SubMap,
+    Resource,
+    CourseGenerationJob,
+    Quiz,
+    QuizQuestion,
+    RequestProfile,
+    SkillAlias,
+    VideoMetadata,
+)
 
 # Custom Admin Branding
 admin.site.site_header = "LearnoWay Admin"
 admin.site.site_title = "LearnoWay Admin Portal"
 admin.site.index_title = "Welcome to LearnoWay Admin"
 
+
+class DeferredCountersMixin:
+    """Recount hierarchy counters once per admin save/delete instead of once per inline row."""
+
+    def changeform_view(self, *args, **kwargs):
+        with deferred_counters():
+            return super().changeform_view(*args, **kwargs)
+
+    def delete_view(self, *args, **kwargs):
+        with deferred_counters():
+            return super().delete_view(*args, **kwargs)
+
+    def delete_queryset(self, request, queryset):
+        # Per-object delete() so parent counters are recounted (queryset.delete() skips them).
+        with deferred_counters():
+            for obj in queryset:
+                obj.delete()
+
+
 # Inline Path model inside CourseCard
 class ResourceInline(nested_admin.NestedStackedInline):
     model = Resource
@@ -49,7 +86,7 @@ class PathInline(nested_admin.NestedStackedInline):
     readonly_fields = ("roadmap_count", )
 
 @admin.register(CourseCard)
-class CourseCardAdmin(nested_admin.NestedModelAdmin):
+class CourseCardAdmin(DeferredCountersMixin, nested_admin.NestedModelAdmin):
     list_display = (
         "title",
         "category",
@@ -103,7 +140,7 @@ class CourseCardAdmin(nested_admin.NestedModelAdmin):
 
 
 @admin.register(Path)
-class PathAdmin(admin.ModelAdmin):
+class PathAdmin(DeferredCountersMixin, admin.ModelAdmin):
     list_display = ("title", "course", "level", "duration")
     list_filter = ("level", "course")
     search_fields = ("title", "mini_desc")
@@ -117,7 +154,7 @@ class PathAdmin(admin.ModelAdmin):
 
 
 @admin.register(Roadmap)
-class RoadmapAdmin(admin.ModelAdmin):
+class RoadmapAdmin(DeferredCountersMixin, admin.ModelAdmin):
     list_display = ("title", "path", "duration", "sub_map_count", )
     readonly_fields = ("sub_map_count",)
     search_fields = ("title", "path__title")
@@ -125,17 +162,98 @@ class RoadmapAdmin(admin.ModelAdmin):
 
 
 @admin.register(SubMap)
-class SubMapAdmin(nested_admin.NestedModelAdmin):
+class SubMapAdmin(DeferredCountersMixin, nested_admin.NestedModelAdmin):
     inlines = [ResourceInline]
     list_display = ("title", "micro_desc", "roadmap", "resources_count", )
     readonly_fields = ("resources_count",)
 
 
 @admin.register(Resource)
-class ResourceAdmin(admin.ModelAdmin):
+class ResourceAdmin(DeferredCountersMixin, admin.ModelAdmin):
     list_display = (
         "sub_map",
         "link",
         "link_type",
         "language",
     )
+
+
+@admin.register(SkillAlias)
+class SkillAliasAdmin(admin.ModelAdmin):
+    list_display = ("key", "course", "created_at")
+    search_fields = ("key", "course__title")
+    raw_id_fields = ("course",)
+
+
+@admin.register(CourseGenerationJob)
+class CourseGenerationJobAdmin(admin.ModelAdmin):
+    list_display = ("skill", "preferred_language", "status", "stage", "progress", "course", "created_at")
+    list_filter = ("status", "stage")
+    search_fields = ("skill",)
+    readonly_fields = ("id", "course", "created_at", "started_at", "finished_at", "updated_at")
+
+
+@admin.register(VideoMetadata)
+class VideoMetadataAdmin(admin.ModelAdmin):
+    list_display = ("video_id", "title", "author", "embeddable", "checked_at")
+    list_filter = ("embeddable",)
+    search_fields = ("video_id", "title", "author")
+
+
+class QuizQuestionInline(admin.TabularInline):
+    model = QuizQuestion
+    extra = 0
+    fields = ("question_type", "question_text", "times_served")
+    readonly_fields = ("times_served",)
+
+    def has_add_permission(self, request, obj=None):
+        # Questions come from generation, which fingerprints them for de-duplication.
+        return False
+
+
+@admin.register(Quiz)
+class QuizAdmin(admin.ModelAdmin):
+    list_display = ("roadmap", "created_at", "refill_requested_at")
+    raw_id_fields = ("roadmap",)
+    inlines = [QuizQuestionInline]
+
+
+@admin.register(RequestProfile)
+class RequestProfileAdmin(admin.ModelAdmin):
+    list_display = ("created_at", "method", "path", "status_code", "duration_ms", "memory_peak_kib", "user", "download")
+    list_filter = ("method", "status_code")
+    search_fields = ("path", "view")
+    exclude = ("profile_data",)
+    readonly_fields = (
+        "user", "method", "path", "view", "status_code", "duration_ms", "memory_peak_kib",
+        "created_at", "download", "summary", "memory_summary",
+    )
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def get_urls(self):
+        return [
+            path(
+                "<int:pk>/download/",
+                self.admin_site.admin_view(self.download_view),
+                name="skills_requestprofile_download",
+            ),
+        ] + super().get_urls()
+
+    @admin.display(description="Profile")
+    def download(self, obj):
+        url = reverse("admin:skills_requestprofile_download", args=[obj.pk])
+        return format_html('<a href="{}">.prof</a>', url)
+
+    def download_view(self, request, pk):
+        """The raw pstats file; open it with pstats, snakeviz or similar."""
+        profile = get_object_or_404(RequestProfile, pk=pk)
+        if not self.has_view_permission(request, profile):
+            raise PermissionDenied
+        response = HttpResponse(bytes(profile.profile_data), content_type="application/octet-stream")
+        response["Content-Disposition"] = f'attachment; filename="request-profile-{profile.pk}.prof"'
+        return response
@@ -0,0 +1,105 @@
+import contextvars
+from contextlib import contextmanager
+
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+_DEFERRED: contextvars.ContextVar = contextvars.ContextVar("deferred_counters", default=None)
+
+LEVELS = ("course", "path", "roadmap", "sub_map")
+
+
+def mark_touched(level: str, parent_id) -> bool:
+    """
+    Record that a child of `parent_id` changed. Returns True when counters are
+    deferred, in which case the caller must skip its immediate recount.
+    """
+    touched = _DEFERRED.get()
+    if touched is None:
+        return False
+    if parent_id is not None:
+        touched[level].add(parent_id)
+    return True
+
+
+def _recount(model, ids, field: str, child_model, fk: str):
+    counts = (
+        child_model.objects.filter(**{fk: OuterRef("pk")})
+        .order_by()
+        .values(fk)
+        .annotate(n=Count("pk"))
+        .values("n")
+    )
+    model.objects.filter(pk__in=ids).update(**{field: Coalesce(Subquery(counts), 0)})
+
+
+def _touched_course_ids(touched: dict) -> set:
+    from .models import Path, Roadmap, SubMap
+
+    course_ids = set(touched["course"])
+    if touched["path"]:
+        course_ids.update(
+            Path.objects.filter(pk__in=touched["path"]).values_list("course_id", flat=True)
+        )
+    if touched["roadmap"]:
+        course_ids.update(
+            Roadmap.objects.filter(pk__in=touched["roadmap"]).values_list(
+                "path__course_id", flat=True
+            )
+        )
+    if touched["sub_map"]:
+        course_ids.update(
+            SubMap.objects.filter(pk__in=touched["sub_map"]).values_list(
+                "roadmap__path__course_id", flat=True
+            )
+        )
+    return course_ids
+
+
+def recount(touched: dict):
+    """
+    Recompute counters for the touched parents, one grouped UPDATE per level,
+    and bump tree_version of the courses they belong to.
+    """
+    from .models import CourseCard, Path, Roadmap, SubMap, Resource
+
+    course_ids = _touched_course_ids(touched)
+    if touched["sub_map"]:
+        _recount(SubMap, touched["sub_map"], "resources_count", Resource, "sub_map")
+    if touched["roadmap"]:
+        _recount(Roadmap, touched["roadmap"], "sub_map_count", SubMap, "roadmap")
+    if touched["path"]:
+        _recount(Path, touched["path"], "roadmap_count", Roadmap, "path")
+    if touched["course"]:
+        _recount(CourseCard, touched["course"], "path_count", Path, "course")
+    # Last, so a cache rebuilt for the new version already sees the new counters.
+    if course_ids:
+        CourseCard.objects.filter(pk__in=course_ids).update(tree_version=F("tree_version") + 1)
+
+
+@contextmanager
+def deferred_counters():
+    """
+    Suspend the save()/delete() counter cascade of the skills hierarchy.
+
+    Parents touched inside the block are recounted once on exit, so a batch
+    edit costs a constant number of counter queries. Nested blocks share the
+    outermost one.
+    """
+    if _DEFERRED.get() is not None:
+        yield
+        return
+
+    touched = {level: set() for level in LEVELS}
+    token = _DEFERRED.set(touched)
+    try:
+        yield
+    except Exception:
+        _DEFERRED.reset(token)
+        # Inside an atomic block the writes are rolled back; nothing to recount.
+        if not transaction.get_connection().in_atomic_block:
+            recount(touched)
+        raise
+    _DEFERRED.reset(token)
+    recount(touched)
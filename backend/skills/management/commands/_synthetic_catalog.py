@@ -0,0 +1,189 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+
+from skills.models import (
+    CourseCard,
+    DailyActivity,
+    Path,
+    Quiz,
+    QuizQuestion,
+    Resource,
+    Roadmap,
+    StageProgress,
+    SubMap,
+    UserCourseTracking,
+)
+from skills.services.exam_bank import question_fingerprint
+
+LANGUAGES = ("English", "Bangla", "Hindi")
+COURSE_TITLE_PREFIX = "Benchmark course "
+USERNAME_PREFIX = "bench-user-"
+
+
+def seed_catalog(courses: int, paths: int, stages: int, topics: int, resources: int = 1):
+    """
+    Bulk-insert synthetic courses for benchmarks and return their cards.
+    Counters are set directly since bulk_create bypasses save().
+    """
+    cards = CourseCard.objects.bulk_create(
+        CourseCard(
+            title=f"{COURSE_TITLE_PREFIX}{i}",
+            description="Synthetic course for benchmarking.",
+            duration="3 months",
+            path_count=paths,
+            tags=["bench"],
+        )
+        for i in range(courses)
+    )
+    path_rows = Path.objects.bulk_create(
+        Path(course=card, title=f"Path {p}", mini_desc="Path.", duration="1 month",
+             roadmap_count=stages)
+        for card in cards
+        for p in range(paths)
+    )
+    roadmaps = Roadmap.objects.bulk_create(
+        Roadmap(path=path, title=f"Stage {r}", micro_desc="Stage.", duration="1 week",
+                sub_map_count=topics)
+        for path in path_rows
+        for r in range(stages)
+    )
+    sub_maps = SubMap.objects.bulk_create(
+        SubMap(roadmap=roadmap, title=f"Topic {t}", micro_desc="Topic.",
+               resources_count=resources)
+        for roadmap in roadmaps
+        for t in range(topics)
+    )
+    Resource.objects.bulk_create(
+        Resource(
+            sub_map=sub_map,
+            language=LANGUAGES[i % len(LANGUAGES)],
+            link=f"https://example.com/{sub_map.pk}/{i}",
+        )
+        for sub_map in sub_maps
+        for i in range(resources)
+    )
+    return cards
+
+
+def synthetic_questions(topic: str, count: int, short_answers: int = 0, seed: int = 0) -> list[dict]:
+    """Exam question dicts shaped like generate_exam_for_roadmap output."""
+    questions = []
+    for i in range(count):
+        text = f"{topic}: synthetic question {seed}-{i}"
+        if i < short_answers:
+            questions.append(
+                {"type": "short_answer", "question_text": text, "expected_keywords": ["synthetic"]}
+            )
+        else:
+            questions.append(
+                {
+                    "type": "multiple_choice",
+                    "question_text": text,
+                    "options": ["A", "B", "C", "D"],
+                    "correct_index": i % 4,
+                }
+            )
+    return questions
+
+
+def seed_question_banks(cards, questions: int, short_answers: int):
+    """A full question bank for every roadmap of the given courses."""
+    roadmaps = list(Roadmap.objects.filter(path__course__in=cards).only("id", "title"))
+    quizzes = Quiz.objects.bulk_create(Quiz(roadmap=roadmap) for roadmap in roadmaps)
+    rows = []
+    for quiz, roadmap in zip(quizzes, roadmaps):
+        for order, q in enumerate(
+            synthetic_questions(roadmap.title, questions, short_answers, seed=roadmap.id)
+        ):
+            rows.append(
+                QuizQuestion(
+                    quiz=quiz,
+                    order=order,
+                    question_type=q["type"],
+                    question_text=q["question_text"],
+                    options=q.get("options", []),
+                    correct_index=q.get("correct_index"),
+                    expected_keywords=q.get("expected_keywords", []),
+                    fingerprint=question_fingerprint(q["question_text"]),
+                )
+            )
+    QuizQuestion.objects.bulk_create(rows, batch_size=2000)
+
+
+def seed_learners(cards, users: int, courses_per_user: int, days: int = 14):
+    """
+    Synthetic learners, each tracking `courses_per_user` of the courses with
+    half of the sub-maps completed, half of the stages passed and activity on
+    two of every three of the last `days` days. Returns the users.
+    """
+    User = get_user_model()
+    learners = User.objects.bulk_create(
+        User(username=f"{USERNAME_PREFIX}{i}", email=f"{USERNAME_PREFIX}{i}@example.com",
+             password="!")
+        for i in range(users)
+    )
+    if not cards or not learners:
+        return learners
+
+    course_ids = [card.pk for card in cards]
+    first_path = {}
+    for path_id, course_id in (
+        Path.objects.filter(course_id__in=course_ids).order_by("id").values_list("id", "course_id")
+    ):
+        first_path.setdefault(course_id, path_id)
+    sub_map_ids = {}
+    for sub_map_id, course_id in (
+        SubMap.objects.filter(roadmap__path__course_id__in=course_ids)
+        .order_by("id")
+        .values_list("id", "roadmap__path__course_id")
+    ):
+        sub_map_ids.setdefault(course_id, []).append(sub_map_id)
+    roadmap_ids = {}
+    for roadmap_id, course_id in (
+        Roadmap.objects.filter(path__course_id__in=course_ids)
+        .order_by("id")
+        .values_list("id", "path__course_id")
+    ):
+        roadmap_ids.setdefault(course_id, []).append(roadmap_id)
+
+    now = timezone.now()
+    today = timezone.localdate()
+    tracking, passed, activity = [], [], []
+    for n, user in enumerate(learners):
+        for k in range(min(courses_per_user, len(course_ids))):
+            course_id = course_ids[(n + k) % len(course_ids)]
+            completed = sub_map_ids.get(course_id, [])
+            tracking.append(
+                UserCourseTracking(
+                    user=user,
+                    course_id=course_id,
+                    selected_path_id=first_path.get(course_id),
+                    completed_sub_map_ids=completed[: len(completed) // 2],
+                    last_accessed_at=now - timedelta(hours=k),
+                    last_activity_at=now - timedelta(hours=k),
+                )
+            )
+            stages = roadmap_ids.get(course_id, [])
+            passed.extend(
+                StageProgress(user=user, roadmap_id=roadmap_id)
+                for roadmap_id in stages[: len(stages) // 2]
+            )
+            activity.extend(
+                DailyActivity(user=user, course_id=course_id, day=today - timedelta(days=d),
+                              count=1 + d % 3)
+                for d in range(days)
+                if d % 3 != 2
+            )
+    UserCourseTracking.objects.bulk_create(tracking, batch_size=2000)
+    StageProgress.objects.bulk_create(passed, batch_size=2000)
+    DailyActivity.objects.bulk_create(activity, batch_size=2000)
+    return learners
+
+
+def delete_synthetic_data() -> int:
+    """Remove seeded courses (their trees cascade) and learners. Returns the rows deleted."""
+    deleted, _ = CourseCard.objects.filter(title__startswith=COURSE_TITLE_PREFIX).delete()
+    users, _ = get_user_model().objects.filter(username__startswith=USERNAME_PREFIX).delete()
+    return deleted + users
@@ -0,0 +1,76 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+
+from skills.views import CourseViewSet
+
+from ._synthetic_catalog import seed_catalog
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the course list (summary cards, cursor pages and ?expand=tree) "
+        "against synthetic catalogs of growing size. Seeded rows are rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sizes", default="25,100,400",
+                            help="Comma-separated catalog sizes (courses)")
+        parser.add_argument("--paths", type=int, default=2)
+        parser.add_argument("--stages", type=int, default=3)
+        parser.add_argument("--topics", type=int, default=3)
+        parser.add_argument("--page-size", type=int, default=24)
+        parser.add_argument("--repeat", type=int, default=5)
+
+    def _measure(self, view, factory, params, repeat):
+        timings = []
+        with CaptureQueriesContext(connection) as queries:
+            view(factory.get("/api/skills/courses/", params)).render()
+        for _ in range(repeat):
+            started = time.perf_counter()
+            view(factory.get("/api/skills/courses/", params)).render()
+            timings.append(time.perf_counter() - started)
+        return statistics.median(timings) * 1000, len(queries)
+
+    def handle(self, *args, **options):
+        sizes = [int(size) for size in options["sizes"].split(",") if size.strip()]
+        factory = RequestFactory(HTTP_HOST="localhost")
+        view = CourseViewSet.as_view({"get": "list"})
+        page = {"page_size": options["page_size"]}
+        variants = [
+            ("cards, page", page),
+            ("cards, all", {}),
+            ("tree, page", {**page, "expand": "tree"}),
+            ("tree, all (old list)", {"expand": "tree"}),
+        ]
+
+        self.stdout.write(
+            f"{'courses':>8}  " + "  ".join(f"{name:>22}" for name, _ in variants)
+        )
+        try:
+            with transaction.atomic():
+                seeded = 0
+                for size in sorted(sizes):
+                    seed_catalog(size - seeded, options["paths"], options["stages"], options["topics"])
+                    seeded = size
+                    cells = []
+                    for _, params in variants:
+                        ms, query_count = self._measure(view, factory, params, options["repeat"])
+                        cells.append(f"{ms:9.1f} ms {query_count:3d} q")
+                    self.stdout.write(f"{size:>8}  " + "  ".join(f"{c:>22}" for c in cells))
+                raise _Rollback
+        except _Rollback:
+            pass
+        self.stdout.write(
+            self.style.SUCCESS(
+                "Median latency per request; a cursor page of cards should stay flat as the catalog grows."
+            )
+        )
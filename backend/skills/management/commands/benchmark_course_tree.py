@@ -0,0 +1,79 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from rest_framework.renderers import JSONRenderer
+
+from skills.models import CourseCard
+from skills.serializers import CourseSerializer
+from skills.services.course_tree import course_tree
+
+from ._synthetic_catalog import seed_catalog
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare CourseSerializer with the values()-based course_tree assembler on one "
+        "synthetic course. Seeded rows are rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--paths", type=int, default=4)
+        parser.add_argument("--stages", type=int, default=24)
+        parser.add_argument("--topics", type=int, default=12)
+        parser.add_argument("--resources", type=int, default=3)
+        parser.add_argument("--repeat", type=int, default=5)
+
+    def _measure(self, render, repeat):
+        with CaptureQueriesContext(connection) as queries:
+            body = render()
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            render()
+            timings.append(time.perf_counter() - started)
+        return body, statistics.median(timings) * 1000, len(queries)
+
+    def handle(self, *args, **options):
+        renderer = JSONRenderer()
+
+        def serializer_render(course_id):
+            course = CourseCard.objects.prefetch_related(
+                "path_items__roadmaps__sub_maps__resources"
+            ).get(pk=course_id)
+            return renderer.render(CourseSerializer(course).data)
+
+        def assembler_render(course_id):
+            return renderer.render(course_tree(course_id))
+
+        try:
+            with transaction.atomic():
+                (card,) = seed_catalog(
+                    1, options["paths"], options["stages"], options["topics"], options["resources"]
+                )
+                old_body, old_ms, old_queries = self._measure(
+                    lambda: serializer_render(card.pk), options["repeat"]
+                )
+                new_body, new_ms, new_queries = self._measure(
+                    lambda: assembler_render(card.pk), options["repeat"]
+                )
+                raise _Rollback
+        except _Rollback:
+            pass
+
+        if old_body != new_body:
+            raise CommandError("course_tree output differs from CourseSerializer.")
+
+        shape = f"{options['paths']}x{options['stages']}x{options['topics']}"
+        self.stdout.write(f"Course {shape}, {options['resources']} resources per topic, {len(new_body)} bytes")
+        self.stdout.write(f"CourseSerializer: {old_ms:.1f} ms, {old_queries} queries")
+        self.stdout.write(f"course_tree:      {new_ms:.1f} ms, {new_queries} queries")
+        self.stdout.write(
+            self.style.SUCCESS(f"Outputs identical, speedup x{old_ms / max(new_ms, 1e-9):.1f}")
+        )
@@ -0,0 +1,96 @@
+import datetime
+import decimal
+import statistics
+import time
+import tracemalloc
+import uuid
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+from django.utils.translation import gettext_lazy
+from rest_framework.renderers import JSONRenderer
+
+from skills.renderers import FastJSONRenderer, orjson
+from skills.services.course_tree import course_tree
+
+from ._synthetic_catalog import seed_catalog
+
+
+class _Rollback(Exception):
+    pass
+
+
+def _dashboard_payload(rows: int) -> dict:
+    """Dashboard-shaped data with the non-JSON types views return."""
+    now = timezone.now()
+    return {
+        "active_skills": [
+            {
+                "course_id": i,
+                "title": f"Course {i} – বাংলা",
+                "progress_pct": decimal.Decimal("42.50"),
+                "last_activity": now - datetime.timedelta(hours=i, microseconds=i),
+                "next_stage_title": gettext_lazy("Completed"),
+                "started": datetime.date(2026, 1, 1) + datetime.timedelta(days=i),
+                "session": uuid.UUID(int=i),
+                "line_separator": "a\u2028b",
+            }
+            for i in range(rows)
+        ],
+        "streak": 3,
+    }
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare DRF's JSONRenderer with FastJSONRenderer on a generated course tree "
+        "and a dashboard-shaped payload: identical bytes, render time and peak memory."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--paths", type=int, default=4)
+        parser.add_argument("--stages", type=int, default=24)
+        parser.add_argument("--topics", type=int, default=12)
+        parser.add_argument("--resources", type=int, default=3)
+        parser.add_argument("--dashboard-rows", type=int, default=500)
+        parser.add_argument("--repeat", type=int, default=10)
+
+    def _measure(self, renderer, data, repeat):
+        tracemalloc.start()
+        body = renderer.render(data)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            renderer.render(data)
+            timings.append(time.perf_counter() - started)
+        return body, statistics.median(timings) * 1000, peak
+
+    def handle(self, *args, **options):
+        if orjson is None:
+            self.stdout.write(self.style.WARNING("orjson is not installed; FastJSONRenderer uses json."))
+        try:
+            with transaction.atomic():
+                (card,) = seed_catalog(
+                    1, options["paths"], options["stages"], options["topics"], options["resources"]
+                )
+                tree = course_tree(card.pk)
+                raise _Rollback
+        except _Rollback:
+            pass
+
+        payloads = [
+            (f"course {options['paths']}x{options['stages']}x{options['topics']}", tree),
+            (f"dashboard x{options['dashboard_rows']}", _dashboard_payload(options["dashboard_rows"])),
+        ]
+        for name, data in payloads:
+            old_body, old_ms, old_peak = self._measure(JSONRenderer(), data, options["repeat"])
+            new_body, new_ms, new_peak = self._measure(FastJSONRenderer(), data, options["repeat"])
+            if old_body != new_body:
+                raise CommandError(f"{name}: FastJSONRenderer output differs from JSONRenderer.")
+            self.stdout.write(f"{name} ({len(new_body)} bytes)")
+            self.stdout.write(f"  JSONRenderer:     {old_ms:7.2f} ms, peak {old_peak / 1024:8.1f} KiB")
+            self.stdout.write(f"  FastJSONRenderer: {new_ms:7.2f} ms, peak {new_peak / 1024:8.1f} KiB")
+        self.stdout.write(self.style.SUCCESS("Outputs identical"))
@@ -0,0 +1,149 @@
+import hashlib
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test import override_settings
+
+from skills.services import groq_ai
+from skills.services.link_cache import link_cache_stats, reset_link_caches
+
+
+class _StubYouTubeHandler(BaseHTTPRequestHandler):
+    """Answers oEmbed and search requests like YouTube, after a fixed delay."""
+
+    latency = 0.02
+
+    def log_message(self, format, *args):
+        return
+
+    def _send(self, status_code, body, content_type):
+        data = body.encode("utf-8")
+        self.send_response(status_code)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        time.sleep(self.latency)
+        parsed = urlparse(self.path)
+        params = parse_qs(parsed.query)
+        if parsed.path == "/oembed":
+            video_url = params.get("url", [""])[0]
+            # Ids starting with "dead" behave like removed / non-embeddable videos.
+            if "v=dead" in video_url:
+                self._send(404, "Not Found", "text/plain")
+                return
+            body = json.dumps({"title": "Rustlang full course", "author_name": "Stub Academy"})
+            self._send(200, body, "application/json")
+            return
+        if parsed.path == "/results":
+            query = params.get("search_query", [""])[0]
+            digest = hashlib.sha1(query.encode("utf-8")).hexdigest()
+            video_ids = ["dead" + digest[:7], digest[7:18], digest[18:29]]
+            body = "".join(f'"videoId":"{vid}"' for vid in video_ids)
+            body += f'"playlistId":"PL{digest[:16]}"'
+            self._send(200, body, "text/html")
+            return
+        self._send(404, "Not Found", "text/plain")
+
+
+def _synthetic_payload(paths: int, stages: int, topics: int) -> dict:
+    raw_paths = []
+    for p in range(paths):
+        roadmaps = []
+        for r in range(stages):
+            sub_maps = []
+            for t in range(topics):
+                seed = f"{p}-{r}-{t}"
+                digest = hashlib.sha1(seed.encode("utf-8")).hexdigest()
+                sub_maps.append(
+                    {
+                        "title": f"Ownership topic {t + 1}",
+                        "micro_desc": "Borrowing and lifetimes.",
+                        "resources": [
+                            {"language": "English", "link_type": "Video",
+                             "link": f"https://www.youtube.com/watch?v={digest[:11]}"},
+                            {"language": "English", "link_type": "Video",
+                             "link": f"https://www.youtube.com/watch?v=dead{digest[11:18]}"},
+                            # Shared across topics to exercise de-duplication.
+                            {"language": "Hindi", "link_type": "Video",
+                             "link": "https://www.youtube.com/watch?v=sharedvideo1"},
+                            {"language": "English", "link_type": "Web-Docs",
+                             "link": "https://developer.mozilla.org/en-US/docs/rustlang"},
+                        ],
+                    }
+                )
+            roadmaps.append(
+                {"title": f"Stage {r + 1}", "micro_desc": "Practice.", "duration": "1 week",
+                 "sub_maps": sub_maps}
+            )
+        raw_paths.append(
+            {"title": f"Path {p + 1}", "mini_desc": "Path.", "level": "beginner",
+             "duration": "3 months", "roadmaps": roadmaps}
+        )
+    return {"course": {"title": "Rustlang"}, "paths": raw_paths}
+
+
+class Command(BaseCommand):
+    help = "Benchmark sequential vs concurrent AI course link validation against a local stub server"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--paths", type=int, default=2)
+        parser.add_argument("--stages", type=int, default=4)
+        parser.add_argument("--topics", type=int, default=4)
+        parser.add_argument("--latency-ms", type=int, default=20)
+        parser.add_argument("--concurrency", type=int, default=16)
+
+    def _run(self, payload, concurrency):
+        reset_link_caches()
+        with override_settings(LINK_CHECK_CONCURRENCY=concurrency):
+            started = time.perf_counter()
+            result = groq_ai._sanitize_course_payload("Rustlang", payload, "Bangla")
+            return result, time.perf_counter() - started, link_cache_stats()
+
+    def handle(self, *args, **options):
+        _StubYouTubeHandler.latency = options["latency_ms"] / 1000
+        ThreadingHTTPServer.request_queue_size = 128
+        server = ThreadingHTTPServer(("127.0.0.1", 0), _StubYouTubeHandler)
+        server.daemon_threads = True
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        base_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+        payload = _synthetic_payload(options["paths"], options["stages"], options["topics"])
+        try:
+            # Cold in-process caches for both runs, so each one does the full network work.
+            with override_settings(YOUTUBE_BASE_URL=base_url, LINK_CACHE={"BACKEND": "local"}):
+                sequential, sequential_s, _ = self._run(payload, 1)
+                concurrent, concurrent_s, cache_stats = self._run(
+                    payload, options["concurrency"]
+                )
+        finally:
+            server.shutdown()
+            server.server_close()
+            reset_link_caches()
+
+        if sequential != concurrent:
+            raise CommandError("Concurrent validation output differs from the sequential path.")
+
+        topics = options["paths"] * options["stages"] * options["topics"]
+        self.stdout.write(f"Topics validated: {topics}")
+        self.stdout.write(f"Sequential: {sequential_s:.2f}s")
+        self.stdout.write(
+            f"Concurrent ({options['concurrency']} workers): {concurrent_s:.2f}s"
+        )
+        for namespace, stats in cache_stats.items():
+            self.stdout.write(
+                f"Link cache [{namespace}]: {stats['hits']} hits, {stats['misses']} misses, "
+                f"{stats['size']} entries"
+            )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Outputs identical, speedup x{sequential_s / max(concurrent_s, 1e-9):.1f}"
+            )
+        )
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from skills.services.exam_sessions import delete_expired_exam_sessions
+
+
+class Command(BaseCommand):
+    help = "Delete ExamSession rows older than EXAM_SESSION_MAX_AGE_SECONDS (abandoned exams) and expired submitted-token ids"
+
+    def handle(self, *args, **kwargs):
+        deleted = delete_expired_exam_sessions()
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} expired exam session(s)."))
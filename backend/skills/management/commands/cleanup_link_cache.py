@@ -0,0 +1,26 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils.timezone import now
+
+from skills.models import VideoMetadata
+from skills.services.link_cache import link_cache_config
+
+
+class Command(BaseCommand):
+    help = "Delete expired VideoMetadata rows from the link validation cache"
+
+    def handle(self, *args, **kwargs):
+        config = link_cache_config()
+        fresh_cutoff = now() - timedelta(seconds=config["TTL_SECONDS"])
+        negative_cutoff = now() - timedelta(seconds=config["NEGATIVE_TTL_SECONDS"])
+        deleted, _ = VideoMetadata.objects.filter(checked_at__lt=fresh_cutoff).delete()
+        deleted_negative, _ = VideoMetadata.objects.filter(
+            embeddable=False, checked_at__lt=negative_cutoff
+        ).delete()
+        remaining = VideoMetadata.objects.count()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Deleted {deleted + deleted_negative} expired video check(s), {remaining} cached."
+            )
+        )
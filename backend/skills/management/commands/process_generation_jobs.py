@@ -0,0 +1,37 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from skills.services.exam_bank import pending_refills, refill_bank
+from skills.services.generation_jobs import claim_job, fail_stale_jobs, run_generation_job
+
+
+class Command(BaseCommand):
+    help = (
+        "Run queued AI course generation jobs (one job with --job, or poll with --loop). "
+        "The loop also runs pending exam question bank refills."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--job", help="Run only this job id")
+        parser.add_argument("--loop", action="store_true", help="Keep polling for new jobs")
+        parser.add_argument("--interval", type=float, default=2.0, help="Polling interval in seconds")
+
+    def handle(self, *args, **options):
+        while True:
+            fail_stale_jobs()
+            job = claim_job(options["job"])
+            if job is not None:
+                job = run_generation_job(job)
+                self.stdout.write(f"Job {job.id} ({job.skill}): {job.status}")
+                if options["job"]:
+                    return
+                continue
+            if not options["loop"]:
+                return
+            quiz = pending_refills().first()
+            if quiz is not None:
+                added = refill_bank(quiz)
+                self.stdout.write(f"Question bank for roadmap {quiz.roadmap_id}: {added} added")
+                continue
+            time.sleep(options["interval"])
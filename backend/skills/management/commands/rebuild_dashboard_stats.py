@@ -0,0 +1,26 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+
+from skills.models import StageProgress, UserCourseTracking
+from skills.services.dashboard_stats import rebuild_user_stats
+
+
+class Command(BaseCommand):
+    help = "Recompute materialized dashboard stats (all learners, or one with --user)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--user", type=int, help="Only rebuild this user id")
+
+    def handle(self, *args, **options):
+        users = get_user_model().objects.order_by("id")
+        if options["user"]:
+            users = users.filter(pk=options["user"])
+        else:
+            learner_ids = set(UserCourseTracking.objects.values_list("user_id", flat=True))
+            learner_ids |= set(StageProgress.objects.values_list("user_id", flat=True))
+            users = users.filter(pk__in=learner_ids)
+        rebuilt = 0
+        for user in users.iterator():
+            rebuild_user_stats(user)
+            rebuilt += 1
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt dashboard stats for {rebuilt} user(s)."))
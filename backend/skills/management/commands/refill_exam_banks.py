@@ -0,0 +1,35 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from skills.models import Quiz, Roadmap
+from skills.services.exam_bank import active_questions, pending_refills, refill_bank
+
+
+class Command(BaseCommand):
+    help = "Fill exam question banks (one roadmap with --roadmap, pending refills, or --all below minimum)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--roadmap", type=int, help="Refill only this roadmap's bank")
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="Fill every roadmap whose bank is below EXAM_BANK_MIN_SIZE",
+        )
+
+    def handle(self, *args, **options):
+        if options["roadmap"]:
+            quiz, _ = Quiz.objects.get_or_create(roadmap_id=options["roadmap"])
+            quizzes = [quiz]
+        elif options["all"]:
+            minimum = int(getattr(settings, "EXAM_BANK_MIN_SIZE", 15))
+            quizzes = []
+            for roadmap in Roadmap.objects.order_by("id"):
+                quiz, _ = Quiz.objects.get_or_create(roadmap=roadmap)
+                if active_questions(quiz).count() < minimum:
+                    quizzes.append(quiz)
+        else:
+            quizzes = list(pending_refills())
+
+        for quiz in quizzes:
+            added = refill_bank(quiz)
+            self.stdout.write(f"Roadmap {quiz.roadmap_id}: {added} question(s) added")
@@ -0,0 +1,219 @@
+import contextlib
+import json
+import platform
+import statistics
+import time
+import tracemalloc
+from pathlib import Path as FilePath
+from unittest import mock
+
+import django
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, reset_queries, transaction
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from skills.models import CourseCard, Roadmap, UserCourseTracking
+
+from ._synthetic_catalog import COURSE_TITLE_PREFIX, USERNAME_PREFIX, synthetic_questions
+
+
+class _Rollback(Exception):
+    pass
+
+
+def _percentile(sorted_values, pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def _stub_exam(roadmap):
+    return synthetic_questions(roadmap.title, 20, 4, seed=roadmap.id)
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the skills API against the data from seed_benchmark_data: latency "
+        "percentiles, SQL queries and peak memory per scenario, written as JSON and "
+        "optionally compared with a baseline file. Writes are rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--repeat", type=int, default=30, help="Timed requests per scenario")
+        parser.add_argument("--warmup", type=int, default=3)
+        parser.add_argument("--scenario", action="append", help="Only run these scenarios")
+        parser.add_argument("--output", help="Write results JSON to this file")
+        parser.add_argument("--baseline", help="Compare with results JSON from an earlier run")
+        parser.add_argument(
+            "--max-regression",
+            type=float,
+            help="Exit with an error when a p50 latency grows by more than this percentage",
+        )
+
+    def _scenarios(self, client, course, roadmap, sub_map_id):
+        course_url = f"/api/skills/courses/{course.pk}/"
+        exam_url = f"/api/skills/roadmaps/{roadmap.pk}/exam/"
+        uncached = override_settings(COURSE_RESPONSE_CACHE_SECONDS=0)
+
+        def submit_setup():
+            exam = client.get(exam_url).json()
+            answers = [0 if q["type"] == "multiple_choice" else "synthetic" for q in exam["questions"]]
+            return {"session_key": exam["session_key"], "answers": answers}
+
+        def progress_body():
+            return {"add": [sub_map_id], "track_activity": True}
+
+        # name -> (method, url, setup returning the POST body or None, context manager or None)
+        return {
+            "course_list": ("get", "/api/skills/courses/", None, None),
+            "course_list_page": ("get", "/api/skills/courses/?page_size=24", None, None),
+            "course_list_tree_page": ("get", "/api/skills/courses/?expand=tree&page_size=24", None, None),
+            "course_detail": ("get", course_url, None, None),
+            "course_detail_uncached": ("get", course_url, None, uncached),
+            "course_detail_language": ("get", f"{course_url}?language=english", None, None),
+            "course_detail_shallow": ("get", f"{course_url}?depth=2&fields=id,title,path_items,roadmaps", None, None),
+            "dashboard_summary": ("get", "/api/skills/courses/dashboard-summary/", None, None),
+            "user_progress_get": ("get", f"{course_url}user-progress/", None, None),
+            "user_progress_post": ("post", f"{course_url}user-progress/", progress_body, None),
+            "get_exam": ("get", exam_url, None, None),
+            "submit_exam": ("post", f"{exam_url}submit/", submit_setup, None),
+        }
+
+    def _request(self, client, method, url, body):
+        if method == "post":
+            return client.post(url, body, format="json")
+        return client.get(url)
+
+    def _run_scenario(self, client, method, url, setup, context, repeat, warmup):
+        with context or contextlib.nullcontext():
+            for _ in range(warmup):
+                response = self._request(client, method, url, setup() if setup else None)
+                if response.status_code >= 400:
+                    raise CommandError(f"{method.upper()} {url} returned {response.status_code}")
+
+            timings = []
+            for _ in range(repeat):
+                body = setup() if setup else None
+                started = time.perf_counter()
+                self._request(client, method, url, body)
+                timings.append((time.perf_counter() - started) * 1000)
+
+            body = setup() if setup else None
+            # request_started clears the query log; start from empty so nothing is lost.
+            reset_queries()
+            with CaptureQueriesContext(connection) as queries:
+                response = self._request(client, method, url, body)
+            # Count now: the captured slice is read from the live log, which the next request clears.
+            query_count = len(queries)
+
+            body = setup() if setup else None
+            tracemalloc.start()
+            self._request(client, method, url, body)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+        timings.sort()
+        return {
+            "requests": repeat,
+            "p50_ms": round(_percentile(timings, 50), 3),
+            "p90_ms": round(_percentile(timings, 90), 3),
+            "p99_ms": round(_percentile(timings, 99), 3),
+            "mean_ms": round(statistics.fmean(timings), 3) if timings else 0.0,
+            "max_ms": round(timings[-1], 3) if timings else 0.0,
+            "queries": query_count,
+            "peak_kib": round(peak / 1024, 1),
+            "response_bytes": len(response.content),
+        }
+
+    def _dataset(self):
+        user = (
+            get_user_model().objects.filter(username__startswith=USERNAME_PREFIX).order_by("id").first()
+        )
+        if user is None:
+            raise CommandError("No benchmark data; run seed_benchmark_data first.")
+        tracking = (
+            UserCourseTracking.objects.filter(user=user).select_related("course").order_by("id").first()
+        )
+        if tracking is None:
+            raise CommandError("The first benchmark learner tracks no course; reseed with --users/--courses-per-user.")
+        roadmap = Roadmap.objects.filter(path__course=tracking.course).order_by("id").last()
+        sub_map_id = roadmap.sub_maps.order_by("id").values_list("id", flat=True).last()
+        return user, tracking.course, roadmap, sub_map_id
+
+    def handle(self, *args, **options):
+        user, course, roadmap, sub_map_id = self._dataset()
+        client = APIClient(HTTP_HOST="localhost")
+        client.force_authenticate(user)
+        scenarios = self._scenarios(client, course, roadmap, sub_map_id)
+        selected = options["scenario"] or list(scenarios)
+        unknown = sorted(set(selected) - set(scenarios))
+        if unknown:
+            raise CommandError(f"Unknown scenario(s): {', '.join(unknown)}. Known: {', '.join(scenarios)}")
+
+        results = {}
+        # The LLM is never called: exam banks are seeded and the generator is stubbed;
+        # background refills are left to the (not running) worker.
+        with mock.patch("skills.services.exam_bank.generate_exam_for_roadmap", _stub_exam), \
+                override_settings(COURSE_JOB_RUNNER="worker"):
+            try:
+                with transaction.atomic():
+                    for name in selected:
+                        method, url, setup, context = scenarios[name]
+                        results[name] = self._run_scenario(
+                            client, method, url, setup, context, options["repeat"], options["warmup"]
+                        )
+                        self._print_row(name, results[name])
+                    raise _Rollback
+            except _Rollback:
+                pass
+
+        report = {
+            "meta": {
+                "created_at": timezone.now().isoformat(),
+                "python": platform.python_version(),
+                "django": django.get_version(),
+                "database": connection.vendor,
+                "courses": CourseCard.objects.filter(title__startswith=COURSE_TITLE_PREFIX).count(),
+                "repeat": options["repeat"],
+            },
+            "scenarios": results,
+        }
+        if options["output"]:
+            FilePath(options["output"]).write_text(json.dumps(report, indent=2) + "\n")
+            self.stdout.write(f"Results written to {options['output']}")
+        if options["baseline"]:
+            self._compare(report, json.loads(FilePath(options["baseline"]).read_text()), options["max_regression"])
+
+    def _print_row(self, name, result):
+        self.stdout.write(
+            f"{name:<24} p50 {result['p50_ms']:8.2f} ms  p90 {result['p90_ms']:8.2f} ms  "
+            f"p99 {result['p99_ms']:8.2f} ms  {result['queries']:3d} q  {result['peak_kib']:9.1f} KiB"
+        )
+
+    def _compare(self, report, baseline, max_regression):
+        self.stdout.write("")
+        self.stdout.write(f"Compared with baseline from {baseline.get('meta', {}).get('created_at', '?')}:")
+        regressions = []
+        for name, result in report["scenarios"].items():
+            before = baseline.get("scenarios", {}).get(name)
+            if before is None:
+                self.stdout.write(f"{name:<24} (not in baseline)")
+                continue
+            change = (result["p50_ms"] - before["p50_ms"]) / max(before["p50_ms"], 1e-9) * 100
+            self.stdout.write(
+                f"{name:<24} p50 {before['p50_ms']:8.2f} -> {result['p50_ms']:8.2f} ms ({change:+6.1f}%)  "
+                f"queries {before['queries']} -> {result['queries']}  "
+                f"peak {before['peak_kib']:.0f} -> {result['peak_kib']:.0f} KiB"
+            )
+            if max_regression is not None and change > max_regression:
+                regressions.append(name)
+        if regressions:
+            raise CommandError(
+                f"p50 regressed by more than {max_regression}%: {', '.join(regressions)}"
+            )
+
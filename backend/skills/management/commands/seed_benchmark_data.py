@@ -0,0 +1,57 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from skills.services.dashboard_stats import rebuild_user_stats
+
+from ._synthetic_catalog import (
+    delete_synthetic_data,
+    seed_catalog,
+    seed_learners,
+    seed_question_banks,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a synthetic catalog (courses x paths x stages x topics x resources), exam "
+        "banks and learners with progress for run_benchmarks. Replaces earlier seeded data."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--courses", type=int, default=50)
+        parser.add_argument("--paths", type=int, default=3)
+        parser.add_argument("--stages", type=int, default=8)
+        parser.add_argument("--topics", type=int, default=6)
+        parser.add_argument("--resources", type=int, default=3, help="Resources per topic")
+        parser.add_argument("--users", type=int, default=50)
+        parser.add_argument("--courses-per-user", type=int, default=4)
+        parser.add_argument("--questions", type=int, default=20, help="Exam bank size per stage")
+        parser.add_argument("--short-answers", type=int, default=4)
+        parser.add_argument("--flush", action="store_true", help="Only delete seeded data")
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            deleted = delete_synthetic_data()
+            if deleted:
+                self.stdout.write(f"Deleted {deleted} previously seeded row(s).")
+            if options["flush"]:
+                return
+            cards = seed_catalog(
+                options["courses"],
+                options["paths"],
+                options["stages"],
+                options["topics"],
+                options["resources"],
+            )
+            seed_question_banks(cards, options["questions"], options["short_answers"])
+            learners = seed_learners(cards, options["users"], options["courses_per_user"])
+            for user in learners:
+                rebuild_user_stats(user)
+
+        sub_maps = options["courses"] * options["paths"] * options["stages"] * options["topics"]
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Seeded {len(cards)} course(s), {sub_maps} sub-map(s), "
+                f"{sub_maps * options['resources']} resource(s) and {len(learners)} learner(s)."
+            )
+        )
@@ -0,0 +1,245 @@
+import cProfile
+import json
+import logging
+import re
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+from rest_framework.exceptions import APIException
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+from .services import tracing
+from .services.request_profiles import claim_profile_slot, save_profile
+
+logger = logging.getLogger("skills.sql")
+
+_WHITESPACE = re.compile(r"\s+")
+_LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+\b")
+_TRANSACTION_CONTROL = ("BEGIN", "COMMIT", "ROLLBACK", "SAVEPOINT", "RELEASE")
+_MEMORY_FRAMES = 8
+_ROUTE_GROUP = re.compile(r"\(\?P<(\w+)>[^)]*\)")
+
+
+def query_budget(budget: int):
+    """Declare the query budget of a function view (viewsets use query_budgets)."""
+    def decorator(view_func):
+        view_func.query_budget = budget
+        return view_func
+    return decorator
+
+
+def _statement_pattern(sql: str) -> str:
+    # Parameters are usually placeholders already; inlined literals are masked too.
+    return _LITERALS.sub("?", _WHITESPACE.sub(" ", sql).strip())
+
+
+class QueryStats:
+    """Queries run while handling one request, recorded through connection.execute_wrapper."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.patterns = Counter()
+        self.view = None
+        self.budget = None
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - started
+            self.count += 1
+            pattern = _statement_pattern(sql)
+            if not pattern.upper().startswith(_TRANSACTION_CONTROL):
+                self.patterns[pattern] += 1
+
+    def duplicates(self, threshold: int = 2) -> list[tuple[str, int]]:
+        """Statements (parameters masked) run at least `threshold` times, most frequent first."""
+        return [(sql, n) for sql, n in self.patterns.most_common() if n >= threshold]
+
+    @property
+    def over_budget(self) -> bool:
+        return self.budget is not None and self.count > self.budget
+
+    def report(self, threshold: int = 2) -> str:
+        lines = [f"{self.count} queries in {self.duration * 1000:.1f} ms"]
+        lines.extend(f"  {n}x {sql}" for sql, n in self.duplicates(threshold))
+        return "\n".join(lines)
+
+
+class SQLBudgetMiddleware:
+    """
+    Per-request SQL instrumentation, on while SQL_INSTRUMENTATION is set.
+
+    Counts queries, total SQL time and repeated statements for every request
+    and reports them in a Server-Timing header and the "skills.sql" log. A
+    viewset declares budgets per action in `query_budgets` (function views via
+    @query_budget); requests over budget are logged as warnings. The stats are
+    left on the response as `sql_stats` for skills.testing. Queries of a
+    streaming body run after the response is returned and are not counted.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not getattr(settings, "SQL_INSTRUMENTATION", False):
+            return self.get_response(request)
+        stats = QueryStats()
+        request.sql_stats = stats
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(stats))
+            response = self.get_response(request)
+        elapsed = time.perf_counter() - started
+
+        threshold = int(getattr(settings, "SQL_DUPLICATE_THRESHOLD", 3))
+        duplicates = stats.duplicates(threshold)
+        response.sql_stats = stats
+        response["Server-Timing"] = ", ".join(
+            [
+                f'db;dur={stats.duration * 1000:.1f};desc="{stats.count} queries"',
+                f'dbdup;desc="{len(duplicates)} repeated"',
+                f"app;dur={elapsed * 1000:.1f}",
+            ]
+        )
+
+        record = {
+            "method": request.method,
+            "path": request.path,
+            "status": response.status_code,
+            "view": stats.view,
+            "queries": stats.count,
+            "budget": stats.budget,
+            "sql_ms": round(stats.duration * 1000, 2),
+            "total_ms": round(elapsed * 1000, 2),
+            "repeated": [{"sql": sql[:300], "count": n} for sql, n in duplicates[:5]],
+        }
+        level = logging.WARNING if stats.over_budget or duplicates else logging.INFO
+        logger.log(level, json.dumps(record), extra={"sql_stats": record})
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        stats = getattr(request, "sql_stats", None)
+        if stats is None:
+            return None
+        view_class = getattr(view_func, "cls", None)
+        actions = getattr(view_func, "actions", None)
+        if view_class is not None and actions:
+            action = actions.get(request.method.lower())
+            stats.view = f"{view_class.__name__}.{action}"
+            stats.budget = getattr(view_class, "query_budgets", {}).get(action)
+        else:
+            stats.view = getattr(view_func, "__qualname__", repr(view_func))
+            stats.budget = getattr(view_func, "query_budget", None)
+        return None
+
+
+def _profile_mode(request) -> str | None:
+    """"cpu" or "memory" when the request asks to be profiled (X-Profile header or ?profile=)."""
+    value = (request.headers.get("X-Profile") or request.GET.get("profile") or "").strip().lower()
+    if value in ("1", "true", "cpu"):
+        return "cpu"
+    if value == "memory":
+        return "memory"
+    return None
+
+
+def _staff_user(request):
+    user = getattr(request, "user", None)
+    if user is None or not user.is_authenticated:
+        # API calls authenticate with JWT inside the view; check the token up front.
+        try:
+            result = JWTAuthentication().authenticate(request)
+        except APIException:
+            return None
+        user = result[0] if result else None
+    if user is not None and user.is_active and user.is_staff:
+        return user
+    return None
+
+
+class RequestProfilerMiddleware:
+    """
+    Opt-in profiling for staff, on while REQUEST_PROFILING is set.
+
+    A staff user (session or JWT) sends "X-Profile: 1" or ?profile=1 for a
+    cProfile CPU profile of the request, "memory" to add a tracemalloc
+    snapshot. Profiles are stored as RequestProfile rows for download from the
+    admin; the response's X-Profile-Id names the row. At most
+    REQUEST_PROFILE_MAX_PER_HOUR requests are profiled, anyone else's flag is
+    ignored, and only REQUEST_PROFILE_KEEP profiles are kept. cProfile follows
+    the request's thread only, and a streaming body is not included.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not getattr(settings, "REQUEST_PROFILING", False):
+            return self.get_response(request)
+        mode = _profile_mode(request)
+        if mode is None:
+            return self.get_response(request)
+        user = _staff_user(request)
+        if user is None:
+            return self.get_response(request)
+        if not claim_profile_slot():
+            return self.get_response(request)
+
+        # tracemalloc is process-wide; skip memory if something else is tracing.
+        trace_memory = mode == "memory" and not tracemalloc.is_tracing()
+        if trace_memory:
+            tracemalloc.start(_MEMORY_FRAMES)
+        profiler = cProfile.Profile()
+        started = time.perf_counter()
+        profiler.enable()
+        try:
+            response = self.get_response(request)
+        finally:
+            profiler.disable()
+            duration = time.perf_counter() - started
+            snapshot = peak = None
+            if trace_memory:
+                snapshot = tracemalloc.take_snapshot()
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+
+        profile = save_profile(request, user, response, profiler, duration, snapshot, peak)
+        response["X-Profile-Id"] = str(profile.pk)
+        return response
+
+
+def _route_template(route: str) -> str:
+    # Router regexes ("courses/(?P<pk>[^/.]+)/$") read as "/courses/{pk}/".
+    return "/" + _ROUTE_GROUP.sub(r"{\1}", route).lstrip("^").rstrip("$")
+
+
+class TracingMiddleware:
+    """
+    Root span of every request while TRACING is set, named after the matched
+    route; the spans of LLM calls, link checks and writes nest under it.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not tracing.tracing_enabled():
+            return self.get_response(request)
+        attributes = {"http.request.method": request.method, "url.path": request.path}
+        with tracing.span(request.method, attributes, kind=tracing.SERVER) as span:
+            response = self.get_response(request)
+            match = getattr(request, "resolver_match", None)
+            if match is not None and match.route:
+                route = _route_template(match.route)
+                span.update_name(f"{request.method} {route}")
+                span.set_attribute("http.route", route)
+            span.set_attribute("http.response.status_code", response.status_code)
+        return response
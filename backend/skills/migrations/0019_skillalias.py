@@ -0,0 +1,132 @@
+# Generated by Django 6.0.2 on 2026-10-17 14:24
+
+import re
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+# Frozen copy of skills.services.skill_index.normalize_skill_key at the time
+# of this migration, so the backfill does not import (or change with) live code.
+# Spelling variants folded before tokenizing ("node.js" -> "nodejs", "c++" -> "cpp").
+_SYMBOL_REPLACEMENTS = [
+    (re.compile(r"c\+\+"), "cpp"),
+    (re.compile(r"c#"), "csharp"),
+    (re.compile(r"f#"), "fsharp"),
+    (re.compile(r"\.net\b"), "dotnet"),
+    (re.compile(r"(\w)\.js\b"), r"\1js"),
+]
+
+TOKEN_SYNONYMS = {
+    "js": "javascript",
+    "ecmascript": "javascript",
+    "ts": "typescript",
+    "py": "python",
+    "python3": "python",
+    "golang": "go",
+    "k8s": "kubernetes",
+    "reactjs": "react",
+    "vuejs": "vue",
+    "nextjs": "next",
+    "nodejs": "node",
+    "expressjs": "express",
+    "angularjs": "angular",
+    "postgres": "postgresql",
+    "mongo": "mongodb",
+    "ml": "machine learning",
+    "dl": "deep learning",
+    "ai": "artificial intelligence",
+    "nlp": "natural language processing",
+    "ui": "user interface",
+    "ux": "user experience",
+    "dsa": "data structures algorithms",
+}
+
+STOP_TOKENS = {
+    "a", "an", "and", "the", "to", "for", "of", "in", "with", "from",
+    "learn", "course", "courses", "complete", "mastery", "master",
+    "path", "roadmap", "tutorial", "guide", "bootcamp", "beginner", "beginners",
+    "zero", "hero", "program", "programming", "language",
+}
+
+
+def _key_tokens(text: str) -> list[str]:
+    text = (text or "").lower()
+    for pattern, replacement in _SYMBOL_REPLACEMENTS:
+        text = pattern.sub(replacement, text)
+    tokens = []
+    for raw in re.findall(r"[a-z0-9]+", text):
+        for token in TOKEN_SYNONYMS.get(raw, raw).split():
+            if token not in STOP_TOKENS:
+                tokens.append(token)
+    return tokens
+
+
+def normalize_skill_key(text: str) -> str:
+    """Order-insensitive key: "JS Mastery Path" and "javascript" both map to "javascript"."""
+    tokens = _key_tokens(text)
+    if not tokens:
+        # Only stop words ("Programming"): fall back to the plain lowercase words.
+        tokens = re.findall(r"[a-z0-9]+", (text or "").lower())
+    return " ".join(sorted(set(tokens)))[:255]
+
+
+def create_trigram_index(apps, schema_editor):
+    """GIN trigram index for the similarity fallback (PostgreSQL with pg_trgm only)."""
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("SAVEPOINT skill_alias_trgm")
+        try:
+            cursor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+            cursor.execute(
+                "CREATE INDEX IF NOT EXISTS skills_skillalias_key_trgm "
+                "ON skills_skillalias USING gin (key gin_trgm_ops)"
+            )
+            cursor.execute("RELEASE SAVEPOINT skill_alias_trgm")
+        except Exception:
+            # No permission to create the extension: lookups fall back to token-set matching.
+            cursor.execute("ROLLBACK TO SAVEPOINT skill_alias_trgm")
+
+
+def drop_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("DROP INDEX IF EXISTS skills_skillalias_key_trgm")
+
+
+def backfill_aliases(apps, schema_editor):
+    CourseCard = apps.get_model("skills", "CourseCard")
+    SkillAlias = apps.get_model("skills", "SkillAlias")
+    aliases = []
+    for course_id, title in CourseCard.objects.values_list("id", "title"):
+        key = normalize_skill_key(title)
+        if key:
+            aliases.append(SkillAlias(key=key, course_id=course_id))
+    SkillAlias.objects.bulk_create(aliases, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('skills', '0018_coursegenerationjob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SkillAlias',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(db_index=True, max_length=255)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('course', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='skill_aliases', to='skills.coursecard')),
+            ],
+            options={
+                'unique_together': {('key', 'course')},
+            },
+        ),
+        migrations.RunPython(create_trigram_index, drop_trigram_index),
+        migrations.RunPython(backfill_aliases, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 6.0.2 on 2026-10-17 15:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('skills', '0019_skillalias'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='coursegenerationjob',
+            name='coalesce_key',
+            field=models.CharField(blank=True, max_length=300),
+        ),
+        migrations.AddConstraint(
+            model_name='coursegenerationjob',
+            constraint=models.UniqueConstraint(condition=models.Q(('status__in', ['queued', 'running']), models.Q(('coalesce_key', ''), _negated=True)), fields=('coalesce_key',), name='unique_inflight_generation_job'),
+        ),
+    ]
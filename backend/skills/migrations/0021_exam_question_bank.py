@@ -0,0 +1,84 @@
+# Generated by Django 6.0.2 on 2026-10-17 15:40
+
+import hashlib
+import re
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+def question_fingerprint(question_text: str) -> str:
+    """Frozen copy of skills.services.exam_bank.question_fingerprint at the time of this migration."""
+    normalized = " ".join(re.findall(r"[a-z0-9]+", (question_text or "").lower()))
+    return hashlib.sha1(normalized.encode("utf-8")).hexdigest()
+
+
+def backfill_fingerprints(apps, schema_editor):
+    """Fingerprint existing questions and drop duplicates within a quiz before the unique constraint."""
+    QuizQuestion = apps.get_model("skills", "QuizQuestion")
+    seen = set()
+    duplicates = []
+    for question in QuizQuestion.objects.order_by("quiz_id", "order", "id"):
+        fingerprint = question_fingerprint(question.question_text)
+        if (question.quiz_id, fingerprint) in seen:
+            duplicates.append(question.id)
+            continue
+        seen.add((question.quiz_id, fingerprint))
+        question.fingerprint = fingerprint
+        question.save(update_fields=["fingerprint"])
+    QuizQuestion.objects.filter(id__in=duplicates).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('skills', '0020_coursegenerationjob_coalesce_key'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='quiz',
+            name='refill_requested_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='quizquestion',
+            name='created_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.AddField(
+            model_name='quizquestion',
+            name='expected_keywords',
+            field=models.JSONField(blank=True, default=list, help_text='Short answer: words or phrases a correct answer should contain'),
+        ),
+        migrations.AddField(
+            model_name='quizquestion',
+            name='fingerprint',
+            field=models.CharField(blank=True, max_length=40),
+        ),
+        migrations.AddField(
+            model_name='quizquestion',
+            name='question_type',
+            field=models.CharField(choices=[('multiple_choice', 'Multiple choice'), ('short_answer', 'Short answer')], default='multiple_choice', max_length=20),
+        ),
+        migrations.AddField(
+            model_name='quizquestion',
+            name='times_served',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AlterField(
+            model_name='quizquestion',
+            name='correct_index',
+            field=models.PositiveSmallIntegerField(blank=True, help_text='0-based index of the correct option', null=True),
+        ),
+        migrations.AlterField(
+            model_name='quizquestion',
+            name='options',
+            field=models.JSONField(blank=True, default=list, help_text="List of answer options, e.g. ['A', 'B', 'C', 'D']"),
+        ),
+        migrations.RunPython(backfill_fingerprints, migrations.RunPython.noop),
+        migrations.AlterUniqueTogether(
+            name='quizquestion',
+            unique_together={('quiz', 'fingerprint')},
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 6.0.2 on 2026-10-17 17:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('skills', '0022_dashboard_stats'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='coursecard',
+            name='tree_version',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='usercoursestats',
+            name='tree_version',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
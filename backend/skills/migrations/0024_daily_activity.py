@@ -0,0 +1,101 @@
+# Generated by Django 6.0.2 on 2026-10-17 17:40
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def backfill_daily_activity(apps, schema_editor):
+    """Move activity_by_date blobs and passed stages into DailyActivity rows."""
+    from collections import defaultdict
+    from datetime import date
+
+    UserCourseTracking = apps.get_model("skills", "UserCourseTracking")
+    StageProgress = apps.get_model("skills", "StageProgress")
+    DailyActivity = apps.get_model("skills", "DailyActivity")
+
+    counts = defaultdict(int)
+    for user_id, course_id, activity in UserCourseTracking.objects.values_list(
+        "user_id", "course_id", "activity_by_date"
+    ).iterator():
+        for date_key, count in (activity or {}).items():
+            try:
+                day = date.fromisoformat(date_key)
+                count = int(count or 0)
+            except (TypeError, ValueError):
+                continue
+            if count > 0:
+                counts[(user_id, course_id, day)] += count
+    for user_id, course_id, passed_at in StageProgress.objects.values_list(
+        "user_id", "roadmap__path__course_id", "passed_at"
+    ).iterator():
+        if passed_at:
+            counts[(user_id, course_id, timezone.localtime(passed_at).date())] += 1
+
+    DailyActivity.objects.bulk_create(
+        [
+            DailyActivity(user_id=user_id, course_id=course_id, day=day, count=count)
+            for (user_id, course_id, day), count in counts.items()
+        ],
+        batch_size=1000,
+    )
+
+
+def rebuild_activity_blobs(apps, schema_editor):
+    """
+    Write DailyActivity back into activity_by_date (dropped by 0028), leaving
+    out the passed stages the backfill added: the blob held progress activity only.
+    """
+    from collections import defaultdict
+
+    UserCourseTracking = apps.get_model("skills", "UserCourseTracking")
+    StageProgress = apps.get_model("skills", "StageProgress")
+    DailyActivity = apps.get_model("skills", "DailyActivity")
+
+    passes = defaultdict(int)
+    for user_id, course_id, passed_at in StageProgress.objects.values_list(
+        "user_id", "roadmap__path__course_id", "passed_at"
+    ).iterator():
+        if passed_at:
+            passes[(user_id, course_id, timezone.localtime(passed_at).date())] += 1
+
+    blobs = defaultdict(dict)
+    for user_id, course_id, day, count in DailyActivity.objects.values_list(
+        "user_id", "course_id", "day", "count"
+    ).iterator():
+        count -= passes.get((user_id, course_id, day), 0)
+        if count > 0:
+            blobs[(user_id, course_id)][day.isoformat()] = count
+
+    trackings = []
+    for tracking in UserCourseTracking.objects.only("id", "user_id", "course_id").iterator():
+        tracking.activity_by_date = blobs.get((tracking.user_id, tracking.course_id), {})
+        trackings.append(tracking)
+    UserCourseTracking.objects.bulk_update(trackings, ["activity_by_date"], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('skills', '0023_course_tree_version'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyActivity',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('course', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_activity', to='skills.coursecard')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_activity', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['user', 'day'], name='daily_activity_user_day')],
+                'constraints': [models.UniqueConstraint(fields=('user', 'course', 'day'), name='unique_daily_activity')],
+            },
+        ),
+        migrations.RunPython(backfill_daily_activity, rebuild_activity_blobs),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 6.0.2 on 2026-10-17 18:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('skills', '0024_daily_activity'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='usercoursetracking',
+            name='completed_base',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='usercoursetracking',
+            name='completed_bitmap',
+            field=models.BinaryField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 6.0.2 on 2026-10-17 19:20
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('skills', '0027_submitted_exam_token'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='usercoursetracking',
+            name='activity_by_date',
+        ),
+    ]
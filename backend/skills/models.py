@@ -1,8 +1,12 @@
 # skils/models.py
+import uuid
+
 from django.db import models
 from django.utils import timezone
 from django.conf import settings
 
+from .counters import mark_touched
+
 
 class CourseCard(models.Model):
     LEVEL_CHOICES = [
@@ -66,12 +70,26 @@ class CourseCard(models.Model):
     paths = models.JSONField(
         default=list, blank=True, help_text="Different learning paths (frontend, backend, etc.)")
     created_at = models.DateTimeField(default=timezone.now)
+    # Bumped on every save; edits anywhere in the tree cascade up to this save (or to
+    # counters.recount when deferred), so it versions caches of the course structure.
+    tree_version = models.PositiveIntegerField(default=0, editable=False)
 
     def update_path_count(self):
         """Update path count based on related Path objects"""
         self.path_count = self.path_items.count()  # use related manager
         self.save()
 
+    def save(self, *args, **kwargs):
+        bump = self.pk is not None and not kwargs.get("force_insert")
+        if bump:
+            self.tree_version = models.F("tree_version") + 1
+            if kwargs.get("update_fields") is not None:
+                kwargs["update_fields"] = {*kwargs["update_fields"], "tree_version"}
+        super().save(*args, **kwargs)
+        if bump:
+            # Replace the F() expression with the stored number.
+            self.refresh_from_db(fields=["tree_version"])
+
     def __str__(self):
         return self.title
 
@@ -101,12 +119,16 @@ class Path(models.Model):
     def save(self, *args, **kwargs):
         """When a Path is saved, update path_count on its course"""
         super().save(*args, **kwargs)
+        if mark_touched("course", self.course_id):
+            return
         self.course.update_path_count()
 
     def delete(self, *args, **kwargs):
         """When deleted, also update the course path_count"""
         course = self.course
         super().delete(*args, **kwargs)
+        if mark_touched("course", course.id):
+            return
         course.update_path_count()
 
     def __str__(self):
@@ -127,11 +149,15 @@ class Roadmap(models.Model):
     def save(self, *args, **kwargs):
         """When a roadmap is saved, update roadmap_count in path"""
         super().save(*args, **kwargs)
+        if mark_touched("path", self.path_id):
+            return
         self.path.update_roadmap_count()
 
     def delete(self, *args, **kwargs):
         path = self.path
         super().delete(*args, **kwargs)
+        if mark_touched("path", path.id):
+            return
         path.update_roadmap_count()
 
     def update_sub_map_count(self):
@@ -153,11 +179,15 @@ class SubMap(models.Model):
 
     def save(self, *args, **kwargs):
         super().save(*args, **kwargs)
+        if mark_touched("roadmap", self.roadmap_id):
+            return
         self.roadmap.update_sub_map_count()
 
     def delete(self, *args, **kwargs):
         roadmap = self.roadmap
         super().delete(*args, **kwargs)
+        if mark_touched("roadmap", roadmap.id):
+            return
         roadmap.update_sub_map_count()
 
     def update_resources_count(self):
@@ -200,41 +230,70 @@ class Resource(models.Model):
 
     def save(self, *args, **kwargs):
         super().save(*args, **kwargs)
+        if mark_touched("sub_map", self.sub_map_id):
+            return
         self.sub_map.update_resources_count()
 
     def delete(self, *args, **kwargs):
         sub_map = self.sub_map
         super().delete(*args, **kwargs)
+        if mark_touched("sub_map", sub_map.id):
+            return
         sub_map.update_resources_count()
 
 
 class Quiz(models.Model):
-    """One quiz per roadmap (stage). AI-generated questions."""
+    """Question bank for one roadmap (stage); exams are sampled from its questions."""
     roadmap = models.OneToOneField(
         Roadmap, related_name="quiz", on_delete=models.CASCADE
     )
     created_at = models.DateTimeField(default=timezone.now)
+    # Set while a background refill is pending or running, cleared when it finishes.
+    refill_requested_at = models.DateTimeField(null=True, blank=True)
 
     def __str__(self):
         return f"Quiz for {self.roadmap.title}"
 
 
 class QuizQuestion(models.Model):
-    """Multiple choice question for a quiz."""
+    """Multiple choice or short answer question in a roadmap's question bank."""
+
+    TYPE_CHOICES = [
+        ("multiple_choice", "Multiple choice"),
+        ("short_answer", "Short answer"),
+    ]
+
     quiz = models.ForeignKey(
         Quiz, related_name="questions", on_delete=models.CASCADE
     )
     order = models.PositiveSmallIntegerField(default=0)
+    question_type = models.CharField(
+        max_length=20, choices=TYPE_CHOICES, default="multiple_choice"
+    )
     question_text = models.TextField()
     options = models.JSONField(
+        default=list,
+        blank=True,
         help_text="List of answer options, e.g. ['A', 'B', 'C', 'D']"
     )
     correct_index = models.PositiveSmallIntegerField(
+        null=True,
+        blank=True,
         help_text="0-based index of the correct option"
     )
+    expected_keywords = models.JSONField(
+        default=list,
+        blank=True,
+        help_text="Short answer: words or phrases a correct answer should contain"
+    )
+    # Hash of the normalized question text, so regenerated duplicates are dropped.
+    fingerprint = models.CharField(max_length=40, blank=True)
+    times_served = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(default=timezone.now)
 
     class Meta:
         ordering = ["order"]
+        unique_together = [["quiz", "fingerprint"]]
 
     def __str__(self):
         return self.question_text[:50]
@@ -260,7 +319,10 @@ class StageProgress(models.Model):
 
 
 class ExamSession(models.Model):
-    """One-time AI-generated exam for a single attempt. Can include MC and short-answer (direct write)."""
+    """
+    One-time exam for a single attempt, used when EXAM_SESSION_BACKEND="database".
+    Can include MC and short-answer (direct write).
+    """
     session_key = models.CharField(max_length=64, unique=True, db_index=True)
     roadmap = models.ForeignKey(
         Roadmap, related_name="exam_sessions", on_delete=models.CASCADE
@@ -273,6 +335,101 @@ class ExamSession(models.Model):
     def __str__(self):
         return f"ExamSession {self.session_key[:8]}…"
 
+
+class SubmittedExamToken(models.Model):
+    """
+    Id of a submitted signed exam session, kept until the token itself would
+    expire so the same session_key cannot be graded twice.
+    """
+    token_id = models.CharField(max_length=32, unique=True)
+    expires_at = models.DateTimeField(db_index=True)
+
+    def __str__(self):
+        return f"SubmittedExamToken {self.token_id[:8]}…"
+
+
+class SkillAlias(models.Model):
+    """Normalized skill name ("javascript", "machine learning") that resolves to a course."""
+    key = models.CharField(max_length=255, db_index=True)
+    course = models.ForeignKey(
+        CourseCard, related_name="skill_aliases", on_delete=models.CASCADE
+    )
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        unique_together = [["key", "course"]]
+
+    def __str__(self):
+        return f"{self.key} -> {self.course.title}"
+
+
+class CourseGenerationJob(models.Model):
+    """Background AI course generation request, polled by the client until it finishes."""
+
+    STATUS_CHOICES = [
+        ("queued", "Queued"),
+        ("running", "Running"),
+        ("succeeded", "Succeeded"),
+        ("failed", "Failed"),
+    ]
+
+    STAGE_CHOICES = [
+        ("queued", "Queued"),
+        ("llm", "LLM generation"),
+        ("validation", "Link validation"),
+        ("persistence", "Saving course"),
+        ("done", "Done"),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    skill = models.CharField(max_length=255)
+    preferred_language = models.CharField(max_length=20, default="English")
+    # Normalized skill + language; at most one queued/running job per key.
+    coalesce_key = models.CharField(max_length=300, blank=True)
+    status = models.CharField(
+        max_length=20, choices=STATUS_CHOICES, default="queued", db_index=True
+    )
+    stage = models.CharField(max_length=20, choices=STAGE_CHOICES, default="queued")
+    progress = models.PositiveSmallIntegerField(default=0)
+    course = models.ForeignKey(
+        CourseCard,
+        related_name="generation_jobs",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+    )
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(default=timezone.now)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["coalesce_key"],
+                condition=models.Q(status__in=["queued", "running"])
+                & ~models.Q(coalesce_key=""),
+                name="unique_inflight_generation_job",
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.skill} ({self.status})"
+
+
+class VideoMetadata(models.Model):
+    """Cached YouTube oEmbed check, shared by every worker validating AI course links."""
+    video_id = models.CharField(max_length=32, unique=True)
+    title = models.CharField(max_length=255, blank=True)
+    author = models.CharField(max_length=255, blank=True)
+    embeddable = models.BooleanField(default=False)
+    checked_at = models.DateTimeField(default=timezone.now, db_index=True)
+
+    def __str__(self):
+        return f"{self.video_id} ({'embeddable' if self.embeddable else 'unavailable'})"
+
+
 class UserCourseTracking(models.Model):
     """Per-user learning tracking for a course. Stored on server, not device."""
 
@@ -305,7 +462,10 @@ class UserCourseTracking(models.Model):
         default="english",
     )
     completed_sub_map_ids = models.JSONField(default=list, blank=True)
-    activity_by_date = models.JSONField(default=dict, blank=True)
+    # PROGRESS_ENCODING="bitmap": completed sub-maps as a bitmap over ids from
+    # completed_base (see services.progress_bitmap); completed_sub_map_ids is then empty.
+    completed_bitmap = models.BinaryField(null=True, blank=True)
+    completed_base = models.PositiveIntegerField(default=0)
     last_accessed_at = models.DateTimeField(default=timezone.now)
     last_activity_at = models.DateTimeField(null=True, blank=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -315,3 +475,114 @@ class UserCourseTracking(models.Model):
 
     def __str__(self):
         return f"{self.user} tracking {self.course}"
+
+
+class DailyActivity(models.Model):
+    """Learning sessions and passed stages of a user in one course on one (local) day."""
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        related_name="daily_activity",
+        on_delete=models.CASCADE,
+    )
+    course = models.ForeignKey(
+        CourseCard,
+        related_name="daily_activity",
+        on_delete=models.CASCADE,
+    )
+    day = models.DateField()
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "course", "day"], name="unique_daily_activity"
+            )
+        ]
+        indexes = [models.Index(fields=["user", "day"], name="daily_activity_user_day")]
+
+    def __str__(self):
+        return f"{self.user} {self.day}: {self.count}"
+
+
+class UserCourseStats(models.Model):
+    """Dashboard card for one course a user tracks or has passed stages in, kept current on writes."""
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        related_name="course_stats",
+        on_delete=models.CASCADE,
+    )
+    course = models.ForeignKey(
+        CourseCard,
+        related_name="user_stats",
+        on_delete=models.CASCADE,
+    )
+    completed_stages = models.PositiveIntegerField(default=0)
+    total_stages = models.PositiveIntegerField(default=0)
+    next_stage_title = models.CharField(max_length=255, null=True, blank=True)
+    # Course tree_version the card was computed from; older cards are refreshed on read.
+    tree_version = models.PositiveIntegerField(default=0)
+    # Last access through user-progress; null for courses only known from passed exams.
+    last_activity = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = [["user", "course"]]
+
+    @property
+    def progress_pct(self):
+        if not self.total_stages:
+            return 0
+        return round((self.completed_stages / self.total_stages) * 100)
+
+    @property
+    def is_completed(self):
+        return self.total_stages > 0 and self.completed_stages >= self.total_stages
+
+    def __str__(self):
+        return f"{self.user} stats for {self.course}"
+
+
+class UserDashboardStats(models.Model):
+    """Per-user activity counters behind the dashboard's weekly sessions and streak."""
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        related_name="dashboard_stats",
+        on_delete=models.CASCADE,
+    )
+    # {"YYYY-MM-DD": sessions} for the most recent days only.
+    recent_activity = models.JSONField(default=dict, blank=True)
+    # Consecutive active days ending on last_active_day.
+    streak_days = models.PositiveIntegerField(default=0)
+    last_active_day = models.DateField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Dashboard stats for {self.user}"
+
+
+class RequestProfile(models.Model):
+    """CPU (and optional memory) profile of one request, captured for a staff user on demand."""
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        related_name="request_profiles",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+    )
+    method = models.CharField(max_length=10)
+    path = models.CharField(max_length=500)
+    view = models.CharField(max_length=255, blank=True)
+    status_code = models.PositiveSmallIntegerField(null=True, blank=True)
+    duration_ms = models.FloatField(default=0)
+    # marshal-encoded pstats data, the format of pstats.Stats.dump_stats (.prof files).
+    profile_data = models.BinaryField()
+    summary = models.TextField(blank=True, help_text="Top functions by cumulative time")
+    memory_summary = models.TextField(blank=True, help_text="Top allocations (tracemalloc)")
+    memory_peak_kib = models.FloatField(null=True, blank=True)
+    created_at = models.DateTimeField(default=timezone.now, db_index=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+
+    def __str__(self):
+        return f"{self.method} {self.path} ({self.duration_ms:.0f} ms)"
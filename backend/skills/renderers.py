@@ -0,0 +1,55 @@
+import re
+
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+_ENCODER = JSONEncoder()
+
+# A float orjson writes differently from float.__repr__: exponent form ("1e16"
+# for "1e+16", "1.5e-7" for "1.5e-07") or below 1e-4 in positional form
+# ("0.00001" for "1e-05"). Such output is rendered again by the stdlib path;
+# a string that merely looks like one only costs that slower render.
+_REPR_MISMATCH = re.compile(rb"(?:^|[:\[,])-?(?:[0-9][0-9.]*e|0\.0000[0-9])")
+
+
+def _default(obj):
+    # Datetimes are passed through so they keep DRF's format ("Z" suffix).
+    return _ENCODER.default(obj)
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer producing the same bytes through orjson when it is installed.
+
+    Types orjson does not handle natively (datetimes, Decimal, lazy strings,
+    querysets, ...) go through DRF's JSONEncoder.default, exactly as before.
+    Indented output, non-default UNICODE_JSON / COMPACT_JSON settings,
+    payloads orjson rejects (e.g. ints beyond 64 bits) and floats it would
+    format differently (very large or small magnitudes) use the stdlib path.
+
+    One difference remains: NaN and Infinity are rendered as null, where the
+    stdlib path raises ValueError under STRICT_JSON.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or data is None or self.ensure_ascii or not self.compact:
+            return super().render(data, accepted_media_type, renderer_context)
+        if self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            ret = orjson.dumps(
+                data,
+                default=_default,
+                option=orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS,
+            )
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        if _REPR_MISMATCH.search(ret):
+            return super().render(data, accepted_media_type, renderer_context)
+        # Same strict-JavaScript escaping of U+2028 / U+2029 as JSONRenderer.
+        return ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(b"\xe2\x80\xa9", b"\\u2029")
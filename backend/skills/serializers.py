@@ -1,15 +1,52 @@
 from rest_framework import serializers
+from .counters import deferred_counters
 from .models import CourseCard, Path, Roadmap, SubMap, Resource
 
 
-class ResourceSerializer(serializers.ModelSerializer):
+def _nesting_level(serializer) -> int:
+    """How many serializers this one is nested under (list wrappers not counted)."""
+    level = 0
+    parent = serializer.parent
+    while parent is not None:
+        if not isinstance(parent, serializers.ListSerializer):
+            level += 1
+        parent = parent.parent
+    return level
+
+
+class SparseFieldsMixin:
+    """
+    Honour the "fields" and "depth" serializer context set by the skills
+    viewsets: "fields" is a set of field names kept at every level, "depth" the
+    number of nested levels (nested_fields) rendered below the root.
+    """
+
+    nested_fields = ()
+
+    def get_fields(self):
+        fields = super().get_fields()
+        allowed = self.context.get("fields")
+        depth = self.context.get("depth")
+        if allowed is None and depth is None:
+            return fields
+        level = _nesting_level(self)
+        for name in list(fields):
+            if allowed is not None and name not in allowed:
+                del fields[name]
+            elif depth is not None and name in self.nested_fields and level >= depth:
+                del fields[name]
+        return fields
+
+
+class ResourceSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Resource
         fields = ['id', 'language', 'link_type', 'link']
 
 
-class SubMapSerializer(serializers.ModelSerializer):
+class SubMapSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     resources = serializers.SerializerMethodField()
+    nested_fields = ('resources',)
 
     class Meta:
         model = SubMap
@@ -17,10 +54,11 @@ class SubMapSerializer(serializers.ModelSerializer):
 
     def create(self, validated_data):
         resources_data = validated_data.pop('resources', [])
-        sub_map = SubMap.objects.create(**validated_data)
-        for resource_data in resources_data:
-            Resource.objects.create(sub_map=sub_map, **resource_data)
-        sub_map.update_resources_count()
+        with deferred_counters():
+            sub_map = SubMap.objects.create(**validated_data)
+            for resource_data in resources_data:
+                Resource.objects.create(sub_map=sub_map, **resource_data)
+        sub_map.refresh_from_db(fields=['resources_count'])
         return sub_map
 
     def get_resources(self, obj):
@@ -37,8 +75,9 @@ class SubMapSerializer(serializers.ModelSerializer):
 
 
 
-class RoadmapSerializer(serializers.ModelSerializer):
+class RoadmapSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     sub_maps = SubMapSerializer(many=True, read_only=False)
+    nested_fields = ('sub_maps',)
 
     class Meta:
         model = Roadmap
@@ -47,15 +86,17 @@ class RoadmapSerializer(serializers.ModelSerializer):
 
     def create(self, validated_data):
         sub_maps_data = validated_data.pop('sub_maps', [])
-        roadmap = Roadmap.objects.create(**validated_data)
-        for sub_map_data in sub_maps_data:
-            SubMap.objects.create(roadmap=roadmap, **sub_map_data)
-        roadmap.update_sub_map_count()
+        with deferred_counters():
+            roadmap = Roadmap.objects.create(**validated_data)
+            for sub_map_data in sub_maps_data:
+                SubMap.objects.create(roadmap=roadmap, **sub_map_data)
+        roadmap.refresh_from_db(fields=['sub_map_count'])
         return roadmap
 
 
-class PathSerializer(serializers.ModelSerializer):
+class PathSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     roadmaps = RoadmapSerializer(many=True, read_only=False)
+    nested_fields = ('roadmaps',)
 
     class Meta:
         model = Path
@@ -64,15 +105,17 @@ class PathSerializer(serializers.ModelSerializer):
 
     def create(self, validated_data):
         roadmaps_data = validated_data.pop('roadmaps', [])
-        path = Path.objects.create(**validated_data)
-        for roadmap_data in roadmaps_data:
-            Roadmap.objects.create(path=path, **roadmap_data)
-        path.update_roadmap_count()
+        with deferred_counters():
+            path = Path.objects.create(**validated_data)
+            for roadmap_data in roadmaps_data:
+                Roadmap.objects.create(path=path, **roadmap_data)
+        path.refresh_from_db(fields=['roadmap_count'])
         return path
 
 
-class CourseSerializer(serializers.ModelSerializer):
+class CourseSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     path_items = PathSerializer(many=True, read_only=False)
+    nested_fields = ('path_items',)
 
     class Meta:
         model = CourseCard
@@ -86,8 +129,24 @@ class CourseSerializer(serializers.ModelSerializer):
 
     def create(self, validated_data):
         paths_data = validated_data.pop('path_items', [])
-        course = CourseCard.objects.create(**validated_data)
-        for path_data in paths_data:
-            Path.objects.create(course=course, **path_data)
-        course.update_path_count()
+        with deferred_counters():
+            course = CourseCard.objects.create(**validated_data)
+            for path_data in paths_data:
+                Path.objects.create(course=course, **path_data)
+        course.refresh_from_db(fields=['path_count'])
         return course
+
+
+class CourseSummarySerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    """Catalog card: course fields and counters, without the nested tree."""
+    roadmap_count = serializers.IntegerField(read_only=True)
+
+    class Meta:
+        model = CourseCard
+        fields = [
+            'id', 'title', 'description', 'overview', 'icon', 'category', 'level',
+            'students', 'duration', 'rating', 'color', 'tags', 'has_paths',
+            'path_count', 'roadmap_count', 'special_features', 'career_opportunities',
+            'tools_needed',
+        ]
+        read_only_fields = fields
@@ -0,0 +1,87 @@
+from datetime import date, timedelta
+
+from django.db import IntegrityError, connection, transaction
+from django.db.models import F, Max, Sum
+from django.utils import timezone
+
+from ..models import DailyActivity
+
+_UPSERT_SQL = (
+    "INSERT INTO {table} (user_id, course_id, day, count) VALUES (%s, %s, %s, %s) "
+    "ON CONFLICT (user_id, course_id, day) "
+    "DO UPDATE SET count = {table}.count + excluded.count"
+)
+
+
+def increment_activity(user, course_id, day: date | None = None, count: int = 1):
+    """Add `count` to the user's activity in a course on `day` (today by default), atomically."""
+    day = day or timezone.localdate()
+    if connection.vendor in ("postgresql", "sqlite"):
+        table = connection.ops.quote_name(DailyActivity._meta.db_table)
+        with connection.cursor() as cursor:
+            cursor.execute(_UPSERT_SQL.format(table=table), [user.pk, course_id, day, count])
+        return
+    rows = DailyActivity.objects.filter(user=user, course_id=course_id, day=day)
+    if rows.update(count=F("count") + count):
+        return
+    try:
+        with transaction.atomic():
+            DailyActivity.objects.create(user=user, course_id=course_id, day=day, count=count)
+    except IntegrityError:
+        # Created concurrently; increment that row instead.
+        rows.update(count=F("count") + count)
+
+
+def daily_totals(user, start: date, end: date) -> dict:
+    """{day: sessions} over all courses for start <= day <= end; inactive days are absent."""
+    rows = (
+        DailyActivity.objects.filter(user=user, day__range=(start, end), count__gt=0)
+        .values("day")
+        .annotate(total=Sum("count"))
+        .values_list("day", "total")
+    )
+    return dict(rows)
+
+
+def last_active_day(user) -> date | None:
+    return DailyActivity.objects.filter(user=user, count__gt=0).aggregate(day=Max("day"))["day"]
+
+
+def streak_ending(user, day: date) -> int:
+    """Consecutive active days ending on `day`, read newest first until the first gap."""
+    streak = 0
+    expected = day
+    active_days = (
+        DailyActivity.objects.filter(user=user, day__lte=day, count__gt=0)
+        .values_list("day", flat=True)
+        .distinct()
+        .order_by("-day")
+    )
+    for active_day in active_days.iterator(chunk_size=64):
+        if active_day != expected:
+            break
+        streak += 1
+        expected = expected - timedelta(days=1)
+    return streak
+
+
+def activity_heatmap(user, days: int = 365, course_id=None) -> dict:
+    """Dense per-day counts for the last `days` days, ending today."""
+    end = timezone.localdate()
+    start = end - timedelta(days=days - 1)
+    rows = DailyActivity.objects.filter(user=user, day__range=(start, end))
+    if course_id is not None:
+        rows = rows.filter(course_id=course_id)
+    totals = dict(rows.values("day").annotate(total=Sum("count")).values_list("day", "total"))
+    cells = []
+    for i in range(days):
+        d = start + timedelta(days=i)
+        cells.append({"date": d.isoformat(), "count": int(totals.get(d, 0))})
+    return {
+        "start": start.isoformat(),
+        "end": end.isoformat(),
+        "total": sum(totals.values()),
+        "active_days": sum(1 for value in totals.values() if value > 0),
+        "max_count": max(totals.values(), default=0),
+        "days": cells,
+    }
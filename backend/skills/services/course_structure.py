@@ -0,0 +1,146 @@
+from array import array
+from bisect import bisect_left
+
+from django.core.cache import cache
+
+from ..models import CourseCard, Roadmap, SubMap
+from .progress_bitmap import ids_to_bits
+
+_CACHE_PREFIX = "skills:course-structure:v2"
+_CACHE_TIMEOUT = 24 * 60 * 60
+
+
+class CourseStructure:
+    """
+    Ordered skeleton of one course at a given tree_version: the roadmaps of
+    each path, all roadmaps by id (the stage order used for "next stage") and
+    the sorted sub-map ids. Ids are kept in int arrays so the cached value
+    stays small for large courses; sub_map_bits is the same id set as a
+    bitmap anchored at bitmap_base (see progress_bitmap).
+    """
+
+    __slots__ = (
+        "course_id",
+        "version",
+        "path_roadmaps",
+        "roadmap_ids",
+        "roadmap_titles",
+        "sub_map_ids",
+        "bitmap_base",
+        "sub_map_bits",
+    )
+
+    def __init__(self, course_id, version, path_roadmaps, roadmap_ids, roadmap_titles, sub_map_ids):
+        self.course_id = course_id
+        self.version = version
+        self.path_roadmaps = path_roadmaps
+        self.roadmap_ids = roadmap_ids
+        self.roadmap_titles = roadmap_titles
+        self.sub_map_ids = sub_map_ids
+        self.bitmap_base = sub_map_ids[0] if sub_map_ids else 0
+        self.sub_map_bits = ids_to_bits(sub_map_ids, self.bitmap_base)
+
+    def __getstate__(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __setstate__(self, state):
+        for name, value in state.items():
+            setattr(self, name, value)
+
+    @property
+    def sub_map_count(self) -> int:
+        return len(self.sub_map_ids)
+
+    def has_sub_map(self, sub_map_id: int) -> bool:
+        i = bisect_left(self.sub_map_ids, sub_map_id)
+        return i < len(self.sub_map_ids) and self.sub_map_ids[i] == sub_map_id
+
+    def valid_sub_map_ids(self, ids) -> list[int]:
+        """Sorted, de-duplicated ids of `ids` that belong to this course."""
+        return sorted({sid for sid in ids if self.has_sub_map(sid)})
+
+    def next_stage_title(self, passed_roadmap_ids) -> str | None:
+        for roadmap_id, title in zip(self.roadmap_ids, self.roadmap_titles):
+            if roadmap_id not in passed_roadmap_ids:
+                return title
+        return None
+
+    def roadmap_ids_for_path(self, path_id) -> array:
+        return self.path_roadmaps.get(path_id, array("q"))
+
+
+def _build_many(versions: dict) -> dict:
+    """Build the structures of several courses ({course_id: tree_version}) in two queries."""
+    path_roadmaps = {course_id: {} for course_id in versions}
+    roadmap_ids = {course_id: array("q") for course_id in versions}
+    roadmap_titles = {course_id: [] for course_id in versions}
+    sub_map_ids = {course_id: array("q") for course_id in versions}
+    for roadmap_id, path_id, title, course_id in (
+        Roadmap.objects.filter(path__course_id__in=versions)
+        .order_by("id")
+        .values_list("id", "path_id", "title", "path__course_id")
+    ):
+        path_roadmaps[course_id].setdefault(path_id, array("q")).append(roadmap_id)
+        roadmap_ids[course_id].append(roadmap_id)
+        roadmap_titles[course_id].append(title)
+    for sub_map_id, course_id in (
+        SubMap.objects.filter(roadmap__path__course_id__in=versions)
+        .order_by("id")
+        .values_list("id", "roadmap__path__course_id")
+    ):
+        sub_map_ids[course_id].append(sub_map_id)
+    return {
+        course_id: CourseStructure(
+            course_id,
+            version,
+            path_roadmaps[course_id],
+            roadmap_ids[course_id],
+            roadmap_titles[course_id],
+            sub_map_ids[course_id],
+        )
+        for course_id, version in versions.items()
+    }
+
+
+def _cache_key(course_id, version) -> str:
+    return f"{_CACHE_PREFIX}:{course_id}:{version}"
+
+
+def get_course_structure(course_id, version=None) -> CourseStructure:
+    """
+    The cached structure of a course. Pass the course's tree_version when it is
+    already loaded; otherwise it is read by primary key. Any edit of the tree
+    bumps the version, so stale entries are never read and simply age out.
+    """
+    if version is None:
+        version = (
+            CourseCard.objects.filter(pk=course_id).values_list("tree_version", flat=True).first()
+            or 0
+        )
+    key = _cache_key(course_id, version)
+    structure = cache.get(key)
+    if structure is None:
+        structure = _build_many({course_id: version})[course_id]
+        cache.set(key, structure, _CACHE_TIMEOUT)
+    return structure
+
+
+def get_course_structures(course_ids) -> dict:
+    """
+    {course_id: structure} for several courses in at most three queries: their
+    tree versions, then the roadmaps and sub-maps of those not cached.
+    Unknown ids are left out.
+    """
+    versions = dict(
+        CourseCard.objects.filter(pk__in=list(course_ids)).values_list("pk", "tree_version")
+    )
+    keys = {_cache_key(course_id, version): course_id for course_id, version in versions.items()}
+    structures = {keys[key]: structure for key, structure in cache.get_many(list(keys)).items()}
+    missing = {course_id: version for course_id, version in versions.items() if course_id not in structures}
+    if missing:
+        built = _build_many(missing)
+        cache.set_many(
+            {_cache_key(course_id, s.version): s for course_id, s in built.items()}, _CACHE_TIMEOUT
+        )
+        structures.update(built)
+    return structures
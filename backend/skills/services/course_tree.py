@@ -0,0 +1,109 @@
+from ..models import CourseCard, Path, Resource, Roadmap, SubMap
+
+# Field order of CourseSerializer and its nested serializers; the assembled
+# dicts must serialize to the same JSON bytes.
+COURSE_FIELDS = (
+    "id", "title", "description", "overview", "icon", "category", "level",
+    "students", "duration", "rating", "color", "tags", "has_paths",
+    "path_count", "special_features", "career_opportunities", "tools_needed",
+)
+PATH_FIELDS = ("id", "icon", "title", "mini_desc", "level", "duration", "roadmap_count")
+ROADMAP_FIELDS = ("id", "title", "micro_desc", "duration", "sub_map_count")
+SUB_MAP_FIELDS = ("id", "title", "micro_desc", "resources_count")
+TREE_LEVELS = ("path_items", "roadmaps", "sub_maps", "resources")
+
+
+def _children(rows, parent_field, nested_field, nested, empty, pick):
+    """Group rows by parent id, attaching each row's own children under nested_field."""
+    by_parent = {}
+    for row in rows:
+        parent_id = row.pop(parent_field)
+        if nested_field is not None:
+            row[nested_field] = nested.get(row["id"]) or empty()
+        by_parent.setdefault(parent_id, []).append(pick(row))
+    return by_parent
+
+
+def kept_levels(levels, fields=None, depth=None) -> tuple:
+    """
+    The leading nested levels (field names, outermost first) that a request
+    with ?fields= / ?depth= still renders; a level is cut together with
+    everything below it.
+    """
+    kept = []
+    for i, name in enumerate(levels):
+        if depth is not None and i >= depth:
+            break
+        if fields is not None and name not in fields:
+            break
+        kept.append(name)
+    return tuple(kept)
+
+
+def course_trees(course_ids, language: str | None = None, fields=None, depth=None) -> list[dict]:
+    """
+    CourseSerializer output for the given courses, in the given order, built
+    from one values() query per level (filtered by course through joins) and
+    plain dicts joined on parent ids. Unknown ids are skipped. With `language`
+    only resources in that language are included; `fields` and `depth` prune
+    the output like the serializers do, and pruned levels are not queried.
+    """
+    course_ids = list(course_ids)
+    if not course_ids:
+        return []
+    levels = len(kept_levels(TREE_LEVELS, fields, depth))
+
+    def pick(row):
+        if fields is None:
+            return row
+        return {name: value for name, value in row.items() if name in fields}
+
+    courses = {
+        row["id"]: row
+        for row in CourseCard.objects.filter(pk__in=course_ids).values(*COURSE_FIELDS)
+    }
+
+    children = {}
+    if levels >= 4:
+        resource_rows = Resource.objects.filter(sub_map__roadmap__path__course_id__in=course_ids)
+        if language is not None:
+            resource_rows = resource_rows.filter(language=language)
+        for sub_map_id, resource_language, link_type, link in (
+            resource_rows.order_by("id").values_list("sub_map_id", "language", "link_type", "link")
+        ):
+            grouped = children.setdefault(sub_map_id, {})
+            grouped.setdefault(resource_language, []).append({"link_type": link_type, "link": link})
+    if levels >= 3:
+        sub_maps = (
+            SubMap.objects.filter(roadmap__path__course_id__in=course_ids)
+            .order_by("id")
+            .values(*SUB_MAP_FIELDS, "roadmap_id")
+        )
+        children = _children(sub_maps, "roadmap_id", "resources" if levels >= 4 else None, children, dict, pick)
+    if levels >= 2:
+        roadmaps = (
+            Roadmap.objects.filter(path__course_id__in=course_ids)
+            .order_by("id")
+            .values(*ROADMAP_FIELDS, "path_id")
+        )
+        children = _children(roadmaps, "path_id", "sub_maps" if levels >= 3 else None, children, list, pick)
+    if levels >= 1:
+        paths = Path.objects.filter(course_id__in=course_ids).order_by("id").values(*PATH_FIELDS, "course_id")
+        children = _children(paths, "course_id", "roadmaps" if levels >= 2 else None, children, list, pick)
+
+    trees = []
+    for course_id in course_ids:
+        course = courses.get(course_id)
+        if course is None:
+            continue
+        # FloatField is the one field DRF converts on output.
+        course["rating"] = float(course["rating"]) if course["rating"] is not None else None
+        if levels >= 1:
+            course["path_items"] = children.get(course_id, [])
+        trees.append(pick(course))
+    return trees
+
+
+def course_tree(course_id, language: str | None = None, fields=None, depth=None) -> dict | None:
+    trees = course_trees([course_id], language, fields, depth)
+    return trees[0] if trees else None
@@ -0,0 +1,116 @@
+from django.db import transaction
+
+from ..models import CourseCard, Path, Roadmap, SubMap, Resource
+from . import tracing
+from .skill_index import register_skill_aliases
+
+LEVEL_RANK = {
+    "beginner": 0,
+    "intermediate": 1,
+    "advanced": 2,
+}
+
+
+def _path_level_sort_key(path_data):
+    level = str(path_data.get("level") or "").strip().lower()
+    return LEVEL_RANK.get(level, 99)
+
+
+def _bulk_create(model, objs):
+    table = model._meta.db_table
+    with tracing.span(
+        f"bulk_create {table}",
+        {"db.operation.name": "bulk_create", "db.collection.name": table, "skills.rows": len(objs)},
+    ):
+        return model.objects.bulk_create(objs)
+
+
+@tracing.span("persist.course")
+@transaction.atomic
+def save_generated_course(ai_data: dict, skill: str | None = None) -> CourseCard:
+    """
+    Persist a generated course tree level by level with bulk_create.
+
+    The model save() overrides (and their counter cascade) are bypassed, so
+    path_count / roadmap_count / sub_map_count / resources_count are computed
+    here from the payload and written with the rows. The number of queries
+    depends on the tree depth, not on how many rows it contains. The requested
+    skill and the course title are registered as skill aliases.
+    """
+    course_data = ai_data["course"]
+    sorted_paths = sorted(ai_data["paths"], key=_path_level_sort_key)
+
+    course = CourseCard.objects.create(
+        title=course_data["title"],
+        description=course_data["description"],
+        overview=course_data["overview"],
+        icon=course_data.get("icon"),
+        category=course_data["category"],
+        level=course_data["level"],
+        students=course_data.get("students", "1M+ learners worldwide"),
+        duration=course_data["duration"],
+        rating=course_data.get("rating", 4.5),
+        color=course_data["color"],
+        tags=course_data.get("tags", []),
+        career_opportunities=course_data.get("career_opportunities", []),
+        tools_needed=course_data.get("tools_needed", []),
+        special_features=course_data.get("special_features", []),
+        path_count=len(sorted_paths),
+    )
+
+    paths = _bulk_create(
+        Path,
+        [
+            Path(
+                course=course,
+                title=path_data["title"],
+                mini_desc=path_data["mini_desc"],
+                level=path_data["level"],
+                duration=path_data["duration"],
+                roadmap_count=len(path_data["roadmaps"]),
+            )
+            for path_data in sorted_paths
+        ]
+    )
+
+    roadmap_rows = [
+        (rm_data, Roadmap(
+            path=path,
+            title=rm_data["title"],
+            micro_desc=rm_data["micro_desc"],
+            duration=rm_data["duration"],
+            sub_map_count=len(rm_data["sub_maps"]),
+        ))
+        for path, path_data in zip(paths, sorted_paths)
+        for rm_data in path_data["roadmaps"]
+    ]
+    _bulk_create(Roadmap, [roadmap for _, roadmap in roadmap_rows])
+
+    sub_map_rows = [
+        (sm_data, SubMap(
+            roadmap=roadmap,
+            title=sm_data["title"],
+            micro_desc=sm_data.get("micro_desc", ""),
+            resources_count=len(sm_data.get("resources", [])),
+        ))
+        for rm_data, roadmap in roadmap_rows
+        for sm_data in rm_data["sub_maps"]
+    ]
+    _bulk_create(SubMap, [sub_map for _, sub_map in sub_map_rows])
+
+    _bulk_create(
+        Resource,
+        [
+            Resource(
+                sub_map=sub_map,
+                language=res["language"],
+                link_type=res["link_type"],
+                link=res.get("link"),
+            )
+            for sm_data, sub_map in sub_map_rows
+            for res in sm_data.get("resources", [])
+        ]
+    )
+    with tracing.span("persist.skill_aliases"):
+        register_skill_aliases(course, *filter(None, [skill, course.title]))
+    return course
@@ -0,0 +1,242 @@
+from datetime import date, timedelta
+
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from ..models import (
+    StageProgress,
+    UserCourseStats,
+    UserCourseTracking,
+    UserDashboardStats,
+)
+from .activity import daily_totals, increment_activity, last_active_day, streak_ending
+from .course_structure import get_course_structure, get_course_structures
+from .progress_bitmap import completed_count
+
+# Days of activity kept in UserDashboardStats.recent_activity (the dashboard shows 7).
+RECENT_DAYS = 14
+_STATS_FIELDS = ("completed_stages", "total_stages", "next_stage_title", "tree_version", "last_activity")
+_TRACKING_FIELDS = ("completed_sub_map_ids", "completed_bitmap", "completed_base", "last_accessed_at")
+
+
+def _course_stats_fields(tracking, passed_ids, structure) -> dict:
+    """UserCourseStats fields from a tracking row (values() dict or None) and passed stages."""
+    total_units = structure.sub_map_count
+    if tracking is not None:
+        completed_units = completed_count(
+            tracking["completed_bitmap"],
+            tracking["completed_base"],
+            tracking["completed_sub_map_ids"],
+            structure,
+        )
+    else:
+        # Passed exams without a tracking row: count passed stages instead.
+        completed_units = min(len(passed_ids), total_units)
+    return {
+        "completed_stages": completed_units,
+        "total_stages": total_units,
+        "next_stage_title": structure.next_stage_title(passed_ids),
+        "tree_version": structure.version,
+        "last_activity": tracking["last_accessed_at"] if tracking else None,
+    }
+
+
+def _upsert_course_stats(user, fields_by_course: dict) -> list[UserCourseStats]:
+    """Insert or overwrite the user's cards ({course_id: fields}) in one statement."""
+    if not fields_by_course:
+        return []
+    return UserCourseStats.objects.bulk_create(
+        [
+            UserCourseStats(user=user, course_id=course_id, **fields)
+            for course_id, fields in fields_by_course.items()
+        ],
+        update_conflicts=True,
+        unique_fields=["user", "course"],
+        update_fields=[*_STATS_FIELDS, "updated_at"],
+    )
+
+
+def refresh_course_stats(user, course_id, tree_version=None) -> UserCourseStats | None:
+    """
+    Recompute the user's dashboard card for one course from its tracking row,
+    passed stages and the cached course structure. The cost depends on that
+    course only.
+    """
+    tracking = (
+        UserCourseTracking.objects.filter(user=user, course_id=course_id)
+        .values(*_TRACKING_FIELDS)
+        .first()
+    )
+    passed_ids = set(
+        StageProgress.objects.filter(
+            user=user, roadmap__path__course_id=course_id
+        ).values_list("roadmap_id", flat=True)
+    )
+    if tracking is None and not passed_ids:
+        UserCourseStats.objects.filter(user=user, course_id=course_id).delete()
+        return None
+
+    structure = get_course_structure(course_id, tree_version)
+    [stats] = _upsert_course_stats(
+        user, {course_id: _course_stats_fields(tracking, passed_ids, structure)}
+    )
+    return stats
+
+
+def rebuild_user_stats(user) -> UserDashboardStats:
+    """
+    Recompute every dashboard row of the user from scratch (backfill and repair).
+    The number of queries does not grow with the number of courses.
+    """
+    trackings = {
+        row["course_id"]: row
+        for row in UserCourseTracking.objects.filter(user=user).values("course_id", *_TRACKING_FIELDS)
+    }
+    passed = {}
+    for roadmap_id, course_id in StageProgress.objects.filter(user=user).values_list(
+        "roadmap_id", "roadmap__path__course_id"
+    ):
+        passed.setdefault(course_id, set()).add(roadmap_id)
+    structures = get_course_structures(trackings.keys() | passed.keys())
+
+    with transaction.atomic():
+        UserCourseStats.objects.filter(user=user).exclude(course_id__in=list(structures)).delete()
+        _upsert_course_stats(
+            user,
+            {
+                course_id: _course_stats_fields(
+                    trackings.get(course_id), passed.get(course_id, set()), structure
+                )
+                for course_id, structure in structures.items()
+            },
+        )
+
+        today = timezone.localdate()
+        last_day = last_active_day(user)
+        recent = daily_totals(user, today - timedelta(days=RECENT_DAYS - 1), today)
+        [stats] = UserDashboardStats.objects.bulk_create(
+            [
+                UserDashboardStats(
+                    user=user,
+                    recent_activity={day.isoformat(): count for day, count in recent.items()},
+                    streak_days=streak_ending(user, last_day) if last_day else 0,
+                    last_active_day=last_day,
+                )
+            ],
+            update_conflicts=True,
+            unique_fields=["user"],
+            update_fields=["recent_activity", "streak_days", "last_active_day", "updated_at"],
+        )
+    return stats
+
+
+def ensure_user_stats(user) -> tuple[UserDashboardStats, bool]:
+    """The user's stats row, built from their history the first time. Returns (stats, rebuilt)."""
+    stats = UserDashboardStats.objects.filter(user=user).first()
+    if stats is not None:
+        return stats, False
+    return rebuild_user_stats(user), True
+
+
+def record_activity(user, day: date | None = None, count: int = 1):
+    """
+    Add `count` sessions on `day` (today by default) to the materialized
+    counters and extend or restart the streak. DailyActivity is updated by the
+    caller first.
+    """
+    day = day or timezone.localdate()
+    with transaction.atomic():
+        stats = UserDashboardStats.objects.select_for_update().filter(user=user).first()
+        if stats is None:
+            # The rebuild reads the activity that was just written.
+            rebuild_user_stats(user)
+            return
+        cutoff = timezone.localdate() - timedelta(days=RECENT_DAYS - 1)
+        activity = {
+            key: value
+            for key, value in (stats.recent_activity or {}).items()
+            if date.fromisoformat(key) >= cutoff
+        }
+        if day >= cutoff:
+            activity[day.isoformat()] = int(activity.get(day.isoformat(), 0)) + count
+        stats.recent_activity = activity
+        if stats.last_active_day is None or day > stats.last_active_day:
+            if stats.last_active_day == day - timedelta(days=1):
+                stats.streak_days += 1
+            else:
+                stats.streak_days = 1
+            stats.last_active_day = day
+        stats.save()
+
+
+def course_progress_changed(user, course_id, activity: bool = False, tree_version=None):
+    """Hook for user-progress writes and newly passed stages."""
+    if activity:
+        increment_activity(user, course_id)
+    _, rebuilt = ensure_user_stats(user)
+    if rebuilt:
+        return
+    refresh_course_stats(user, course_id, tree_version)
+    if activity:
+        record_activity(user)
+
+
+def dashboard_data(user) -> dict:
+    """
+    Everything dashboard-summary needs, read from the materialized rows: one
+    query for the user's stats and one indexed query for their course cards.
+    """
+    stats, _ = ensure_user_stats(user)
+    today = timezone.localdate()
+    recent = stats.recent_activity or {}
+    weekly_activity = []
+    weekly_sessions = 0
+    for i in range(6, -1, -1):
+        d = today - timedelta(days=i)
+        sessions = int(recent.get(d.isoformat(), 0))
+        weekly_sessions += sessions
+        weekly_activity.append(
+            {
+                "date": d.isoformat(),
+                "label": d.strftime("%a"),
+                "sessions": sessions,
+            }
+        )
+    # The streak counts back from today, so it is broken unless today was active.
+    streak = stats.streak_days if stats.last_active_day == today else 0
+
+    course_stats = (
+        UserCourseStats.objects.filter(user=user)
+        .select_related("course")
+        .order_by(F("last_activity").desc(nulls_last=True), "course_id")
+    )
+    active_skills = []
+    completed_skills = 0
+    for item in course_stats:
+        if item.tree_version != item.course.tree_version:
+            # The course tree changed since this card was computed.
+            item = refresh_course_stats(user, item.course_id, item.course.tree_version) or item
+        if item.is_completed:
+            completed_skills += 1
+        active_skills.append(
+            {
+                "course_id": item.course_id,
+                "title": item.course.title,
+                "icon": item.course.icon,
+                "level": item.course.level,
+                "category": item.course.category,
+                "progress_pct": item.progress_pct,
+                "completed_stages": item.completed_stages,
+                "total_stages": item.total_stages,
+                "last_activity": item.last_activity,
+                "next_stage_title": item.next_stage_title,
+            }
+        )
+    return {
+        "active_skills": active_skills,
+        "completed_skills": completed_skills,
+        "weekly_activity": weekly_activity,
+        "weekly_sessions": weekly_sessions,
+        "streak": streak,
+    }
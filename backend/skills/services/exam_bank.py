@@ -0,0 +1,177 @@
+import hashlib
+import logging
+import random
+import re
+import subprocess
+import sys
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Max, Q
+from django.utils import timezone
+
+from ..models import Quiz, QuizQuestion
+from .groq_ai import generate_exam_for_roadmap
+
+logger = logging.getLogger(__name__)
+
+
+def _bank_setting(name: str, default):
+    return type(default)(getattr(settings, name, default))
+
+
+def question_fingerprint(question_text: str) -> str:
+    """Same fingerprint for questions that differ only in case, spacing or punctuation."""
+    normalized = " ".join(re.findall(r"[a-z0-9]+", (question_text or "").lower()))
+    return hashlib.sha1(normalized.encode("utf-8")).hexdigest()
+
+
+def active_questions(quiz: Quiz):
+    """Questions still eligible for exams; ones served EXAM_QUESTION_MAX_SERVES times retire."""
+    questions = quiz.questions.all()
+    max_serves = _bank_setting("EXAM_QUESTION_MAX_SERVES", 0)
+    if max_serves > 0:
+        questions = questions.filter(times_served__lt=max_serves)
+    return questions
+
+
+def add_questions(quiz: Quiz, questions_data: list[dict]) -> int:
+    """Store generated questions, skipping ones already in the bank. Returns how many were added."""
+    seen = set(quiz.questions.values_list("fingerprint", flat=True))
+    next_order = (quiz.questions.aggregate(n=Max("order"))["n"] or 0) + 1
+    rows = []
+    for q in questions_data:
+        fingerprint = question_fingerprint(q.get("question_text"))
+        if fingerprint in seen:
+            continue
+        seen.add(fingerprint)
+        row = QuizQuestion(
+            quiz=quiz,
+            order=next_order + len(rows),
+            question_type=q.get("type", "multiple_choice"),
+            question_text=q.get("question_text", ""),
+            fingerprint=fingerprint,
+        )
+        if row.question_type == "short_answer":
+            row.expected_keywords = q.get("expected_keywords") or []
+        else:
+            row.options = q.get("options") or []
+            row.correct_index = q.get("correct_index", 0)
+        rows.append(row)
+    # A concurrent refill may have stored the same question meanwhile.
+    QuizQuestion.objects.bulk_create(rows, ignore_conflicts=True)
+    return len(rows)
+
+
+def fill_bank(roadmap, max_rounds: int | None = None) -> int:
+    """
+    Generate questions until the bank holds EXAM_BANK_TARGET_SIZE active ones,
+    giving up after EXAM_BANK_MAX_ROUNDS LLM calls (duplicates add nothing).
+    """
+    quiz, _ = Quiz.objects.get_or_create(roadmap=roadmap)
+    target = _bank_setting("EXAM_BANK_TARGET_SIZE", 30)
+    if max_rounds is None:
+        max_rounds = _bank_setting("EXAM_BANK_MAX_ROUNDS", 5)
+    added = 0
+    for _ in range(max_rounds):
+        if active_questions(quiz).count() >= target:
+            break
+        added += add_questions(quiz, generate_exam_for_roadmap(roadmap))
+    return added
+
+
+def refill_bank(quiz: Quiz) -> int:
+    """Background refill; always clears the pending flag so the bank can be requested again."""
+    try:
+        return fill_bank(quiz.roadmap)
+    except Exception:
+        logger.exception("Question bank refill for roadmap %s failed", quiz.roadmap_id)
+        return 0
+    finally:
+        Quiz.objects.filter(pk=quiz.pk).update(refill_requested_at=None)
+
+
+def _spawn_refill(roadmap_id):
+    manage_py = str(settings.BASE_DIR / "manage.py")
+    subprocess.Popen(
+        [sys.executable, manage_py, "refill_exam_banks", "--roadmap", str(roadmap_id)],
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+        close_fds=True,
+    )
+
+
+def request_refill(quiz: Quiz) -> bool:
+    """
+    Flag the bank for a background refill unless one is already pending. A flag
+    older than COURSE_JOB_STALE_SECONDS is taken over. Follows COURSE_JOB_RUNNER:
+    "process" spawns a refill process, "worker" leaves it for the worker loop.
+    """
+    stale_after = int(getattr(settings, "COURSE_JOB_STALE_SECONDS", 900))
+    now = timezone.now()
+    claimed = Quiz.objects.filter(
+        Q(refill_requested_at__isnull=True)
+        | Q(refill_requested_at__lt=now - timedelta(seconds=stale_after)),
+        pk=quiz.pk,
+    ).update(refill_requested_at=now)
+    if claimed and getattr(settings, "COURSE_JOB_RUNNER", "process") == "process":
+        transaction.on_commit(lambda: _spawn_refill(quiz.roadmap_id))
+    return bool(claimed)
+
+
+def pending_refills():
+    return Quiz.objects.filter(refill_requested_at__isnull=False).select_related("roadmap")
+
+
+def _as_exam_question(question: QuizQuestion) -> dict:
+    if question.question_type == "short_answer":
+        return {
+            "type": "short_answer",
+            "question_text": question.question_text,
+            "expected_keywords": question.expected_keywords,
+        }
+    return {
+        "type": "multiple_choice",
+        "question_text": question.question_text,
+        "options": question.options,
+        "correct_index": question.correct_index,
+    }
+
+
+def sample_exam(roadmap) -> list[dict]:
+    """
+    Assemble an exam from the roadmap's bank: EXAM_QUESTION_COUNT questions,
+    EXAM_SHORT_ANSWER_COUNT of them short answer when the bank has enough, in
+    random order. Same question dicts as generate_exam_for_roadmap, so grading
+    is unchanged.
+
+    An empty bank gets one inline LLM round (normally once per roadmap, the
+    only LLM call on this path); a bank below EXAM_BANK_MIN_SIZE is refilled in
+    the background.
+    """
+    quiz, _ = Quiz.objects.get_or_create(roadmap=roadmap)
+    size = _bank_setting("EXAM_QUESTION_COUNT", 10)
+    pool = list(active_questions(quiz).values_list("id", "question_type"))
+    if not pool:
+        fill_bank(roadmap, max_rounds=1)
+        pool = list(active_questions(quiz).values_list("id", "question_type"))
+
+    short_ids = [qid for qid, qtype in pool if qtype == "short_answer"]
+    choice_ids = [qid for qid, qtype in pool if qtype != "short_answer"]
+    short_count = min(_bank_setting("EXAM_SHORT_ANSWER_COUNT", 4), len(short_ids))
+    choice_count = min(size - short_count, len(choice_ids))
+    # Top up with short answers when there are too few multiple choice questions.
+    short_count = min(size - choice_count, len(short_ids))
+    picked = random.sample(short_ids, short_count) + random.sample(choice_ids, choice_count)
+    random.shuffle(picked)
+
+    if picked:
+        QuizQuestion.objects.filter(pk__in=picked).update(times_served=F("times_served") + 1)
+    if len(pool) < _bank_setting("EXAM_BANK_MIN_SIZE", 15):
+        request_refill(quiz)
+
+    by_id = QuizQuestion.objects.in_bulk(picked)
+    return [_as_exam_question(by_id[qid]) for qid in picked]
@@ -0,0 +1,130 @@
+import base64
+import json
+import os
+import uuid
+import zlib
+from datetime import timedelta
+
+from cryptography.exceptions import InvalidTag
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from django.conf import settings
+from django.core import signing
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from django.utils.crypto import salted_hmac
+
+from ..models import ExamSession, SubmittedExamToken
+
+_SALT = "skills.exam_session"
+_NONCE_BYTES = 12
+
+
+def exam_session_backend() -> str:
+    """"signed" keeps the answer key in the token; "database" stores an ExamSession row."""
+    return getattr(settings, "EXAM_SESSION_BACKEND", "signed")
+
+
+def _max_age() -> int:
+    return int(getattr(settings, "EXAM_SESSION_MAX_AGE_SECONDS", 7200))
+
+
+def _aead() -> AESGCM:
+    # AES-256-GCM, keyed from SECRET_KEY.
+    return AESGCM(salted_hmac(_SALT, "encryption-key", algorithm="sha256").digest())
+
+
+def _encrypt(questions: list, roadmap_id: int) -> str:
+    plain = zlib.compress(json.dumps(questions, separators=(",", ":")).encode("utf-8"))
+    nonce = os.urandom(_NONCE_BYTES)
+    # The roadmap id is authenticated with the answer key, so a blob can't be moved to another exam.
+    cipher = _aead().encrypt(nonce, plain, str(roadmap_id).encode("ascii"))
+    return base64.urlsafe_b64encode(nonce + cipher).decode("ascii").rstrip("=")
+
+
+def _decrypt(blob: str, roadmap_id: int) -> list:
+    raw = base64.urlsafe_b64decode(blob + "=" * (-len(blob) % 4))
+    nonce, cipher = raw[:_NONCE_BYTES], raw[_NONCE_BYTES:]
+    plain = _aead().decrypt(nonce, cipher, str(roadmap_id).encode("ascii"))
+    return json.loads(zlib.decompress(plain))
+
+
+def _signed_payload(session_key: str) -> dict | None:
+    try:
+        return signing.loads(session_key, salt=_SALT, max_age=_max_age())
+    except signing.BadSignature:
+        return None
+
+
+def issue_exam_session(roadmap, questions: list) -> str:
+    """
+    Return the session_key for a new exam. In "signed" mode the answer key is
+    compressed, encrypted (AES-GCM) and signed into the key itself, with its
+    issue time (checked against EXAM_SESSION_MAX_AGE_SECONDS) and a token id
+    that is recorded once the exam is submitted.
+    """
+    if exam_session_backend() == "database":
+        session_key = str(uuid.uuid4())
+        ExamSession.objects.create(
+            session_key=session_key,
+            roadmap=roadmap,
+            questions_json=questions,
+        )
+        return session_key
+    return signing.dumps(
+        {"r": roadmap.id, "j": uuid.uuid4().hex, "q": _encrypt(questions, roadmap.id)},
+        salt=_SALT,
+    )
+
+
+def load_exam_session(roadmap_id: int, session_key: str) -> list | None:
+    """
+    The exam's questions with their answers, or None if the key is unknown,
+    expired, tampered with or issued for another roadmap. Signed keys are
+    checked without touching the database.
+    """
+    if exam_session_backend() == "database":
+        session = ExamSession.objects.filter(
+            session_key=session_key,
+            roadmap_id=roadmap_id,
+            created_at__gte=timezone.now() - timedelta(seconds=_max_age()),
+        ).first()
+        return session.questions_json if session else None
+    data = _signed_payload(session_key)
+    if data is None or data.get("r") != roadmap_id:
+        return None
+    try:
+        return _decrypt(data["q"], roadmap_id)
+    except (InvalidTag, KeyError, ValueError):
+        return None
+
+
+def close_exam_session(session_key: str) -> bool:
+    """
+    Consume a graded exam session. Returns False if it was already consumed
+    (a replayed or concurrent submission), which must not be graded again.
+    Signed keys are single-use through their token id, kept in
+    SubmittedExamToken until the key would have expired anyway.
+    """
+    if exam_session_backend() == "database":
+        deleted, _ = ExamSession.objects.filter(session_key=session_key).delete()
+        return deleted > 0
+    data = _signed_payload(session_key)
+    if data is None or not data.get("j"):
+        return False
+    try:
+        with transaction.atomic():
+            SubmittedExamToken.objects.create(
+                token_id=data["j"],
+                expires_at=timezone.now() + timedelta(seconds=_max_age()),
+            )
+    except IntegrityError:
+        return False
+    return True
+
+
+def delete_expired_exam_sessions() -> int:
+    """Delete abandoned ExamSession rows and ids of signed sessions that have expired."""
+    now = timezone.now()
+    deleted, _ = ExamSession.objects.filter(created_at__lt=now - timedelta(seconds=_max_age())).delete()
+    SubmittedExamToken.objects.filter(expires_at__lt=now).delete()
+    return deleted
@@ -0,0 +1,222 @@
+import logging
+import subprocess
+import sys
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from ..models import CourseGenerationJob
+from . import tracing
+from .course_writer import save_generated_course
+from .groq_ai import generate_skill_course
+from .skill_index import normalize_skill_key
+
+logger = logging.getLogger(__name__)
+
+# Percent reached when each attempt enters a stage; three LLM attempts share 5-75%.
+_ATTEMPT_SPAN = 25
+_STAGE_PROGRESS = {
+    "llm": 5,
+    "validation": 20,
+}
+PERSISTENCE_PROGRESS = 85
+
+
+def _stage_progress(stage: str, attempt: int) -> int:
+    return min(80, _STAGE_PROGRESS[stage] + attempt * _ATTEMPT_SPAN)
+
+
+def _set_stage(job_id, stage: str, progress: int, **fields):
+    CourseGenerationJob.objects.filter(pk=job_id).update(
+        stage=stage, progress=progress, updated_at=timezone.now(), **fields
+    )
+
+
+def serialize_job(job: CourseGenerationJob) -> dict:
+    return {
+        "job_id": str(job.id),
+        "skill": job.skill,
+        "status": job.status,
+        "stage": job.stage,
+        "progress": job.progress,
+        "course_id": job.course_id,
+        "error": job.error or None,
+        "created_at": job.created_at,
+        "updated_at": job.updated_at,
+    }
+
+
+def _spawn_worker(job_id):
+    manage_py = str(settings.BASE_DIR / "manage.py")
+    subprocess.Popen(
+        [sys.executable, manage_py, "process_generation_jobs", "--job", str(job_id)],
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+        close_fds=True,
+    )
+
+
+def coalesce_key(skill: str, preferred_language: str) -> str:
+    """Requests with the same key share one in-flight generation."""
+    return f"{normalize_skill_key(skill)}|{preferred_language.lower()}"
+
+
+def _inflight_job(key: str) -> CourseGenerationJob | None:
+    return CourseGenerationJob.objects.filter(
+        coalesce_key=key, status__in=["queued", "running"]
+    ).first()
+
+
+def _start_job(skill: str, preferred_language: str, **fields) -> tuple[CourseGenerationJob, bool]:
+    """
+    Insert a job for this skill + language unless one is already queued or
+    running. The partial unique constraint on coalesce_key makes the insert
+    the lock, so concurrent requests in any process agree on a single leader.
+    Returns (job, created); followers get the in-flight job.
+    """
+    key = coalesce_key(skill, preferred_language)
+    for _ in range(3):
+        try:
+            with transaction.atomic():
+                job = CourseGenerationJob.objects.create(
+                    skill=skill,
+                    preferred_language=preferred_language,
+                    coalesce_key=key,
+                    **fields,
+                )
+            return job, True
+        except IntegrityError:
+            # A dead leader would block the key until it is marked stale.
+            fail_stale_jobs()
+            job = _inflight_job(key)
+            if job is not None:
+                return job, False
+            # The in-flight job finished between the insert and the lookup.
+    job = CourseGenerationJob.objects.create(
+        skill=skill, preferred_language=preferred_language, **fields
+    )
+    return job, True
+
+
+def enqueue_generation_job(skill: str, preferred_language: str) -> CourseGenerationJob:
+    """
+    Store a queued job, or return the one already in flight for the same
+    skill + language. With COURSE_JOB_RUNNER="process" a detached worker
+    process is started for a new job once the row is committed; with "worker"
+    it is left for a long-running `manage.py process_generation_jobs` loop.
+    """
+    job, created = _start_job(skill, preferred_language)
+    if created and getattr(settings, "COURSE_JOB_RUNNER", "process") == "process":
+        transaction.on_commit(lambda: _spawn_worker(job.id))
+    return job
+
+
+def start_generation_job(skill: str, preferred_language: str) -> tuple[CourseGenerationJob, bool]:
+    """
+    Claim generation for a request that will run it inline. Returns
+    (job, True) when the caller is the leader and must run the job, or the
+    in-flight job and False when it should wait for that one instead.
+    """
+    now = timezone.now()
+    return _start_job(
+        skill,
+        preferred_language,
+        status="running",
+        stage="llm",
+        progress=1,
+        started_at=now,
+    )
+
+
+def wait_for_job(job: CourseGenerationJob, timeout: float, interval: float = 0.5) -> CourseGenerationJob:
+    """Poll until the job finishes or `timeout` seconds pass; returns the refreshed job."""
+    deadline = time.monotonic() + timeout
+    while True:
+        job.refresh_from_db()
+        if job.status in ("succeeded", "failed") or time.monotonic() >= deadline:
+            return job
+        time.sleep(interval)
+
+
+def finish_job(job_id, course=None, error: str = ""):
+    """Record the outcome, which also releases the skill + language for new jobs."""
+    if error:
+        # Stage and progress keep the last reported values, so clients see where it failed.
+        CourseGenerationJob.objects.filter(pk=job_id).update(
+            status="failed",
+            error=error[:2000],
+            finished_at=timezone.now(),
+            updated_at=timezone.now(),
+        )
+    else:
+        _set_stage(
+            job_id,
+            "done",
+            100,
+            status="succeeded",
+            course=course,
+            finished_at=timezone.now(),
+        )
+
+
+def claim_job(job_id=None) -> CourseGenerationJob | None:
+    """Atomically move one queued job (or the given one) to running."""
+    queued = CourseGenerationJob.objects.filter(status="queued")
+    if job_id is not None:
+        queued = queued.filter(pk=job_id)
+    for candidate_id in queued.order_by("created_at").values_list("id", flat=True)[:5]:
+        now = timezone.now()
+        claimed = CourseGenerationJob.objects.filter(
+            pk=candidate_id, status="queued"
+        ).update(status="running", stage="llm", progress=1, started_at=now, updated_at=now)
+        if claimed:
+            return CourseGenerationJob.objects.get(pk=candidate_id)
+    return None
+
+
+def run_generation_job(job: CourseGenerationJob) -> CourseGenerationJob:
+    def on_stage(stage, attempt):
+        _set_stage(job.id, stage, _stage_progress(stage, attempt))
+
+    attributes = {
+        "skills.job.id": str(job.id),
+        "skills.skill": job.skill,
+        "skills.language": job.preferred_language,
+    }
+    try:
+        with tracing.span("generation_job", attributes):
+            with tracing.span("generate_course"):
+                ai_data = generate_skill_course(
+                    job.skill, preferred_language=job.preferred_language, on_stage=on_stage
+                )
+            _set_stage(job.id, "persistence", PERSISTENCE_PROGRESS)
+            course = save_generated_course(ai_data, skill=job.skill)
+    except Exception as exc:
+        logger.exception("Course generation job %s failed", job.id)
+        finish_job(job.id, error=str(exc) or exc.__class__.__name__)
+    else:
+        finish_job(job.id, course=course)
+    job.refresh_from_db()
+    return job
+
+
+def fail_stale_jobs() -> int:
+    """
+    Mark running jobs whose worker stopped reporting, and queued jobs no
+    worker picked up (e.g. the spawned process died before claiming), as
+    failed so they stop holding their coalesce key.
+    """
+    stale_after = int(getattr(settings, "COURSE_JOB_STALE_SECONDS", 900))
+    cutoff = timezone.now() - timedelta(seconds=stale_after)
+    stale = Q(status="running", updated_at__lt=cutoff) | Q(status="queued", created_at__lt=cutoff)
+    return CourseGenerationJob.objects.filter(stale).update(
+        status="failed",
+        error="Generation worker stopped responding.",
+        finished_at=timezone.now(),
+    )
@@ -1,13 +1,22 @@
+import functools
 import json
 import re
+import time
 from urllib.parse import quote_plus, urlparse, unquote_plus
+from urllib.error import HTTPError
 from urllib.request import Request, urlopen
 
 from django.conf import settings
 from groq import Groq
 
+from . import link_checks, tracing
+from .incremental_json import WILDCARD, IncrementalJSONParser
+from .link_cache import MISSING, get_link_cache
+
 client = Groq(api_key=settings.GROQ_API_KEY)
 
+LLM_MODEL = "llama-3.1-8b-instant"
+
 ALLOWED_LANGUAGES = {"English", "Bangla", "Hindi"}
 LANGUAGE_QUERY_HINTS = {
     "English": "english",
@@ -139,35 +148,82 @@ def _domain_matches(domain: str, allowed: set[str]) -> bool:
     return any(d == a or d.endswith(f".{a}") for a in allowed)
 
 
-_YOUTUBE_OEMBED_CACHE: dict[str, dict] = {}
-_YOUTUBE_SEARCH_CACHE: dict[str, str] = {}
+_OEMBED_FAILED = {"ok": False, "title": "", "author": ""}
+# Answer for a check that failed on our side (timeout, throttling, 5xx); never cached.
+_OEMBED_UNKNOWN = {**_OEMBED_FAILED, "unknown": True}
+# 4xx answers that are about the request being throttled, not about the video.
+_TRANSIENT_HTTP_STATUSES = {408, 425, 429}
 
 
-def _get_youtube_oembed(url: str) -> dict:
-    cached = _YOUTUBE_OEMBED_CACHE.get(url)
-    if cached is not None:
-        return cached
+def _is_definitive_http_error(status: int) -> bool:
+    return 400 <= status < 500 and status not in _TRANSIENT_HTTP_STATUSES
+
+
+def _youtube_endpoint(path: str) -> str:
+    base = getattr(settings, "YOUTUBE_BASE_URL", "https://www.youtube.com")
+    return base.rstrip("/") + path
+
+
+def _http_span(url: str, kind: str):
+    parsed = urlparse(url)
+    return tracing.span(
+        "GET",
+        {
+            "http.request.method": "GET",
+            "server.address": parsed.hostname,
+            "url.path": parsed.path,
+            "skills.link_check": kind,
+        },
+        kind=tracing.CLIENT,
+    )
+
 
+def _fetch_youtube_oembed(url: str) -> dict:
     try:
         oembed_url = (
-            "https://www.youtube.com/oembed?url="
+            _youtube_endpoint("/oembed?url=")
             + quote_plus(url)
             + "&format=json"
         )
-        with urlopen(oembed_url, timeout=4) as resp:
+        with _http_span(oembed_url, "oembed") as span, urlopen(oembed_url, timeout=4) as resp:
             payload = json.loads(resp.read().decode("utf-8", errors="ignore"))
             status_ok = int(getattr(resp, "status", 200)) == 200
+            span.set_attribute("http.response.status_code", int(getattr(resp, "status", 200)))
             out = {
                 "ok": bool(status_ok),
                 "title": _clean_str(payload.get("title"), "").lower(),
                 "author": _clean_str(payload.get("author_name"), "").lower(),
             }
-            _YOUTUBE_OEMBED_CACHE[url] = out
-            return out
+    except HTTPError as exc:
+        if not _is_definitive_http_error(exc.code):
+            return dict(_OEMBED_UNKNOWN)
+        # YouTube answers 401/403/404 for removed, private or non-embeddable videos.
+        out = dict(_OEMBED_FAILED)
     except Exception:
-        out = {"ok": False, "title": "", "author": ""}
-        _YOUTUBE_OEMBED_CACHE[url] = out
-        return out
+        # Timeouts, connection errors and unreadable answers say nothing about
+        # the video; they are not cached, so the next check asks again.
+        return dict(_OEMBED_UNKNOWN)
+    get_link_cache("oembed").set(url, out)
+    return out
+
+
+def _record_link_cache(namespace: str, hit: bool):
+    get_link_cache(namespace).record(hit)
+    tracing.increment(f"skills.link_cache.{namespace}.{'hits' if hit else 'misses'}")
+
+
+def _cached_link_check(namespace: str, key: str, fetch, *args, default):
+    cached = get_link_cache(namespace).get(key, count=False)
+    link_checks.count_lookup(
+        (namespace, key), cached is not MISSING, functools.partial(_record_link_cache, namespace)
+    )
+    if cached is not MISSING:
+        return cached
+    return link_checks.resolve((namespace, key), fetch, *args, default=default)
+
+
+def _get_youtube_oembed(url: str) -> dict:
+    return _cached_link_check("oembed", url, _fetch_youtube_oembed, url, default=_OEMBED_UNKNOWN)
 
 
 def _is_embeddable_youtube_video(url: str) -> bool:
@@ -186,12 +242,20 @@ def _youtube_search_direct_link(
     lang_hint = LANGUAGE_QUERY_HINTS.get(lang, "english")
     query_text = f"{skill} {stage_title} {topic_title} {lang_hint} {suffix}".strip()
     cache_key = f"{query_text.lower()}::{int(want_playlist)}"
-    cached = _YOUTUBE_SEARCH_CACHE.get(cache_key)
-    if cached:
-        return cached
+    return _cached_link_check(
+        "search",
+        cache_key,
+        _fetch_youtube_search,
+        query_text,
+        cache_key,
+        want_playlist,
+        default=None,
+    )
+
 
+def _fetch_youtube_search(query_text: str, cache_key: str, want_playlist: bool) -> str | None:
     query = quote_plus(query_text)
-    search_url = f"https://www.youtube.com/results?search_query={query}"
+    search_url = _youtube_endpoint(f"/results?search_query={query}")
     req = Request(
         search_url,
         headers={
@@ -202,31 +266,44 @@ def _youtube_search_direct_link(
         },
     )
     try:
-        with urlopen(req, timeout=5) as resp:
+        with _http_span(search_url, "search") as span, urlopen(req, timeout=5) as resp:
             html = resp.read().decode("utf-8", errors="ignore")
+            span.set_attribute("http.response.status_code", int(getattr(resp, "status", 200)))
     except Exception:
+        # Transient failures are not cached; an empty result page is.
         return None
 
+    direct, definitive = _first_valid_search_result(html, want_playlist)
+    if definitive:
+        # "No usable result" is only cached when every candidate was rejected
+        # by YouTube itself, not when a check timed out or failed upstream.
+        get_link_cache("search").set(cache_key, direct)
+    return direct
+
+
+def _first_valid_search_result(html: str, want_playlist: bool) -> tuple[str | None, bool]:
+    """The first usable result, and whether the answer is definitive enough to cache."""
     if want_playlist:
         playlist_ids = re.findall(r'"playlistId":"([A-Za-z0-9_-]{10,})"', html)
         for pid in playlist_ids:
             direct = f"https://www.youtube.com/playlist?list={pid}"
             if _is_valid_link(direct, "Playlist"):
-                _YOUTUBE_SEARCH_CACHE[cache_key] = direct
-                return direct
-        return None
+                return direct, True
+        return None, True
 
     video_ids = re.findall(r'"videoId":"([A-Za-z0-9_-]{11})"', html)
     seen = set()
+    definitive = True
     for vid in video_ids:
         if vid in seen:
             continue
         seen.add(vid)
         direct = f"https://www.youtube.com/watch?v={vid}"
-        if _is_valid_link(direct, "Video"):
-            _YOUTUBE_SEARCH_CACHE[cache_key] = direct
-            return direct
-    return None
+        oembed = _get_youtube_oembed(direct)
+        if oembed.get("ok"):
+            return direct, True
+        definitive = definitive and not oembed.get("unknown")
+    return None, definitive
 
 
 def _tokens(text: str) -> set[str]:
@@ -384,7 +461,7 @@ def _ensure_resources(
     seen_links = {r.get("link") for r in resources if r.get("link")}
 
     # Ensure each selectable language has at least one usable link.
-    for lang in ["English", "Bangla", "Hindi"]:
+    for lang in link_checks.independently(["English", "Bangla", "Hindi"]):
         if counts.get(lang, 0) > 0:
             continue
         link = _fallback_learning_link(skill, stage_title, topic_title, "Video", lang)
@@ -407,7 +484,7 @@ def _ensure_resources(
     needed = min_count - preferred_count
     # Prefer direct videos first for quick access in the selected language.
     seed_types = ["Video", "Web-Docs", "Playlist", "PDF"]
-    for i in range(needed):
+    for i in link_checks.independently(range(needed)):
         ltype = seed_types[i % len(seed_types)]
         link = _fallback_learning_link(skill, stage_title, topic_title, ltype, preferred)
         if link in seen_links:
@@ -423,18 +500,8 @@ def _ensure_resources(
     return resources + fallbacks
 
 
-def _sanitize_course_payload(skill: str, data: dict, preferred_language: str = "English") -> dict:
-    level_rank = {"beginner": 0, "intermediate": 1, "advanced": 2}
-
-    def _path_sort_key(path: dict, original_index: int):
-        level = _clean_str(path.get("level"), "beginner").strip().lower()
-        return (level_rank.get(level, 99), original_index)
-
-    preferred = _normalize_language(preferred_language)
-    course = data.get("course") or {}
-    raw_paths = data.get("paths") or []
-
-    cleaned_course = {
+def _sanitize_course_meta(skill: str, course: dict) -> dict:
+    return {
         "title": _clean_str(course.get("title"), f"{skill} Mastery Path"),
         "description": _clean_str(
             course.get("description"),
@@ -460,71 +527,107 @@ def _sanitize_course_payload(skill: str, data: dict, preferred_language: str = "
         "special_features": list(course.get("special_features") or []),
     }
 
-    cleaned_paths = []
-    for p_idx, path in enumerate(raw_paths[:4]):
-        roadmaps = path.get("roadmaps") or []
-        cleaned_roadmaps = []
-        for r_idx, roadmap in enumerate(roadmaps[:24]):
-            stage_title = _clean_str(roadmap.get("title"), f"Stage {r_idx + 1}")
-            sub_maps = roadmap.get("sub_maps") or []
-            cleaned_submaps = []
-            for s_idx, sub in enumerate(sub_maps[:12]):
-                topic_title = _clean_str(sub.get("title"), f"Topic {s_idx + 1}")
-                raw_resources = sub.get("resources") or []
-                resources = []
-                seen_links = set()
-                for res in raw_resources[:10]:
-                    cleaned = _sanitize_resource(skill, stage_title, topic_title, res or {})
-                    if not cleaned:
-                        continue
-                    link = cleaned["link"]
-                    if link in seen_links:
-                        continue
-                    seen_links.add(link)
-                    resources.append(cleaned)
-                resources = _ensure_resources(
+
+def _sanitize_roadmap(skill: str, roadmap: dict, r_idx: int, preferred_language: str = "English") -> dict:
+    preferred = _normalize_language(preferred_language)
+    stage_title = _clean_str(roadmap.get("title"), f"Stage {r_idx + 1}")
+    sub_maps = roadmap.get("sub_maps") or []
+    cleaned_submaps = []
+    for s_idx, sub in enumerate(link_checks.independently(sub_maps[:12])):
+        topic_title = _clean_str(sub.get("title"), f"Topic {s_idx + 1}")
+        raw_resources = sub.get("resources") or []
+        resources = []
+        seen_links = set()
+        for res in link_checks.independently(raw_resources[:10]):
+            cleaned = _sanitize_resource(skill, stage_title, topic_title, res or {})
+            if not cleaned:
+                continue
+            link = cleaned["link"]
+            if link in seen_links:
+                continue
+            seen_links.add(link)
+            resources.append(cleaned)
+        resources = _ensure_resources(
+            skill,
+            stage_title,
+            topic_title,
+            resources,
+            min_count=2,
+            preferred_language=preferred,
+        )
+
+        cleaned_submaps.append(
+            {
+                "title": topic_title,
+                "micro_desc": _clean_str(sub.get("micro_desc"), topic_title),
+                "resources": resources,
+            }
+        )
+
+    if not cleaned_submaps:
+        cleaned_submaps = [
+            {
+                "title": f"Stage {r_idx + 1} Foundations",
+                "micro_desc": "Core concepts and practice.",
+                "resources": _ensure_resources(
                     skill,
                     stage_title,
-                    topic_title,
-                    resources,
+                    "Foundations",
+                    [],
                     min_count=2,
                     preferred_language=preferred,
-                )
+                ),
+            }
+        ]
 
-                cleaned_submaps.append(
-                    {
-                        "title": topic_title,
-                        "micro_desc": _clean_str(sub.get("micro_desc"), topic_title),
-                        "resources": resources,
-                    }
-                )
+    return {
+        "title": _clean_str(roadmap.get("title"), f"Stage {r_idx + 1}"),
+        "micro_desc": _clean_str(
+            roadmap.get("micro_desc"),
+            "Concepts, practice, and real-world application.",
+        ),
+        "duration": _clean_str(roadmap.get("duration"), "1-2 weeks"),
+        "sub_maps": cleaned_submaps,
+    }
 
-            if not cleaned_submaps:
-                cleaned_submaps = [
-                    {
-                        "title": f"Stage {r_idx + 1} Foundations",
-                        "micro_desc": "Core concepts and practice.",
-                        "resources": _ensure_resources(
-                            skill,
-                            stage_title,
-                            "Foundations",
-                            [],
-                            min_count=2,
-                            preferred_language=preferred,
-                        ),
-                    }
-                ]
 
+def _sanitize_course_payload(skill: str, data: dict, preferred_language: str = "English") -> dict:
+    # Link checks for the whole tree run concurrently; the result matches the sequential pass.
+    return link_checks.run_batched(
+        _sanitize_course_payload_sequential, skill, data, preferred_language
+    )
+
+
+_PATH_LEVEL_RANK = {"beginner": 0, "intermediate": 1, "advanced": 2}
+
+
+def _path_sort_key(path: dict, original_index: int):
+    level = _clean_str(path.get("level"), "beginner").strip().lower()
+    return (_PATH_LEVEL_RANK.get(level, 99), original_index)
+
+
+def saved_path_order(raw_paths: list) -> list[int]:
+    """Indexes into the LLM's paths, in the order the sanitized (and saved) course lists them."""
+    paths = [path if isinstance(path, dict) else {} for path in (raw_paths or [])[:4]]
+    return sorted(range(len(paths)), key=lambda i: _path_sort_key(paths[i], i))
+
+
+def _sanitize_course_payload_sequential(
+    skill: str, data: dict, preferred_language: str = "English"
+) -> dict:
+    preferred = _normalize_language(preferred_language)
+    course = data.get("course") or {}
+    raw_paths = data.get("paths") or []
+
+    cleaned_course = _sanitize_course_meta(skill, course)
+
+    cleaned_paths = []
+    for p_idx, path in enumerate(link_checks.independently(raw_paths[:4])):
+        roadmaps = path.get("roadmaps") or []
+        cleaned_roadmaps = []
+        for r_idx, roadmap in enumerate(link_checks.independently(roadmaps[:24])):
             cleaned_roadmaps.append(
-                {
-                    "title": _clean_str(roadmap.get("title"), f"Stage {r_idx + 1}"),
-                    "micro_desc": _clean_str(
-                        roadmap.get("micro_desc"),
-                        "Concepts, practice, and real-world application.",
-                    ),
-                    "duration": _clean_str(roadmap.get("duration"), "1-2 weeks"),
-                    "sub_maps": cleaned_submaps,
-                }
+                _sanitize_roadmap(skill, roadmap, r_idx, preferred_language=preferred)
             )
 
         if not cleaned_roadmaps:
@@ -591,13 +694,8 @@ def _sanitize_course_payload(skill: str, data: dict, preferred_language: str = "
             }
         ]
 
-    cleaned_paths = [
-        path
-        for _, path in sorted(
-            enumerate(cleaned_paths),
-            key=lambda item: _path_sort_key(item[1], item[0]),
-        )
-    ]
+    if raw_paths[:4]:
+        cleaned_paths = [cleaned_paths[i] for i in saved_path_order(raw_paths)]
 
     return {"course": cleaned_course, "paths": cleaned_paths}
 
@@ -613,22 +711,30 @@ def _validate_course_payload(payload: dict):
             raise ValueError(f"AI output rejected: path {p_idx} has no stages")
 
         for r_idx, roadmap in enumerate(roadmaps, start=1):
-            sub_maps = roadmap.get("sub_maps") or []
-            if not sub_maps:
-                raise ValueError(
-                    f"AI output rejected: path {p_idx} stage {r_idx} has no topics"
-                )
-            for s_idx, sub in enumerate(sub_maps, start=1):
-                resources = sub.get("resources") or []
-                if not resources:
-                    raise ValueError(
-                        f"AI output rejected: path {p_idx} stage {r_idx} topic {s_idx} has no resources"
-                    )
+            _validate_roadmap_payload(roadmap, p_idx, r_idx)
 
 
-def _generate_skill_course_once(skill: str, temperature: float, preferred_language: str = "English"):
-    preferred = _normalize_language(preferred_language)
-    prompt = f"""
+def _validate_roadmap_payload(roadmap: dict, p_idx: int, r_idx: int):
+    sub_maps = roadmap.get("sub_maps") or []
+    if not sub_maps:
+        raise ValueError(
+            f"AI output rejected: path {p_idx} stage {r_idx} has no topics"
+        )
+    for s_idx, sub in enumerate(sub_maps, start=1):
+        resources = sub.get("resources") or []
+        if not resources:
+            raise ValueError(
+                f"AI output rejected: path {p_idx} stage {r_idx} topic {s_idx} has no resources"
+            )
+
+
+def _notify_stage(on_stage, stage: str, attempt: int = 0):
+    if on_stage is not None:
+        on_stage(stage, attempt)
+
+
+def _course_prompt(skill: str, preferred: str) -> str:
+    return f"""
 You are an AI learning architect.
 
 Create a COMPLETE and PRACTICAL beginner-to-master learning program for the skill: "{skill}".
@@ -699,8 +805,62 @@ Return ONLY valid JSON in this structure:
 }}
 """
 
-    completion = client.chat.completions.create(
-        model="llama-3.1-8b-instant",
+
+def _llm_span(purpose: str, temperature: float, max_tokens: int, stream: bool = False):
+    return tracing.span(
+        f"chat {LLM_MODEL}",
+        {
+            "gen_ai.operation.name": "chat",
+            "gen_ai.system": "groq",
+            "gen_ai.request.model": LLM_MODEL,
+            "gen_ai.request.temperature": temperature,
+            "gen_ai.request.max_tokens": max_tokens,
+            "skills.llm.purpose": purpose,
+            "skills.llm.stream": stream,
+        },
+        kind=tracing.CLIENT,
+    )
+
+
+def _record_llm_usage(span, usage, response_model=None, finish_reason=None):
+    span.set_attribute("gen_ai.response.model", response_model)
+    if finish_reason:
+        span.set_attribute("gen_ai.response.finish_reasons", [finish_reason])
+    if usage is not None:
+        span.set_attribute("gen_ai.usage.input_tokens", getattr(usage, "prompt_tokens", None))
+        span.set_attribute("gen_ai.usage.output_tokens", getattr(usage, "completion_tokens", None))
+
+
+def _chat_completion(purpose: str, *, messages, temperature: float, max_tokens: int):
+    with _llm_span(purpose, temperature, max_tokens) as span:
+        completion = client.chat.completions.create(
+            model=LLM_MODEL,
+            messages=messages,
+            temperature=temperature,
+            max_tokens=max_tokens,
+        )
+        choice = completion.choices[0] if completion.choices else None
+        _record_llm_usage(
+            span,
+            getattr(completion, "usage", None),
+            getattr(completion, "model", None),
+            getattr(choice, "finish_reason", None),
+        )
+        return completion
+
+
+def _generate_skill_course_once(
+    skill: str,
+    temperature: float,
+    preferred_language: str = "English",
+    on_stage=None,
+    attempt: int = 0,
+):
+    preferred = _normalize_language(preferred_language)
+    prompt = _course_prompt(skill, preferred)
+
+    completion = _chat_completion(
+        "course",
         messages=[{"role": "user", "content": prompt}],
         temperature=temperature,
         max_tokens=7000,
@@ -708,12 +868,127 @@ Return ONLY valid JSON in this structure:
 
     content = completion.choices[0].message.content
     raw_data = _extract_json_payload(content)
+    _notify_stage(on_stage, "validation", attempt)
     cleaned = _sanitize_course_payload(skill, raw_data, preferred_language=preferred)
     _validate_course_payload(cleaned)
     return cleaned
 
 
+def _course_path_meta(path: dict, p_idx: int) -> dict:
+    return {
+        "index": p_idx,
+        "title": _clean_str(path.get("title"), f"Path {p_idx + 1}"),
+        "mini_desc": _clean_str(path.get("mini_desc"), "Structured learning path."),
+        "level": _clean_str(path.get("level"), "beginner"),
+        "duration": _clean_str(path.get("duration"), "3-6 months"),
+    }
+
+
+def _stream_skill_course_once(skill: str, temperature: float, preferred: str):
+    """
+    Generator over one streamed LLM attempt: yields ("course" | "stage" | "path", data)
+    as each part of the JSON closes and returns the sanitized payload.
+
+    "path" and "stage" events carry the path's index in the LLM output. The
+    saved course orders paths by level, which is only known once every path
+    has closed, so a final ("path_order", {"path_indexes": [...]}) event lists
+    the streamed index of each saved path, in saved order.
+
+    Each stage is checked as soon as it closes; malformed JSON or a stage
+    without topics raises ValueError and closes the stream, instead of paying
+    for the remaining tokens.
+    """
+    parser = IncrementalJSONParser(
+        [("course",), ("paths", WILDCARD), ("paths", WILDCARD, "roadmaps", WILDCARD)]
+    )
+    # Link checks of closed stages run inside this span, between chunks.
+    with _llm_span("course", temperature, 7000, stream=True) as span:
+        started = time.perf_counter()
+        chunks = 0
+        usage = None
+        stream = client.chat.completions.create(
+            model=LLM_MODEL,
+            messages=[{"role": "user", "content": _course_prompt(skill, preferred)}],
+            temperature=temperature,
+            max_tokens=7000,
+            stream=True,
+        )
+        try:
+            for chunk in stream:
+                if chunks == 0:
+                    first_chunk_ms = (time.perf_counter() - started) * 1000
+                    span.set_attribute("skills.llm.first_chunk_ms", round(first_chunk_ms, 1))
+                chunks += 1
+                usage = getattr(getattr(chunk, "x_groq", None), "usage", None) or usage
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                for path, value in parser.feed(delta or ""):
+                    if path == ("course",):
+                        yield "course", _sanitize_course_meta(skill, value if isinstance(value, dict) else {})
+                        continue
+                    p_idx = path[1]
+                    if p_idx >= 4:
+                        continue
+                    if len(path) == 2:
+                        yield "path", _course_path_meta(value, p_idx)
+                        continue
+                    r_idx = path[3]
+                    if r_idx >= 24:
+                        continue
+                    if not isinstance(value, dict) or not value.get("sub_maps"):
+                        raise ValueError(
+                            f"AI output rejected: path {p_idx + 1} stage {r_idx + 1} has no topics"
+                        )
+                    stage = link_checks.run_batched(
+                        _sanitize_roadmap, skill, value, r_idx, preferred
+                    )
+                    _validate_roadmap_payload(stage, p_idx + 1, r_idx + 1)
+                    yield "stage", {"path_index": p_idx, "stage_index": r_idx, "stage": stage}
+                if parser.done:
+                    break
+        finally:
+            span.set_attribute("skills.llm.chunks", chunks)
+            _record_llm_usage(span, usage, LLM_MODEL)
+            close = getattr(stream, "close", None)
+            if close is not None:
+                close()
+
+    # Stages are already validated, so this pass runs on a warm link cache.
+    raw = parser.result()
+    cleaned = _sanitize_course_payload(skill, raw, preferred_language=preferred)
+    _validate_course_payload(cleaned)
+    yield "path_order", {"path_indexes": saved_path_order(raw.get("paths"))}
+    return cleaned
+
+
+def stream_skill_course(skill, preferred_language: str = "English"):
+    """
+    Streaming variant of generate_skill_course. Yields (event, data) tuples —
+    "course", "path", "stage", "path_order", and "retry" when an attempt is
+    abandoned — and returns the final payload (StopIteration.value), same shape as
+    generate_skill_course.
+    """
+    preferred = _normalize_language(preferred_language)
+    attempts = [0.2, 0.1, 0.0]
+    for attempt, temp in enumerate(attempts):
+        try:
+            return (yield from _stream_skill_course_once(skill, temp, preferred))
+        except Exception as exc:
+            yield "retry", {"attempt": attempt + 1, "reason": str(exc)}
+    fallback = _build_fallback_course_payload(skill, preferred_language=preferred)
+    _validate_course_payload(fallback)
+    return fallback
+
+
 def _build_fallback_course_payload(skill: str, preferred_language: str = "English") -> dict:
+    with tracing.span("generate_course.fallback"):
+        return link_checks.run_batched(
+            _build_fallback_course_payload_sequential, skill, preferred_language
+        )
+
+
+def _build_fallback_course_payload_sequential(
+    skill: str, preferred_language: str = "English"
+) -> dict:
     preferred = _normalize_language(preferred_language)
     stages = [
         "Foundations",
@@ -729,9 +1004,9 @@ def _build_fallback_course_payload(skill: str, preferred_language: str = "Englis
 
     def build_roadmaps(prefix: str):
         roadmaps = []
-        for idx, stage in enumerate(stages, start=1):
+        for idx, stage in enumerate(link_checks.independently(stages), start=1):
             sub_maps = []
-            for topic in topics:
+            for topic in link_checks.independently(topics):
                 sub_maps.append(
                     {
                         "title": f"{stage} - {topic}",
@@ -756,6 +1031,10 @@ def _build_fallback_course_payload(skill: str, preferred_language: str = "Englis
             )
         return roadmaps
 
+    guided, project = [
+        build_roadmaps(prefix)
+        for prefix in link_checks.independently(["Guided Stage", "Project Stage"])
+    ]
     return {
         "course": {
             "title": f"{skill} Mastery Path",
@@ -779,30 +1058,43 @@ def _build_fallback_course_payload(skill: str, preferred_language: str = "Englis
                 "mini_desc": "Step-by-step path for structured learners.",
                 "level": "beginner",
                 "duration": "6-9 months",
-                "roadmaps": build_roadmaps("Guided Stage"),
+                "roadmaps": guided,
             },
             {
                 "title": "Project-first Path",
                 "mini_desc": "Build real outcomes while learning core concepts.",
                 "level": "beginner",
                 "duration": "6-9 months",
-                "roadmaps": build_roadmaps("Project Stage"),
+                "roadmaps": project,
             },
         ],
     }
 
 
-def generate_skill_course(skill, preferred_language: str = "English"):
+def generate_skill_course(skill, preferred_language: str = "English", on_stage=None):
+    """
+    Generate and sanitize a course payload. `on_stage(stage, attempt)` is called
+    when an attempt enters the "llm" and "validation" stages.
+    """
     preferred = _normalize_language(preferred_language)
     # Retry with stricter determinism when AI output fails quality validation.
     attempts = [0.2, 0.1, 0.0]
     last_error = None
-    for temp in attempts:
+    for attempt, temp in enumerate(attempts):
         try:
-            return _generate_skill_course_once(skill, temp, preferred_language=preferred)
+            _notify_stage(on_stage, "llm", attempt)
+            with tracing.span("generate_course.attempt", {"skills.attempt": attempt}):
+                return _generate_skill_course_once(
+                    skill,
+                    temp,
+                    preferred_language=preferred,
+                    on_stage=on_stage,
+                    attempt=attempt,
+                )
         except Exception as exc:
             last_error = exc
             continue
+    _notify_stage(on_stage, "validation", len(attempts))
     fallback = _build_fallback_course_payload(skill, preferred_language=preferred)
     _validate_course_payload(fallback)
     return fallback
@@ -850,8 +1142,8 @@ Return ONLY valid JSON (no markdown, no code block):
   ]
 }}
 """
-    completion = client.chat.completions.create(
-        model="llama-3.1-8b-instant",
+    completion = _chat_completion(
+        "exam",
         messages=[{"role": "user", "content": prompt}],
         temperature=0.8,
         max_tokens=4000,
@@ -0,0 +1,130 @@
+import json
+
+WILDCARD = "*"
+
+
+class _Container:
+    __slots__ = ("kind", "path", "start", "key", "index")
+
+    def __init__(self, kind: str, path: tuple, start: int):
+        self.kind = kind
+        self.path = path
+        self.start = start
+        self.key = None
+        self.index = 0
+
+    def slot(self):
+        return self.key if self.kind == "object" else self.index
+
+
+class IncrementalJSONParser:
+    """
+    Scans a JSON document as it arrives and emits values at watched paths as
+    soon as they close, e.g. ("paths", "*", "roadmaps", "*") yields each stage
+    object of each path without waiting for the rest of the document.
+
+    Text before the first "{" (model chatter) is skipped. Structural errors
+    raise ValueError immediately, so a caller can abort a broken stream early.
+    """
+
+    def __init__(self, watch: list[tuple]):
+        self.watch = [tuple(pattern) for pattern in watch]
+        self.buffer = ""
+        self.done = False
+        self._pos = 0
+        self._stack: list[_Container] = []
+        self._started = False
+        self._in_string = False
+        self._escape = False
+        self._string_start = 0
+        self._last_string = None
+        self._root_start = None
+        self._root_end = None
+
+    def _matches(self, path: tuple) -> bool:
+        for pattern in self.watch:
+            if len(pattern) != len(path):
+                continue
+            if all(p == WILDCARD or p == v for p, v in zip(pattern, path)):
+                return True
+        return False
+
+    def _push(self, kind: str, pos: int):
+        if self._stack:
+            parent = self._stack[-1]
+            if parent.kind == "object" and parent.key is None:
+                raise ValueError(f"Unexpected value without key at offset {pos}")
+            path = parent.path + (parent.slot(),)
+        else:
+            path = ()
+            self._root_start = pos
+        self._stack.append(_Container(kind, path, pos))
+        self._last_string = None
+
+    def _pop(self, kind: str, pos: int) -> list:
+        if not self._stack or self._stack[-1].kind != kind:
+            raise ValueError(f"Unbalanced '{self.buffer[pos]}' at offset {pos}")
+        container = self._stack.pop()
+        emitted = []
+        if container.path and self._matches(container.path):
+            emitted.append((container.path, json.loads(self.buffer[container.start : pos + 1])))
+        if not self._stack:
+            self.done = True
+            self._root_end = pos
+        return emitted
+
+    def feed(self, text: str) -> list:
+        """Consume more text; returns [(path, value), ...] for watched values that closed."""
+        if self.done or not text:
+            return []
+        self.buffer += text
+        emitted = []
+        buffer = self.buffer
+        pos = self._pos
+        end = len(buffer)
+        while pos < end and not self.done:
+            ch = buffer[pos]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    self._last_string = json.loads(buffer[self._string_start : pos + 1])
+            elif not self._started:
+                if ch == "{":
+                    self._started = True
+                    self._push("object", pos)
+            elif ch == '"':
+                self._in_string = True
+                self._string_start = pos
+            elif ch == "{":
+                self._push("object", pos)
+            elif ch == "[":
+                self._push("array", pos)
+            elif ch == "}":
+                emitted.extend(self._pop("object", pos))
+            elif ch == "]":
+                emitted.extend(self._pop("array", pos))
+            elif ch == ":":
+                top = self._stack[-1]
+                if top.kind != "object" or self._last_string is None:
+                    raise ValueError(f"Unexpected ':' at offset {pos}")
+                top.key = self._last_string
+            elif ch == ",":
+                top = self._stack[-1]
+                if top.kind == "array":
+                    top.index += 1
+                else:
+                    top.key = None
+                self._last_string = None
+            pos += 1
+        self._pos = pos
+        return emitted
+
+    def result(self) -> dict:
+        """The complete document; raises ValueError if the stream ended early."""
+        if not self.done:
+            raise ValueError("AI response ended before the JSON document was complete")
+        return json.loads(self.buffer[self._root_start : self._root_end + 1])
@@ -0,0 +1,265 @@
+import hashlib
+import logging
+import re
+import threading
+import time
+from collections import OrderedDict
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+MISSING = object()
+
+DEFAULT_LINK_CACHE = {
+    # "local" (per-process LRU), "django" (settings.CACHES) or "database" (VideoMetadata table).
+    "BACKEND": "local",
+    "MAX_ENTRIES": 5000,
+    "TTL_SECONDS": 7 * 24 * 3600,
+    "NEGATIVE_TTL_SECONDS": 6 * 3600,
+    "DJANGO_CACHE_ALIAS": "default",
+}
+
+YOUTUBE_VIDEO_ID_RE = re.compile(
+    r"(?:youtube\.com/watch\?(?:.*&)?v=|youtu\.be/)([A-Za-z0-9_-]{6,})"
+)
+
+
+def link_cache_config() -> dict:
+    return {**DEFAULT_LINK_CACHE, **getattr(settings, "LINK_CACHE", {})}
+
+
+def _is_negative(value) -> bool:
+    if value is None:
+        return True
+    return isinstance(value, dict) and not value.get("ok", True)
+
+
+class LinkCache:
+    """Base class: TTL-aware get/set with hit/miss counters."""
+
+    def __init__(self, namespace: str, ttl: int, negative_ttl: int):
+        self.namespace = namespace
+        self.ttl = int(ttl)
+        self.negative_ttl = int(negative_ttl)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def ttl_for(self, value) -> int:
+        return self.negative_ttl if _is_negative(value) else self.ttl
+
+    def get(self, key, count: bool = True):
+        value = self._get(key)
+        if count:
+            self.record(value is not MISSING)
+        return value
+
+    def record(self, hit: bool):
+        if hit:
+            self.hits += 1
+        else:
+            self.misses += 1
+
+    def set(self, key, value):
+        self._set(key, value, self.ttl_for(value))
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "backend": type(self).__name__,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 3) if total else 0.0,
+            "evictions": self.evictions,
+        }
+
+    def clear(self):
+        self.hits = self.misses = self.evictions = 0
+
+    def _get(self, key):
+        raise NotImplementedError
+
+    def _set(self, key, value, ttl: int):
+        raise NotImplementedError
+
+
+class LocalLRUCache(LinkCache):
+    """In-process LRU bounded by MAX_ENTRIES. Thread-safe for the link-check pool."""
+
+    def __init__(self, namespace: str, ttl: int, negative_ttl: int, max_entries: int):
+        super().__init__(namespace, ttl, negative_ttl)
+        self.max_entries = max(1, int(max_entries))
+        self._data: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get(self, key):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return MISSING
+            expires_at, value = item
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return MISSING
+            self._data.move_to_end(key)
+            return value
+
+    def _set(self, key, value, ttl: int):
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def stats(self) -> dict:
+        return {**super().stats(), "size": len(self._data), "max_entries": self.max_entries}
+
+    def clear(self):
+        super().clear()
+        with self._lock:
+            self._data.clear()
+
+
+class DjangoLinkCache(LinkCache):
+    """Stores entries in a Django cache alias so they are shared across workers."""
+
+    def __init__(self, namespace: str, ttl: int, negative_ttl: int, alias: str = "default"):
+        super().__init__(namespace, ttl, negative_ttl)
+        self.alias = alias
+
+    def _key(self, key) -> str:
+        # Search keys contain spaces and non-ASCII text, which memcached rejects.
+        digest = hashlib.sha1(str(key).encode("utf-8")).hexdigest()
+        return f"linkcache:{self.namespace}:{digest}"
+
+    def _get(self, key):
+        return caches[self.alias].get(self._key(key), MISSING)
+
+    def _set(self, key, value, ttl: int):
+        caches[self.alias].set(self._key(key), value, ttl)
+
+
+class VideoMetadataCache(LinkCache):
+    """oEmbed results persisted in the VideoMetadata table, keyed by YouTube video id."""
+
+    def _video_id(self, url: str) -> str | None:
+        match = YOUTUBE_VIDEO_ID_RE.search(url or "")
+        return match.group(1) if match else None
+
+    def _get(self, key):
+        from ..models import VideoMetadata
+
+        video_id = self._video_id(key)
+        if not video_id:
+            return MISSING
+        row = VideoMetadata.objects.filter(video_id=video_id).first()
+        if row is None:
+            return MISSING
+        ttl = self.ttl if row.embeddable else self.negative_ttl
+        if row.checked_at + timedelta(seconds=ttl) <= timezone.now():
+            return MISSING
+        return {"ok": row.embeddable, "title": row.title, "author": row.author}
+
+    def _set(self, key, value, ttl: int):
+        from ..models import VideoMetadata
+
+        video_id = self._video_id(key)
+        if not video_id:
+            return
+        VideoMetadata.objects.update_or_create(
+            video_id=video_id,
+            defaults={
+                "title": (value.get("title") or "")[:255],
+                "author": (value.get("author") or "")[:255],
+                "embeddable": bool(value.get("ok")),
+                "checked_at": timezone.now(),
+            },
+        )
+
+
+class TieredLinkCache(LinkCache):
+    """Local LRU in front of a shared backend; shared hits are copied into the LRU."""
+
+    def __init__(self, local: LocalLRUCache, shared: LinkCache):
+        super().__init__(local.namespace, local.ttl, local.negative_ttl)
+        self.local = local
+        self.shared = shared
+
+    def _get(self, key):
+        value = self.local.get(key)
+        if value is not MISSING:
+            return value
+        try:
+            value = self.shared.get(key)
+        except Exception:
+            logger.exception("Shared link cache read failed")
+            return MISSING
+        if value is not MISSING:
+            self.local.set(key, value)
+        return value
+
+    def _set(self, key, value, ttl: int):
+        self.local.set(key, value)
+        try:
+            self.shared.set(key, value)
+        except Exception:
+            logger.exception("Shared link cache write failed")
+
+    def stats(self) -> dict:
+        return {
+            **super().stats(),
+            "local": self.local.stats(),
+            "shared": self.shared.stats(),
+        }
+
+    def clear(self):
+        super().clear()
+        self.local.clear()
+        self.shared.clear()
+
+
+def build_link_cache(namespace: str, config: dict | None = None) -> LinkCache:
+    config = {**link_cache_config(), **(config or {})}
+    ttl = config["TTL_SECONDS"]
+    negative_ttl = config["NEGATIVE_TTL_SECONDS"]
+    local = LocalLRUCache(namespace, ttl, negative_ttl, config["MAX_ENTRIES"])
+    backend = str(config["BACKEND"]).lower()
+    if backend == "local":
+        return local
+    if backend == "database" and namespace == "oembed":
+        return TieredLinkCache(local, VideoMetadataCache(namespace, ttl, negative_ttl))
+    if backend in {"django", "database"}:
+        # Search results are plain URLs, so they use the Django cache for the database backend too.
+        shared = DjangoLinkCache(namespace, ttl, negative_ttl, config["DJANGO_CACHE_ALIAS"])
+        return TieredLinkCache(local, shared)
+    raise ValueError(f"Unknown LINK_CACHE backend: {config['BACKEND']}")
+
+
+_CACHES: dict[str, LinkCache] = {}
+_CACHES_LOCK = threading.Lock()
+
+
+def get_link_cache(namespace: str) -> LinkCache:
+    cache = _CACHES.get(namespace)
+    if cache is None:
+        with _CACHES_LOCK:
+            cache = _CACHES.get(namespace)
+            if cache is None:
+                cache = build_link_cache(namespace)
+                _CACHES[namespace] = cache
+    return cache
+
+
+def reset_link_caches():
+    """Drop configured caches (e.g. after changing settings.LINK_CACHE)."""
+    with _CACHES_LOCK:
+        _CACHES.clear()
+
+
+def link_cache_stats() -> dict:
+    return {namespace: cache.stats() for namespace, cache in _CACHES.items()}
@@ -0,0 +1,202 @@
+import contextvars
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from django.conf import settings
+from django.db import connections
+
+from . import tracing
+
+_ACTIVE_BATCH: contextvars.ContextVar = contextvars.ContextVar(
+    "link_check_batch", default=None
+)
+
+
+def _run_isolated(fetch, *args):
+    # Fresh context so the worker's own lookups hit the network, and no DB
+    # connection is left open on the pool thread (database link cache).
+    try:
+        return contextvars.Context().run(fetch, *args)
+    finally:
+        connections.close_all()
+
+
+class LinkCheckBatch:
+    """
+    Runs a sequential validation function with all of its network lookups
+    collected, de-duplicated and executed concurrently.
+
+    The function is first replayed in "planning" mode: uncached lookups are
+    recorded and answered with their failure default. Once a lookup has been
+    deferred, later lookups are assumed to depend on its answer and are not
+    recorded until a later pass, unless they run inside `independently()`.
+    The recorded lookups are then fetched in a thread pool and the function
+    is replayed again, until a pass needs nothing new. The final pass sees
+    exactly the answers the sequential code would have fetched, so the output
+    is identical. Lookups still running when the deadline expires resolve to
+    their default.
+    """
+
+    def __init__(self, max_workers: int = 16, deadline: float = 45.0, max_rounds: int = 6):
+        self.max_workers = max(1, int(max_workers))
+        self.deadline = float(deadline)
+        self.max_rounds = max(1, int(max_rounds))
+        self.results: dict = {}
+        self.pending: dict = {}
+        self.planning = False
+        self.deferred = False
+        self.expired = False
+        self._pass_keys: set = set()
+        self._pass_counts: list = []
+        self._started_at = None
+        self.stats = {"rounds": 0, "lookups": 0, "timed_out": 0}
+
+    def resolve(self, key, fetch, args: tuple, default):
+        if key in self.results:
+            return self.results[key]
+        if self.expired:
+            return default
+        if self.planning:
+            # After a deferred lookup the caller only has a planning default, so
+            # whatever it looks up next may be a fallback the sequential code skips.
+            if not self.deferred:
+                self.pending.setdefault(key, (fetch, args, default))
+            self.deferred = True
+            return default
+        value = fetch(*args)
+        self.results[key] = value
+        return value
+
+    def count_lookup(self, key, hit: bool, record):
+        if key in self.results and key not in self._pass_keys:
+            # Fetched by this batch: one miss, whatever the cache holds by now.
+            hit = False
+        self._pass_keys.add(key)
+        if self.planning:
+            self._pass_counts.append((record, hit))
+        else:
+            record(hit)
+
+    def _end_pass(self, final: bool):
+        counts, self._pass_counts = self._pass_counts, []
+        self._pass_keys = set()
+        if final:
+            for record, hit in counts:
+                record(hit)
+
+    def independently(self, items):
+        base = self.deferred
+        deferred = False
+        try:
+            for item in items:
+                self.deferred = base
+                yield item
+                deferred = deferred or self.deferred
+        finally:
+            self.deferred = base or deferred
+
+    def _remaining(self) -> float:
+        return self.deadline - (time.monotonic() - self._started_at)
+
+    def _fetch_pending(self):
+        pending, self.pending = self.pending, {}
+        self.stats["lookups"] += len(pending)
+        with tracing.span("link_checks.fetch", {"skills.lookups": len(pending)}) as span:
+            self._fetch(pending)
+            span.set_attribute("skills.deadline_expired", self.expired)
+
+    def _fetch(self, pending):
+        executor = ThreadPoolExecutor(max_workers=min(self.max_workers, len(pending)))
+        try:
+            futures = {
+                executor.submit(_run_isolated, tracing.bind(fetch), *args): (key, default)
+                for key, (fetch, args, default) in pending.items()
+            }
+            done, not_done = wait(futures, timeout=max(0.0, self._remaining()))
+            for future in done:
+                key, default = futures[future]
+                try:
+                    self.results[key] = future.result()
+                except Exception:
+                    self.results[key] = default
+            for future in not_done:
+                key, default = futures[future]
+                self.results[key] = default
+            if not_done:
+                self.stats["timed_out"] += len(not_done)
+                self.expired = True
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def run(self, func, *args, **kwargs):
+        with tracing.span("link_checks.batch") as span:
+            try:
+                return self._run(func, *args, **kwargs)
+            finally:
+                for key, value in self.stats.items():
+                    span.set_attribute(f"skills.link_checks.{key}", value)
+
+    def _run(self, func, *args, **kwargs):
+        self._started_at = time.monotonic()
+        token = _ACTIVE_BATCH.set(self)
+        try:
+            while self.stats["rounds"] < self.max_rounds and not self.expired:
+                self.stats["rounds"] += 1
+                self.planning = True
+                self.deferred = False
+                result = func(*args, **kwargs)
+                self.planning = False
+                self._end_pass(final=not self.pending)
+                if not self.pending:
+                    return result
+                self._fetch_pending()
+            self.planning = False
+            self.expired = self.expired or self._remaining() <= 0
+            return func(*args, **kwargs)
+        finally:
+            self.planning = False
+            _ACTIVE_BATCH.reset(token)
+
+
+def resolve(key, fetch, *args, default=None):
+    """Run `fetch(*args)`, or defer it to the active batch when one is running."""
+    batch = _ACTIVE_BATCH.get()
+    if batch is None:
+        return fetch(*args)
+    return batch.resolve(key, fetch, args, default)
+
+
+def count_lookup(key, hit: bool, record):
+    """
+    Count a cache lookup of `key` with `record(hit)`. A batch replays the
+    validation function several times, so only the lookups of its final pass
+    are counted, and a key the batch fetched counts as one miss.
+    """
+    batch = _ACTIVE_BATCH.get()
+    if batch is None:
+        record(hit)
+    else:
+        batch.count_lookup(key, hit, record)
+
+
+def independently(items):
+    """
+    Iterate over `items` whose lookups don't depend on each other's answers:
+    a lookup deferred while planning one item doesn't hold back the next.
+    """
+    batch = _ACTIVE_BATCH.get()
+    if batch is None or not batch.planning:
+        return iter(items)
+    return batch.independently(items)
+
+
+def run_batched(func, *args, **kwargs):
+    """Run `func` through a LinkCheckBatch configured from settings."""
+    max_workers = int(getattr(settings, "LINK_CHECK_CONCURRENCY", 16))
+    if max_workers <= 1 or _ACTIVE_BATCH.get() is not None:
+        return func(*args, **kwargs)
+    batch = LinkCheckBatch(
+        max_workers=max_workers,
+        deadline=float(getattr(settings, "LINK_CHECK_DEADLINE_SECONDS", 45)),
+    )
+    return batch.run(func, *args, **kwargs)
@@ -0,0 +1,101 @@
+from django.conf import settings
+
+# Bitmaps are little-endian integers: bit i set means sub-map id (base + i).
+# Sub-map ids never change and a generated course gets a contiguous id range,
+# so the bitmap stays valid across tree edits and is a few bytes per hundred
+# sub-maps. Python ints give popcount (int.bit_count) and bitwise & for free.
+
+
+def progress_encoding() -> str:
+    """"list" stores completed_sub_map_ids as JSON, "bitmap" as completed_bitmap bytes."""
+    return getattr(settings, "PROGRESS_ENCODING", "list")
+
+
+def ids_to_bits(ids, base: int) -> int:
+    bits = 0
+    for sub_map_id in ids:
+        if sub_map_id >= base:
+            bits |= 1 << (sub_map_id - base)
+    return bits
+
+
+def bits_to_ids(bits: int, base: int) -> list[int]:
+    ids = []
+    offset = 0
+    while bits:
+        if bits & 1:
+            ids.append(base + offset)
+        bits >>= 1
+        offset += 1
+    return ids
+
+
+def rebase(bits: int, from_base: int, to_base: int) -> int:
+    """Re-anchor a bitmap; ids below `to_base` are dropped."""
+    if from_base >= to_base:
+        return bits << (from_base - to_base)
+    return bits >> (to_base - from_base)
+
+
+def encode(bits: int) -> bytes:
+    return bits.to_bytes((bits.bit_length() + 7) // 8, "little")
+
+
+def decode(data) -> int:
+    return int.from_bytes(bytes(data or b""), "little")
+
+
+def stored_completed_ids(bitmap, base: int, ids) -> list[int]:
+    """Completed sub-map ids of a tracking row, whichever encoding it was written with."""
+    if bitmap is not None:
+        return bits_to_ids(decode(bitmap), base)
+    return list(ids or [])
+
+
+def completed_count(bitmap, base: int, ids, structure) -> int:
+    """How many of the row's completed sub-maps still belong to the course."""
+    if bitmap is not None:
+        return (rebase(decode(bitmap), base, structure.bitmap_base) & structure.sub_map_bits).bit_count()
+    return len(structure.valid_sub_map_ids(ids or []))
+
+
+def _store(tracking, ids: list[int], bits: int | None, structure):
+    if progress_encoding() == "bitmap":
+        if bits is None:
+            bits = ids_to_bits(ids, structure.bitmap_base)
+        data = encode(bits)
+        if len(data) <= 4 * bits.bit_count() + 16:
+            tracking.completed_bitmap = data
+            tracking.completed_base = structure.bitmap_base
+            tracking.completed_sub_map_ids = []
+            return
+    if ids is None:
+        ids = bits_to_ids(bits, structure.bitmap_base)
+    tracking.completed_bitmap = None
+    tracking.completed_base = 0
+    tracking.completed_sub_map_ids = ids
+
+
+def set_completed_ids(tracking, ids: list[int], structure):
+    """
+    Store validated, sorted ids on the tracking row in the configured
+    encoding. A bitmap is only used while it is smaller than the id list would
+    be (a course whose sub-maps have widely scattered ids stays a list).
+    """
+    _store(tracking, ids, None, structure)
+
+
+def apply_completed_delta(tracking, add: list[int], remove: list[int], structure):
+    """
+    Mark validated ids as completed / not completed. Bitmap rows are changed
+    with bitwise ops, without expanding the stored set into a list.
+    """
+    if tracking.completed_bitmap is not None:
+        base = structure.bitmap_base
+        bits = rebase(decode(tracking.completed_bitmap), tracking.completed_base, base)
+        bits = (bits | ids_to_bits(add, base)) & ~ids_to_bits(remove, base) & structure.sub_map_bits
+        _store(tracking, None, bits, structure)
+        return
+    removed = set(remove)
+    ids = sorted({*(tracking.completed_sub_map_ids or []), *add} - removed)
+    _store(tracking, ids, None, structure)
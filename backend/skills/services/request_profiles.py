@@ -0,0 +1,64 @@
+import io
+import marshal
+import pstats
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+from ..models import RequestProfile
+
+_RATE_KEY = "skills:request-profile-slots"
+
+
+def _setting(name: str, default):
+    return type(default)(getattr(settings, name, default))
+
+
+def claim_profile_slot() -> bool:
+    """
+    Take one of the REQUEST_PROFILE_MAX_PER_HOUR profiling slots of the
+    current hour; False once they are used up.
+    """
+    limit = _setting("REQUEST_PROFILE_MAX_PER_HOUR", 20)
+    if limit <= 0:
+        return False
+    key = f"{_RATE_KEY}:{timezone.now():%Y%m%d%H}"
+    cache.add(key, 0, 60 * 60)
+    try:
+        used = cache.incr(key)
+    except ValueError:
+        # Evicted between add and incr.
+        cache.set(key, 1, 60 * 60)
+        used = 1
+    return used <= limit
+
+
+def save_profile(request, user, response, profiler, duration, snapshot=None, peak=None) -> RequestProfile:
+    """Store a finished profile and drop the oldest beyond REQUEST_PROFILE_KEEP."""
+    stats = pstats.Stats(profiler)
+    summary = io.StringIO()
+    pstats.Stats(profiler, stream=summary).sort_stats("cumulative").print_stats(40)
+
+    memory_summary = ""
+    if snapshot is not None:
+        lines = [str(stat) for stat in snapshot.statistics("lineno")[:30]]
+        memory_summary = "\n".join(lines)
+
+    match = getattr(request, "resolver_match", None)
+    profile = RequestProfile.objects.create(
+        user=user,
+        method=request.method,
+        path=request.get_full_path()[:500],
+        view=(match.view_name if match else "")[:255],
+        status_code=getattr(response, "status_code", None),
+        duration_ms=duration * 1000,
+        profile_data=marshal.dumps(stats.stats),
+        summary=summary.getvalue(),
+        memory_summary=memory_summary,
+        memory_peak_kib=peak / 1024 if peak is not None else None,
+    )
+    keep = _setting("REQUEST_PROFILE_KEEP", 200)
+    stale = RequestProfile.objects.order_by("-created_at", "-id").values_list("id", flat=True)[keep:]
+    RequestProfile.objects.filter(id__in=list(stale)).delete()
+    return profile
@@ -0,0 +1,47 @@
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.http import parse_etags, quote_etag
+
+from . import tracing
+
+_CACHE_PREFIX = "skills:course-response:v1"
+
+
+def _timeout() -> int:
+    return int(getattr(settings, "COURSE_RESPONSE_CACHE_SECONDS", 24 * 60 * 60))
+
+
+def response_cache_enabled() -> bool:
+    return _timeout() > 0
+
+
+def cached_course_response(course_id, version, render, variant: str = "") -> tuple[str, bytes]:
+    """
+    (etag, body) of a rendered course response. Entries are keyed by the
+    course's tree_version, which every save/delete in its tree bumps, so an
+    edit makes the next request render and store a fresh entry; old versions
+    are never read again and age out. `render` returns the JSON bytes and is
+    only called on a miss. `variant` separates differently shaped responses
+    of the same course.
+    """
+    variant_key = hashlib.sha256(variant.encode("utf-8")).hexdigest()[:16] if variant else ""
+    key = f"{_CACHE_PREFIX}:{course_id}:{version}:{variant_key}"
+    entry = cache.get(key)
+    tracing.current_span().set_attribute("skills.response_cache.hit", entry is not None)
+    if entry is None:
+        body = render()
+        etag = quote_etag(hashlib.sha256(body).hexdigest()[:32])
+        entry = (etag, body)
+        cache.set(key, entry, _timeout())
+    return entry
+
+
+def etag_matches(request, etag: str) -> bool:
+    """True when the request's If-None-Match already names this (strong) ETag."""
+    header = request.META.get("HTTP_IF_NONE_MATCH")
+    if not header:
+        return False
+    etags = parse_etags(header)
+    return "*" in etags or etag in etags
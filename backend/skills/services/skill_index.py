@@ -0,0 +1,168 @@
+import re
+
+from django.conf import settings
+from django.core.exceptions import FieldError
+from django.db import DatabaseError, IntegrityError, connection, transaction
+from django.db.models import F
+
+from ..models import CourseCard, SkillAlias
+
+# Spelling variants folded before tokenizing ("node.js" -> "nodejs", "c++" -> "cpp").
+_SYMBOL_REPLACEMENTS = [
+    (re.compile(r"c\+\+"), "cpp"),
+    (re.compile(r"c#"), "csharp"),
+    (re.compile(r"f#"), "fsharp"),
+    (re.compile(r"\.net\b"), "dotnet"),
+    (re.compile(r"(\w)\.js\b"), r"\1js"),
+]
+
+TOKEN_SYNONYMS = {
+    "js": "javascript",
+    "ecmascript": "javascript",
+    "ts": "typescript",
+    "py": "python",
+    "python3": "python",
+    "golang": "go",
+    "k8s": "kubernetes",
+    "reactjs": "react",
+    "vuejs": "vue",
+    "nextjs": "next",
+    "nodejs": "node",
+    "expressjs": "express",
+    "angularjs": "angular",
+    "postgres": "postgresql",
+    "mongo": "mongodb",
+    "ml": "machine learning",
+    "dl": "deep learning",
+    "ai": "artificial intelligence",
+    "nlp": "natural language processing",
+    "ui": "user interface",
+    "ux": "user experience",
+    "dsa": "data structures algorithms",
+}
+
+STOP_TOKENS = {
+    "a", "an", "and", "the", "to", "for", "of", "in", "with", "from",
+    "learn", "course", "courses", "complete", "mastery", "master",
+    "path", "roadmap", "tutorial", "guide", "bootcamp", "beginner", "beginners",
+    "zero", "hero", "program", "programming", "language",
+}
+
+
+def _key_tokens(text: str) -> list[str]:
+    text = (text or "").lower()
+    for pattern, replacement in _SYMBOL_REPLACEMENTS:
+        text = pattern.sub(replacement, text)
+    tokens = []
+    for raw in re.findall(r"[a-z0-9]+", text):
+        for token in TOKEN_SYNONYMS.get(raw, raw).split():
+            if token not in STOP_TOKENS:
+                tokens.append(token)
+    return tokens
+
+
+def normalize_skill_key(text: str) -> str:
+    """Order-insensitive key: "JS Mastery Path" and "javascript" both map to "javascript"."""
+    tokens = _key_tokens(text)
+    if not tokens:
+        # Only stop words ("Programming"): fall back to the plain lowercase words.
+        tokens = re.findall(r"[a-z0-9]+", (text or "").lower())
+    return " ".join(sorted(set(tokens)))[:255]
+
+
+def _token_set_similarity(a: str, b: str) -> float:
+    left, right = set(a.split()), set(b.split())
+    if not left or not right:
+        return 0.0
+    return len(left & right) / len(left | right)
+
+
+def register_skill_aliases(course: CourseCard, *names: str):
+    """Point the normalized keys of `names` at `course`."""
+    for key in {normalize_skill_key(name) for name in names}:
+        if not key:
+            continue
+        try:
+            with transaction.atomic():
+                SkillAlias.objects.get_or_create(key=key, course=course)
+        except IntegrityError:
+            # Registered concurrently by another request.
+            continue
+
+
+def _trigram_candidates(key: str):
+    """Aliases passing the `%` operator, most similar first."""
+    from django.contrib.postgres.lookups import TrigramSimilar
+    from django.contrib.postgres.search import TrigramSimilarity
+
+    # The lookup is used as an expression: `key__trigram_similar` only exists
+    # with django.contrib.postgres in INSTALLED_APPS.
+    return (
+        SkillAlias.objects.filter(TrigramSimilar(F("key"), key))
+        .annotate(similarity=TrigramSimilarity("key", key))
+        .order_by("-similarity")
+        .values_list("key", flat=True)
+    )
+
+
+def _trigram_match(key: str, threshold: float) -> str | None:
+    """
+    Closest alias by trigram similarity. The `%` operator (trigram_similar)
+    can use the GIN index, so it prefilters at the threshold before the
+    survivors are ranked. Raises DatabaseError when pg_trgm is not installed.
+    """
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            # `%` compares against this setting; SET LOCAL ends with the savepoint's transaction.
+            cursor.execute("SELECT set_config('pg_trgm.similarity_threshold', %s, true)", [str(threshold)])
+        return _trigram_candidates(key).first()
+
+
+def _token_set_match(key: str, threshold: float) -> str | None:
+    anchor = max(key.split(), key=len)
+    best, best_score = None, 0.0
+    candidates = (
+        SkillAlias.objects.filter(key__contains=anchor)
+        .values_list("key", flat=True)
+        .distinct()[:200]
+    )
+    for candidate in candidates:
+        score = _token_set_similarity(key, candidate)
+        if score >= threshold and score > best_score:
+            best, best_score = candidate, score
+    return best
+
+
+def find_courses_for_skill(skill: str) -> list[CourseCard]:
+    """
+    Courses registered for this skill, oldest first. Uses the indexed exact
+    lookup on the normalized key, then a similarity fallback (the indexed
+    pg_trgm `%` operator on PostgreSQL, token-set overlap elsewhere). Fuzzy hits are registered as
+    aliases so the next lookup is exact.
+    """
+    key = normalize_skill_key(skill)
+    if not key:
+        return []
+    courses = list(
+        CourseCard.objects.filter(skill_aliases__key=key).order_by("id")
+    )
+    if courses:
+        return courses
+
+    threshold = float(getattr(settings, "SKILL_MATCH_THRESHOLD", 0.6))
+    if connection.vendor == "postgresql":
+        try:
+            matched_key = _trigram_match(key, threshold)
+        except (DatabaseError, FieldError):
+            # pg_trgm not installed or the lookup unavailable; use the token-set fallback.
+            matched_key = _token_set_match(key, threshold)
+    else:
+        matched_key = _token_set_match(key, threshold)
+    if matched_key is None:
+        return []
+    courses = list(
+        CourseCard.objects.filter(skill_aliases__key=matched_key).order_by("id")
+    )
+    for course in courses:
+        register_skill_aliases(course, skill)
+    return courses
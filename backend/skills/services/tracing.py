@@ -0,0 +1,282 @@
+"""
+Lightweight tracing: nested, timed spans with attributes, on while TRACING is set.
+
+    with tracing.span("chat llama-3.1-8b-instant", {"gen_ai.request.model": model}, kind=tracing.CLIENT) as span:
+        ...
+        span.set_attribute("gen_ai.usage.output_tokens", 512)
+
+Spans nest through a context variable; use bind() to carry the current span
+onto a pool thread. With TRACING_EXPORTER "console" or "file", every finished
+trace is written as one line of OTLP/JSON (an ExportTraceServiceRequest, the
+format of the OpenTelemetry Collector's file exporter and otlpjsonfile
+receiver) to stderr or TRACING_FILE. With "otel" the spans are handed to the
+opentelemetry API instead, for an SDK and exporter configured by the
+deployment; that package is optional.
+"""
+import contextvars
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import ExitStack, contextmanager
+
+from django.conf import settings
+
+try:
+    from opentelemetry import context as otel_context
+    from opentelemetry import trace as otel_trace
+except ImportError:  # pragma: no cover - optional dependency
+    otel_context = otel_trace = None
+
+INTERNAL = "internal"
+SERVER = "server"
+CLIENT = "client"
+
+# OTLP SpanKind / StatusCode enum values.
+_OTLP_KINDS = {INTERNAL: 1, SERVER: 2, CLIENT: 3}
+_OTLP_STATUS_ERROR = 2
+
+_CURRENT: contextvars.ContextVar = contextvars.ContextVar("skills_trace_span", default=None)
+
+
+def tracing_enabled() -> bool:
+    return bool(getattr(settings, "TRACING", False))
+
+
+def _use_otel() -> bool:
+    return otel_trace is not None and getattr(settings, "TRACING_EXPORTER", "console") == "otel"
+
+
+class Span:
+    """One timed operation. Counters are summed (thread-safely) and exported as attributes."""
+
+    def __init__(self, name: str, parent, kind: str, attributes: dict | None):
+        self.name = name
+        self.parent = parent
+        self.kind = kind
+        self.trace_id = parent.trace_id if parent is not None else os.urandom(16).hex()
+        self.span_id = os.urandom(8).hex()
+        self.attributes = {k: v for k, v in (attributes or {}).items() if v is not None}
+        self.counters: dict[str, int] = {}
+        self.error: BaseException | None = None
+        self.start_ns = time.time_ns()
+        self.end_ns = None
+        self._lock = threading.Lock()
+        self._otel = None
+
+    def set_attribute(self, key: str, value):
+        if value is None:
+            return
+        self.attributes[key] = value
+        if self._otel is not None:
+            self._otel.set_attribute(key, value)
+
+    def update_name(self, name: str):
+        self.name = name
+        if self._otel is not None:
+            self._otel.update_name(name)
+
+    def increment(self, key: str, amount: int = 1):
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + amount
+
+    def end(self):
+        self.end_ns = time.time_ns()
+        if self._otel is not None:
+            for key, value in self.counters.items():
+                self._otel.set_attribute(key, value)
+        else:
+            _RECORDER.finish(self)
+
+
+class _NoopSpan:
+    name = ""
+    trace_id = span_id = ""
+
+    def set_attribute(self, key, value):
+        pass
+
+    def update_name(self, name):
+        pass
+
+    def increment(self, key, amount=1):
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+def current_span():
+    """The innermost open span, or a no-op span outside of any."""
+    return _CURRENT.get() or NOOP_SPAN
+
+
+def increment(key: str, amount: int = 1):
+    """Add to a counter attribute of the current span (e.g. cache hits)."""
+    current_span().increment(key, amount)
+
+
+@contextmanager
+def span(name: str, attributes: dict | None = None, kind: str = INTERNAL):
+    """Time the block as a child of the current span; exceptions mark it as failed."""
+    if not tracing_enabled():
+        yield NOOP_SPAN
+        return
+    current = Span(name, _CURRENT.get(), kind, attributes)
+    _RECORDER.start(current)
+    token = _CURRENT.set(current)
+    with ExitStack() as stack:
+        if _use_otel():
+            current._otel = stack.enter_context(
+                otel_trace.get_tracer("skills").start_as_current_span(
+                    name,
+                    kind=getattr(otel_trace.SpanKind, kind.upper()),
+                    attributes=current.attributes,
+                )
+            )
+        try:
+            yield current
+        except Exception as exc:
+            current.error = exc
+            raise
+        finally:
+            try:
+                _CURRENT.reset(token)
+            except ValueError:
+                # Closed from another context (e.g. a generator finished elsewhere).
+                _CURRENT.set(current.parent)
+            current.end()
+
+
+def bind(func):
+    """Wrap `func` to run under the caller's current span, e.g. on a pool thread."""
+    parent = _CURRENT.get()
+    if parent is None:
+        return func
+    otel_parent = otel_context.get_current() if parent._otel is not None else None
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        token = _CURRENT.set(parent)
+        otel_token = otel_context.attach(otel_parent) if otel_parent is not None else None
+        try:
+            return func(*args, **kwargs)
+        finally:
+            if otel_token is not None:
+                otel_context.detach(otel_token)
+            _CURRENT.reset(token)
+
+    return wrapper
+
+
+def _otlp_value(value) -> dict:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    if isinstance(value, (list, tuple)):
+        return {"arrayValue": {"values": [_otlp_value(v) for v in value]}}
+    return {"stringValue": str(value)}
+
+
+def _otlp_attributes(attributes: dict) -> list[dict]:
+    return [{"key": key, "value": _otlp_value(value)} for key, value in attributes.items()]
+
+
+def otlp_span(current: Span) -> dict:
+    """A finished span in OTLP/JSON form."""
+    data = {
+        "traceId": current.trace_id,
+        "spanId": current.span_id,
+        "name": current.name,
+        "kind": _OTLP_KINDS.get(current.kind, 1),
+        "startTimeUnixNano": str(current.start_ns),
+        "endTimeUnixNano": str(current.end_ns),
+        "attributes": _otlp_attributes({**current.attributes, **current.counters}),
+        "status": {},
+    }
+    if current.parent is not None:
+        data["parentSpanId"] = current.parent.span_id
+    if current.error is not None:
+        message = str(current.error) or current.error.__class__.__name__
+        data["status"] = {"code": _OTLP_STATUS_ERROR, "message": message[:500]}
+        data["events"] = [
+            {
+                "timeUnixNano": str(current.end_ns),
+                "name": "exception",
+                "attributes": _otlp_attributes(
+                    {"exception.type": current.error.__class__.__name__, "exception.message": message[:500]}
+                ),
+            }
+        ]
+    return data
+
+
+class _Recorder:
+    """
+    Collects finished spans per trace and writes a trace once all of its
+    open spans have ended. Spans that end after their trace was written
+    (e.g. a timed-out pool thread) are written as a trace fragment.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._open: dict[str, int] = {}
+        self._finished: dict[str, list[Span]] = {}
+
+    def start(self, current: Span):
+        if _use_otel():
+            return
+        with self._lock:
+            self._open[current.trace_id] = self._open.get(current.trace_id, 0) + 1
+
+    def finish(self, current: Span):
+        with self._lock:
+            self._finished.setdefault(current.trace_id, []).append(current)
+            remaining = self._open.get(current.trace_id, 1) - 1
+            if remaining > 0:
+                self._open[current.trace_id] = remaining
+                return
+            self._open.pop(current.trace_id, None)
+            spans = self._finished.pop(current.trace_id)
+        try:
+            _write(_export_line(spans))
+        except Exception:  # pragma: no cover - tracing must never break a request
+            pass
+
+
+_RECORDER = _Recorder()
+_WRITE_LOCK = threading.Lock()
+
+
+def _export_line(spans: list[Span]) -> str:
+    service = getattr(settings, "TRACING_SERVICE_NAME", "skills-backend")
+    request = {
+        "resourceSpans": [
+            {
+                "resource": {"attributes": _otlp_attributes({"service.name": service})},
+                "scopeSpans": [
+                    {
+                        "scope": {"name": "skills"},
+                        "spans": [otlp_span(s) for s in sorted(spans, key=lambda s: s.start_ns)],
+                    }
+                ],
+            }
+        ]
+    }
+    return json.dumps(request, separators=(",", ":"), ensure_ascii=False)
+
+
+def _write(line: str):
+    exporter = getattr(settings, "TRACING_EXPORTER", "console")
+    with _WRITE_LOCK:
+        if exporter == "file":
+            with open(settings.TRACING_FILE, "a", encoding="utf-8") as fh:
+                fh.write(line + "\n")
+        else:
+            sys.stderr.write(line + "\n")
+            sys.stderr.flush()
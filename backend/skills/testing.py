@@ -0,0 +1,41 @@
+from django.test import override_settings
+
+
+def check_query_budget(response, budget: int | None = None):
+    """
+    Raise AssertionError when the request behind `response` ran more queries
+    than `budget`, or than its view declares (query_budgets / @query_budget).
+    The response must come from a request made with SQL_INSTRUMENTATION on.
+    """
+    stats = getattr(response, "sql_stats", None)
+    if stats is None:
+        raise AssertionError("No SQL stats on the response; is SQL_INSTRUMENTATION on?")
+    limit = budget if budget is not None else stats.budget
+    if limit is None:
+        raise AssertionError(f"{stats.view} declares no query budget.")
+    if stats.count > limit:
+        raise AssertionError(
+            f"{stats.view} exceeded its query budget of {limit}:\n{stats.report()}"
+        )
+
+
+class QueryBudgetMixin:
+    """
+    TestCase mixin: request an endpoint with SQL instrumentation on and fail
+    the test when it exceeds its query budget.
+
+        response = self.assertWithinQueryBudget("get", "/api/skills/courses/")
+    """
+
+    def assertWithinQueryBudget(self, method, path, data=None, budget=None, client=None, **extra):
+        client = client or self.client
+        with override_settings(SQL_INSTRUMENTATION=True):
+            if data is None:
+                response = getattr(client, method.lower())(path, **extra)
+            else:
+                response = getattr(client, method.lower())(path, data, **extra)
+        try:
+            check_query_budget(response, budget)
+        except AssertionError as exc:
+            self.fail(str(exc))
+        return response
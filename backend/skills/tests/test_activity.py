@@ -0,0 +1,62 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from skills.models import CourseCard, DailyActivity
+from skills.services.activity import daily_totals, increment_activity, last_active_day, streak_ending
+
+from .utils import make_tree
+
+
+class DailyActivityTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user("learner", password="pw")
+        self.course, *_ = make_tree()
+        self.other = CourseCard.objects.create(title="Go")
+        self.today = timezone.localdate()
+
+    def days_ago(self, n):
+        return self.today - timedelta(days=n)
+
+    def test_increments_upsert_one_row_per_course_and_day(self):
+        increment_activity(self.user, self.course.id)
+        increment_activity(self.user, self.course.id, count=2)
+        increment_activity(self.user, self.other.id)
+        self.assertEqual(
+            sorted(DailyActivity.objects.values_list("course_id", "day", "count")),
+            sorted([(self.course.id, self.today, 3), (self.other.id, self.today, 1)]),
+        )
+
+    def test_totals_and_streaks(self):
+        for n in (0, 1, 2, 4):
+            increment_activity(self.user, self.course.id, self.days_ago(n))
+        increment_activity(self.user, self.other.id, self.days_ago(1), count=2)
+        self.assertEqual(
+            daily_totals(self.user, self.days_ago(2), self.today),
+            {self.days_ago(2): 1, self.days_ago(1): 3, self.today: 1},
+        )
+        self.assertEqual(last_active_day(self.user), self.today)
+        self.assertEqual(streak_ending(self.user, self.today), 3)
+        self.assertEqual(streak_ending(self.user, self.days_ago(3)), 0)
+        self.assertEqual(streak_ending(self.user, self.days_ago(4)), 1)
+
+    def test_heatmap_endpoint(self):
+        increment_activity(self.user, self.course.id, self.days_ago(1), count=2)
+        increment_activity(self.user, self.other.id, self.days_ago(1))
+        increment_activity(self.user, self.other.id, self.days_ago(40))
+        client = APIClient(HTTP_HOST="localhost")
+        client.force_authenticate(self.user)
+
+        data = client.get("/api/skills/courses/activity-heatmap/?days=30").data
+        self.assertEqual(len(data["days"]), 30)
+        self.assertEqual((data["start"], data["end"]), (self.days_ago(29).isoformat(), self.today.isoformat()))
+        self.assertEqual(data["days"][-2], {"date": self.days_ago(1).isoformat(), "count": 3})
+        self.assertEqual((data["total"], data["active_days"], data["max_count"]), (3, 1, 3))
+
+        data = client.get(f"/api/skills/courses/activity-heatmap/?days=60&course={self.other.id}").data
+        self.assertEqual((data["total"], data["active_days"]), (2, 2))
+        self.assertEqual(len(client.get("/api/skills/courses/activity-heatmap/?days=9999").data["days"]), 366)
+        self.assertEqual(client.get("/api/skills/courses/activity-heatmap/?days=x").status_code, 400)
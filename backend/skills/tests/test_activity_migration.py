@@ -0,0 +1,60 @@
+from datetime import date, datetime, timezone as dt_timezone
+
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TransactionTestCase, override_settings
+
+BEFORE = [("skills", "0023_course_tree_version")]
+BACKFILLED = [("skills", "0024_daily_activity")]
+LATEST = [("skills", "0028_remove_usercoursetracking_activity_by_date")]
+
+
+@override_settings(TIME_ZONE="UTC")
+class DailyActivityMigrationTests(TransactionTestCase):
+    """Migrate the activity_by_date blobs forward into DailyActivity and back again."""
+
+    def migrate(self, targets):
+        executor = MigrationExecutor(connection)
+        executor.loader.build_graph()
+        executor.migrate(targets)
+        return executor.loader.project_state(targets).apps
+
+    def tearDown(self):
+        self.migrate(MigrationExecutor(connection).loader.graph.leaf_nodes())
+
+    def test_backfill_and_reverse(self):
+        apps = self.migrate(BEFORE)
+        User = apps.get_model("auth", "User")
+        CourseCard = apps.get_model("skills", "CourseCard")
+        Path = apps.get_model("skills", "Path")
+        Roadmap = apps.get_model("skills", "Roadmap")
+        UserCourseTracking = apps.get_model("skills", "UserCourseTracking")
+        StageProgress = apps.get_model("skills", "StageProgress")
+
+        user = User.objects.create(username="learner")
+        course = CourseCard.objects.create(title="Rust")
+        path = Path.objects.create(course=course, title="P", mini_desc="m", duration="1 month")
+        roadmap = Roadmap.objects.create(path=path, title="R", micro_desc="m", duration="1 week")
+        blob = {"2026-10-01": 2, "2026-10-02": 1, "bad-date": 5, "2026-10-03": 0}
+        UserCourseTracking.objects.create(user=user, course=course, activity_by_date=blob)
+        progress = StageProgress.objects.create(user=user, roadmap=roadmap)
+        StageProgress.objects.filter(pk=progress.pk).update(
+            passed_at=datetime(2026, 10, 2, 12, tzinfo=dt_timezone.utc)
+        )
+
+        apps = self.migrate(LATEST)
+        DailyActivity = apps.get_model("skills", "DailyActivity")
+        self.assertEqual(
+            sorted(DailyActivity.objects.values_list("day", "count")),
+            [(date(2026, 10, 1), 2), (date(2026, 10, 2), 2)],
+        )
+
+        apps = self.migrate(BACKFILLED)
+        tracking = apps.get_model("skills", "UserCourseTracking").objects.get()
+        # Column restored empty by reversing 0028; the blob is rebuilt when 0024 is reversed.
+        self.assertEqual(tracking.activity_by_date, {})
+
+        apps = self.migrate(BEFORE)
+        tracking = apps.get_model("skills", "UserCourseTracking").objects.get()
+        self.assertEqual(tracking.activity_by_date, {"2026-10-01": 2, "2026-10-02": 1})
+
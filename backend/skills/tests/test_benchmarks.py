@@ -0,0 +1,138 @@
+import json
+import tempfile
+from io import StringIO
+from pathlib import Path as FilePath
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+
+from skills.models import (
+    CourseCard,
+    DailyActivity,
+    QuizQuestion,
+    Resource,
+    StageProgress,
+    SubMap,
+    UserCourseTracking,
+)
+
+SMALL = {
+    "courses": 2,
+    "paths": 1,
+    "stages": 2,
+    "topics": 2,
+    "resources": 3,
+    "users": 2,
+    "courses_per_user": 1,
+    "questions": 6,
+    "short_answers": 2,
+}
+
+
+def seed(**options):
+    call_command("seed_benchmark_data", stdout=StringIO(), **{**SMALL, **options})
+
+
+class SeedBenchmarkDataTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_seeds_the_requested_sizes(self):
+        seed()
+        self.assertEqual(CourseCard.objects.filter(title__startswith="Benchmark course ").count(), 2)
+        self.assertEqual(SubMap.objects.count(), 2 * 1 * 2 * 2)
+        self.assertEqual(Resource.objects.count(), 8 * 3)
+        self.assertEqual(QuizQuestion.objects.count(), 2 * 2 * 6)
+        self.assertEqual(get_user_model().objects.filter(username__startswith="bench-user-").count(), 2)
+        self.assertEqual(UserCourseTracking.objects.count(), 2)
+        self.assertTrue(StageProgress.objects.exists())
+        self.assertTrue(DailyActivity.objects.exists())
+
+    def test_reseeding_replaces_earlier_data(self):
+        seed()
+        seed(courses=1)
+        self.assertEqual(CourseCard.objects.count(), 1)
+        self.assertEqual(get_user_model().objects.count(), 2)
+
+    def test_flush_only_deletes(self):
+        seed()
+        other = get_user_model().objects.create(username="someone")
+        call_command("seed_benchmark_data", flush=True, stdout=StringIO())
+        self.assertFalse(CourseCard.objects.exists())
+        self.assertEqual(list(get_user_model().objects.all()), [other])
+
+
+class RunBenchmarksTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.dir.cleanup)
+
+    def run_benchmarks(self, *scenarios, **options):
+        out = StringIO()
+        call_command(
+            "run_benchmarks",
+            repeat=1,
+            warmup=0,
+            scenario=list(scenarios) or None,
+            stdout=out,
+            **options,
+        )
+        return out.getvalue()
+
+    def test_requires_seeded_data(self):
+        with self.assertRaisesMessage(CommandError, "seed_benchmark_data"):
+            self.run_benchmarks()
+
+    def test_rejects_unknown_scenarios(self):
+        seed()
+        with self.assertRaisesMessage(CommandError, "Unknown scenario(s): nope"):
+            self.run_benchmarks("nope")
+
+    def test_writes_a_report_and_rolls_back(self):
+        seed()
+        tracking = UserCourseTracking.objects.order_by("id").first()
+        completed = list(tracking.completed_sub_map_ids)
+        passed = StageProgress.objects.count()
+        output = FilePath(self.dir.name, "results.json")
+
+        self.run_benchmarks(output=str(output))
+
+        report = json.loads(output.read_text())
+        self.assertEqual(report["meta"]["courses"], 2)
+        self.assertEqual(report["meta"]["repeat"], 1)
+        self.assertIn("submit_exam", report["scenarios"])
+        for result in report["scenarios"].values():
+            self.assertEqual(result["requests"], 1)
+            self.assertGreater(result["response_bytes"], 0)
+        self.assertGreater(report["scenarios"]["course_detail_uncached"]["queries"], 0)
+        self.assertGreater(report["scenarios"]["submit_exam"]["queries"], 0)
+        tracking.refresh_from_db()
+        self.assertEqual(tracking.completed_sub_map_ids, completed)
+        self.assertEqual(StageProgress.objects.count(), passed)
+
+    def write_baseline(self, p50_ms):
+        baseline = FilePath(self.dir.name, "baseline.json")
+        baseline.write_text(json.dumps({
+            "meta": {"created_at": "2026-01-01T00:00:00+00:00"},
+            "scenarios": {
+                "course_list": {"p50_ms": p50_ms, "queries": 1, "peak_kib": 1},
+            },
+        }))
+        return str(baseline)
+
+    def test_baseline_regression_fails(self):
+        seed()
+        with self.assertRaisesMessage(CommandError, "p50 regressed by more than 5%: course_list"):
+            self.run_benchmarks("course_list", baseline=self.write_baseline(1e-6), max_regression=5)
+
+    def test_baseline_within_limit_passes(self):
+        seed()
+        output = self.run_benchmarks(
+            "course_list", "get_exam", baseline=self.write_baseline(1e6), max_regression=5
+        )
+        self.assertIn("course_list", output)
+        self.assertIn("get_exam                 (not in baseline)", output)
@@ -0,0 +1,54 @@
+from urllib.parse import urlparse
+
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from skills.models import CourseCard, Roadmap
+
+from .utils import make_tree
+
+COURSES = "/api/skills/courses/"
+
+
+class CatalogListTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.tree_course, cls.path, _, _ = make_tree()
+        Roadmap.objects.create(path=cls.path, title="R2", micro_desc="m", duration="1 week")
+        cls.others = [CourseCard.objects.create(title=f"Course {i}") for i in range(4)]
+
+    def setUp(self):
+        self.client = APIClient(HTTP_HOST="localhost")
+
+    def test_plain_list_returns_summary_cards_in_one_query(self):
+        with self.assertNumQueries(1):
+            response = self.client.get(COURSES)
+        self.assertIsInstance(response.data, list)
+        self.assertEqual([c["id"] for c in response.data], sorted(c["id"] for c in response.data))
+        card = response.data[0]
+        self.assertNotIn("path_items", card)
+        self.assertEqual((card["path_count"], card["roadmap_count"]), (1, 2))
+        self.assertEqual(response.data[-1]["roadmap_count"], 0)
+
+    def test_cursor_pages_cover_the_catalog_once(self):
+        response = self.client.get(COURSES, {"page_size": 2})
+        self.assertEqual(set(response.data), {"next", "previous", "results"})
+        self.assertIsNone(response.data["previous"])
+        seen = [c["id"] for c in response.data["results"]]
+        while response.data["next"]:
+            next_url = urlparse(response.data["next"])
+            response = self.client.get(f"{next_url.path}?{next_url.query}")
+            self.assertLessEqual(len(response.data["results"]), 2)
+            seen.extend(c["id"] for c in response.data["results"])
+        self.assertEqual(seen, list(CourseCard.objects.order_by("id").values_list("id", flat=True)))
+
+    def test_expanded_trees(self):
+        response = self.client.get(COURSES, {"expand": "tree"})
+        tree = next(c for c in response.data if c["id"] == self.tree_course.id)
+        self.assertEqual([p["title"] for p in tree["path_items"]], ["P"])
+        self.assertEqual(len(tree["path_items"][0]["roadmaps"]), 2)
+
+        page = self.client.get(COURSES, {"expand": "tree", "page_size": 1})
+        self.assertEqual([c["id"] for c in page.data["results"]], [self.tree_course.id])
+        self.assertIn("path_items", page.data["results"][0])
+        self.assertIsNotNone(page.data["next"])
@@ -0,0 +1,95 @@
+from django.db import connection
+from django.test import TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+
+from skills.counters import deferred_counters
+from skills.models import Path, Resource, SubMap
+from skills.serializers import RoadmapSerializer
+
+from .utils import make_tree
+
+
+def add_resources(sub_map, n):
+    for i in range(n):
+        Resource.objects.create(sub_map=sub_map, link=f"https://example.com/{i}")
+
+
+class CounterCascadeTests(TestCase):
+    def assertCounts(self, course, path, roadmap, sub_map, counts):
+        for obj in (course, path, roadmap, sub_map):
+            obj.refresh_from_db()
+        self.assertEqual(
+            (course.path_count, path.roadmap_count, roadmap.sub_map_count, sub_map.resources_count),
+            counts,
+        )
+
+    def test_immediate_cascade(self):
+        course, path, roadmap, sub_map = make_tree()
+        add_resources(sub_map, 2)
+        self.assertCounts(course, path, roadmap, sub_map, (1, 1, 1, 2))
+        Resource.objects.filter(sub_map=sub_map).first().delete()
+        self.assertCounts(course, path, roadmap, sub_map, (1, 1, 1, 1))
+
+    def test_deferred_counters_are_recounted_on_exit(self):
+        course, path, roadmap, sub_map = make_tree()
+        with deferred_counters():
+            add_resources(sub_map, 3)
+            SubMap.objects.create(roadmap=roadmap, title="S2")
+            Path.objects.create(course=course, title="P2", mini_desc="m", duration="1 month")
+            sub_map.refresh_from_db()
+            self.assertEqual(sub_map.resources_count, 0)
+        self.assertCounts(course, path, roadmap, sub_map, (2, 1, 2, 3))
+
+    def test_deferred_counter_queries_do_not_grow_with_batch_size(self):
+        def queries(n):
+            *_, sub_map = make_tree()
+            with CaptureQueriesContext(connection) as captured, deferred_counters():
+                add_resources(sub_map, n)
+            return len(captured)
+
+        # Only the inserts themselves grow.
+        self.assertEqual(queries(10) - queries(2), 8)
+
+    def test_deferred_deletes(self):
+        course, path, roadmap, sub_map = make_tree()
+        add_resources(sub_map, 3)
+        with deferred_counters():
+            for resource in Resource.objects.filter(sub_map=sub_map)[:2]:
+                resource.delete()
+        self.assertCounts(course, path, roadmap, sub_map, (1, 1, 1, 1))
+
+    def test_nested_blocks_recount_once_at_the_outermost_exit(self):
+        course, path, roadmap, sub_map = make_tree()
+        with deferred_counters():
+            with deferred_counters():
+                add_resources(sub_map, 2)
+            sub_map.refresh_from_db()
+            self.assertEqual(sub_map.resources_count, 0)
+        sub_map.refresh_from_db()
+        self.assertEqual(sub_map.resources_count, 2)
+
+    def test_nested_serializer_create(self):
+        *_, path, _, _ = make_tree()
+        serializer = RoadmapSerializer(
+            data={
+                "title": "New stage",
+                "micro_desc": "m",
+                "duration": "1 week",
+                "sub_maps": [{"title": "A"}, {"title": "B"}, {"title": "C"}],
+            }
+        )
+        serializer.is_valid(raise_exception=True)
+        roadmap = serializer.save(path=path)
+        self.assertEqual(roadmap.sub_map_count, 3)
+        path.refresh_from_db()
+        self.assertEqual(path.roadmap_count, 2)
+
+
+class DeferredCountersOutsideTransactionTests(TransactionTestCase):
+    def test_counters_are_recounted_when_the_block_fails(self):
+        *_, sub_map = make_tree()
+        with self.assertRaises(RuntimeError), deferred_counters():
+            add_resources(sub_map, 2)
+            raise RuntimeError("boom")
+        sub_map.refresh_from_db()
+        self.assertEqual(sub_map.resources_count, 2)
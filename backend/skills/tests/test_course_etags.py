@@ -0,0 +1,65 @@
+import json
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from skills.models import Resource
+
+from .utils import make_tree
+
+
+@override_settings(COURSE_RESPONSE_CACHE_SECONDS=3600)
+class CourseETagTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.course, _, _, self.sub_map = make_tree()
+        Resource.objects.create(sub_map=self.sub_map, link="https://example.com/en", language="English")
+        self.client = APIClient(HTTP_HOST="localhost")
+        self.url = f"/api/skills/courses/{self.course.id}/"
+
+    def test_cached_response_and_revalidation(self):
+        first = self.client.get(self.url)
+        self.assertEqual(first.status_code, 200)
+        etag = first["ETag"]
+        self.assertTrue(etag.startswith('"'))
+        self.assertEqual(first["Cache-Control"], "no-cache")
+
+        # A hit only reads the course's tree_version.
+        with self.assertNumQueries(1):
+            second = self.client.get(self.url)
+        self.assertEqual((second["ETag"], second.content), (etag, first.content))
+
+        with self.assertNumQueries(1):
+            not_modified = self.client.get(self.url, HTTP_IF_NONE_MATCH=f'"other", {etag}')
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(not_modified.content, b"")
+        self.assertEqual(not_modified["ETag"], etag)
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH='"other"').status_code, 200)
+
+    def test_tree_edits_change_the_etag(self):
+        etag = self.client.get(self.url)["ETag"]
+        Resource.objects.create(sub_map=self.sub_map, link="https://example.com/2", language="English")
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+        resources = json.loads(response.content)["path_items"][0]["roadmaps"][0]["sub_maps"][0]["resources"]
+        self.assertEqual(len(resources["English"]), 2)
+
+    def test_variants_are_cached_separately(self):
+        full = self.client.get(self.url)
+        hindi = self.client.get(self.url, {"language": "hindi"})
+        self.assertNotEqual(full["ETag"], hindi["ETag"])
+        self.assertEqual(self.client.get(self.url, {"language": "hindi"})["ETag"], hindi["ETag"])
+        self.assertNotEqual(self.client.get(self.url, {"fields": "id,title"})["ETag"], full["ETag"])
+
+    def test_missing_course(self):
+        self.assertEqual(self.client.get("/api/skills/courses/999999/").status_code, 404)
+
+    @override_settings(COURSE_RESPONSE_CACHE_SECONDS=0)
+    def test_disabled_cache_renders_every_time(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("ETag", response)
+        self.assertEqual(response.data["id"], self.course.id)
@@ -0,0 +1,85 @@
+from django.core.cache import cache
+from django.test import TestCase
+
+from skills.models import CourseCard, Path, Roadmap, SubMap
+from skills.services.course_structure import get_course_structure, get_course_structures
+
+from .utils import make_tree
+
+
+class TreeVersionTests(TestCase):
+    def test_save_bumps_the_version_and_keeps_a_number(self):
+        course, *_ = make_tree()
+        course.refresh_from_db()
+        before = course.tree_version
+        course.title = "Rust 2"
+        course.save()
+        self.assertIsInstance(course.tree_version, int)
+        self.assertEqual(course.tree_version, before + 1)
+        course.save(update_fields=["title"])
+        self.assertEqual(course.tree_version, before + 2)
+        self.assertEqual(CourseCard.objects.get(pk=course.pk).tree_version, before + 2)
+
+    def test_new_courses_start_at_zero(self):
+        self.assertEqual(CourseCard.objects.create(title="Go").tree_version, 0)
+
+    def test_tree_edits_bump_the_course(self):
+        course, _, roadmap, _ = make_tree()
+        version = CourseCard.objects.get(pk=course.pk).tree_version
+        SubMap.objects.create(roadmap=roadmap, title="S2")
+        self.assertGreater(CourseCard.objects.get(pk=course.pk).tree_version, version)
+        # Adding a path saves this course instance through the path_count cascade.
+        Path.objects.create(course=course, title="P2", mini_desc="m", duration="1 month")
+        self.assertIsInstance(course.tree_version, int)
+
+
+class CourseStructureTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.course, self.path, self.roadmap, self.sub_map = make_tree()
+        self.stage2 = Roadmap.objects.create(path=self.path, title="R2", micro_desc="m", duration="1 week")
+        self.topic2 = SubMap.objects.create(roadmap=self.stage2, title="S2")
+        self.course.refresh_from_db()
+
+    def test_structure_is_cached_per_version(self):
+        structure = get_course_structure(self.course.id, self.course.tree_version)
+        self.assertEqual(list(structure.roadmap_ids), [self.roadmap.id, self.stage2.id])
+        self.assertEqual(list(structure.sub_map_ids), [self.sub_map.id, self.topic2.id])
+        self.assertEqual(list(structure.roadmap_ids_for_path(self.path.id)), [self.roadmap.id, self.stage2.id])
+        with self.assertNumQueries(0):
+            get_course_structure(self.course.id, self.course.tree_version)
+        with self.assertNumQueries(1):
+            get_course_structure(self.course.id)
+
+    def test_saving_the_course_invalidates_the_structure(self):
+        get_course_structure(self.course.id, self.course.tree_version)
+        SubMap.objects.create(roadmap=self.stage2, title="S3")
+        self.course.title = "Renamed"
+        self.course.save()
+        structure = get_course_structure(self.course.id, self.course.tree_version)
+        self.assertEqual(structure.sub_map_count, 3)
+        self.assertEqual(structure.version, CourseCard.objects.get(pk=self.course.pk).tree_version)
+
+    def test_lookups(self):
+        structure = get_course_structure(self.course.id)
+        self.assertEqual(structure.valid_sub_map_ids([self.topic2.id, 999999, self.topic2.id]), [self.topic2.id])
+        self.assertEqual(structure.next_stage_title(set()), "R")
+        self.assertEqual(structure.next_stage_title({self.roadmap.id}), "R2")
+        self.assertIsNone(structure.next_stage_title({self.roadmap.id, self.stage2.id}))
+
+    def test_batched_lookup_matches_single_lookups(self):
+        other, *_ = make_tree()
+        with self.assertNumQueries(3):
+            structures = get_course_structures([self.course.id, other.id, 999999])
+        self.assertEqual(set(structures), {self.course.id, other.id})
+        cache.clear()
+        for course_id, structure in structures.items():
+            single = get_course_structure(course_id)
+            self.assertEqual(structure.version, single.version)
+            self.assertEqual(list(structure.roadmap_ids), list(single.roadmap_ids))
+            self.assertEqual(list(structure.sub_map_ids), list(single.sub_map_ids))
+            self.assertEqual(structure.roadmap_titles, single.roadmap_titles)
+        # Cached entries only cost the version lookup.
+        with self.assertNumQueries(1):
+            get_course_structures([self.course.id, other.id])
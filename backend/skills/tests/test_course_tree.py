@@ -0,0 +1,80 @@
+import json
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from skills.models import CourseCard, Path
+from skills.serializers import CourseSerializer
+from skills.services.course_tree import course_tree, course_trees
+from skills.services.course_writer import save_generated_course
+
+from .utils import generated_course
+
+VARIANTS = [
+    {},
+    {"language": "hindi"},
+    {"language": "English"},
+    {"fields": "id,title,path_items,roadmaps"},
+    {"fields": "id,title,path_items,roadmaps,sub_maps,resources,link"},
+    {"fields": "title"},
+    {"depth": "0"},
+    {"depth": "2"},
+    {"depth": "3", "language": "bangla"},
+    {"depth": "9", "fields": "id,path_items,roadmaps,sub_maps,resources_count"},
+]
+
+
+class CourseTreeTests(TestCase):
+    """course_tree must render the same JSON as CourseSerializer for every variant."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.course = save_generated_course(generated_course(paths=2, stages=2, topics=2, resources=3))
+        # A path without stages next to full ones.
+        Path.objects.create(course=cls.course, title="Empty path", mini_desc="m", duration="1 month")
+        cls.empty = CourseCard.objects.create(title="Empty", rating=4)
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.client = APIClient(HTTP_HOST="localhost")
+
+    def get(self, course, params, cached):
+        with override_settings(COURSE_RESPONSE_CACHE_SECONDS=3600 if cached else 0):
+            response = self.client.get(f"/api/skills/courses/{course.id}/", params)
+        self.assertEqual(response.status_code, 200)
+        return response.content
+
+    def test_endpoint_bytes_match_the_serializer(self):
+        for course in (self.course, self.empty):
+            for params in VARIANTS:
+                with self.subTest(course=course.title, **params):
+                    self.assertEqual(self.get(course, params, cached=True), self.get(course, params, cached=False))
+
+    def test_unfiltered_tree_matches_the_serializer(self):
+        for course in (self.course, self.empty):
+            expected = json.loads(json.dumps(CourseSerializer(CourseCard.objects.get(pk=course.pk)).data))
+            self.assertEqual(course_tree(course.id), expected)
+
+    def test_empty_course_and_unknown_ids(self):
+        tree = course_tree(self.empty.id)
+        self.assertEqual(tree["path_items"], [])
+        self.assertEqual(tree["rating"], 4.0)
+        self.assertIsNone(course_tree(999999))
+        self.assertEqual([t["id"] for t in course_trees([self.empty.id, 999999, self.course.id])],
+                         [self.empty.id, self.course.id])
+
+    def test_pruned_levels_are_not_queried(self):
+        with self.assertNumQueries(1):
+            course_tree(self.course.id, depth=0)
+        with self.assertNumQueries(3):
+            course_tree(self.course.id, depth=2)
+        with self.assertNumQueries(5):
+            course_tree(self.course.id)
+
+    def test_language_filter_keeps_resource_counts(self):
+        tree = course_tree(self.course.id, language="Hindi")
+        sub_map = tree["path_items"][0]["roadmaps"][0]["sub_maps"][0]
+        self.assertEqual(list(sub_map["resources"]), ["Hindi"])
+        self.assertEqual(sub_map["resources_count"], 3)
@@ -0,0 +1,44 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from skills.models import CourseCard, Path, Resource, Roadmap, SubMap
+from skills.services.course_writer import save_generated_course
+
+from .utils import generated_course
+
+
+class SaveGeneratedCourseTests(TestCase):
+    def test_query_count_depends_on_depth_not_node_count(self):
+        with CaptureQueriesContext(connection) as small:
+            save_generated_course(generated_course(1, 1, 1, 1, title="Small"), skill="Small")
+        with self.assertNumQueries(len(small)):
+            save_generated_course(generated_course(3, 6, 4, 3, title="Large"), skill="Large")
+        self.assertEqual(SubMap.objects.filter(roadmap__path__course__title="Large").count(), 72)
+
+    def test_rows_and_counters(self):
+        course = save_generated_course(generated_course(2, 3, 2, 2), skill="rust")
+        self.assertEqual(course.path_count, 2)
+        self.assertEqual(Path.objects.filter(course=course).count(), 2)
+        for path in Path.objects.filter(course=course):
+            self.assertEqual(path.roadmap_count, 3)
+            self.assertEqual(path.roadmaps.count(), 3)
+        for roadmap in Roadmap.objects.filter(path__course=course):
+            self.assertEqual(roadmap.sub_map_count, 2)
+        for sub_map in SubMap.objects.filter(roadmap__path__course=course):
+            self.assertEqual(sub_map.resources_count, 2)
+            self.assertEqual(sub_map.resources.count(), 2)
+
+    def test_paths_are_saved_in_level_order(self):
+        course = save_generated_course(generated_course(3, 1, 1, 1))
+        levels = list(Path.objects.filter(course=course).order_by("id").values_list("level", flat=True))
+        self.assertEqual(levels, ["beginner", "intermediate", "advanced"])
+
+    def test_failure_rolls_back_the_whole_tree(self):
+        payload = generated_course(2, 2, 2, 1)
+        del payload["paths"][1]["roadmaps"][1]["title"]
+        with self.assertRaises(KeyError):
+            save_generated_course(payload)
+        self.assertFalse(CourseCard.objects.exists())
+        self.assertFalse(Path.objects.exists())
+        self.assertFalse(Resource.objects.exists())
@@ -0,0 +1,107 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from skills.models import Roadmap, StageProgress, SubMap, UserCourseStats, UserDashboardStats
+from skills.services.activity import increment_activity
+from skills.services.dashboard_stats import dashboard_data, record_activity, rebuild_user_stats
+
+from .utils import make_tree
+
+
+class DashboardStatsTests(TestCase):
+    def setUp(self):
+        # Cached course structures are keyed by id, and ids are reused between tests.
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.user = get_user_model().objects.create_user("learner", password="pw")
+        self.course, self.path, self.roadmap, self.sub_map = make_tree()
+        self.second_stage = Roadmap.objects.create(path=self.path, title="R2", micro_desc="m", duration="1 week")
+        self.second_topic = SubMap.objects.create(roadmap=self.second_stage, title="S2")
+        self.client = APIClient(HTTP_HOST="localhost")
+        self.client.force_authenticate(self.user)
+
+    def save_progress(self, ids, track_activity=True):
+        response = self.client.post(
+            f"/api/skills/courses/{self.course.id}/user-progress/",
+            {"completed_sub_map_ids": ids, "track_activity": track_activity},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 200)
+
+    def card(self):
+        (card,) = dashboard_data(self.user)["active_skills"]
+        return card
+
+    def test_new_learner_has_an_empty_dashboard(self):
+        response = self.client.get("/api/skills/courses/dashboard-summary/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["active_skills"], [])
+        self.assertEqual(response.data["summary"]["streak_days"], 0)
+        self.assertEqual(len(response.data["weekly_activity"]), 7)
+
+    def test_progress_writes_update_the_card_and_activity(self):
+        self.save_progress([self.sub_map.id])
+        card = self.card()
+        self.assertEqual((card["completed_stages"], card["total_stages"], card["progress_pct"]), (1, 2, 50))
+        self.assertEqual(card["next_stage_title"], "R")
+
+        self.save_progress([self.sub_map.id, self.second_topic.id])
+        data = dashboard_data(self.user)
+        self.assertEqual(data["completed_skills"], 1)
+        self.assertEqual(data["weekly_sessions"], 2)
+        self.assertEqual(data["weekly_activity"][-1]["sessions"], 2)
+        self.assertEqual(data["streak"], 1)
+
+    def test_passed_exam_without_tracking_counts_stages(self):
+        StageProgress.objects.create(user=self.user, roadmap=self.roadmap)
+        rebuild_user_stats(self.user)
+        card = self.card()
+        self.assertEqual((card["completed_stages"], card["total_stages"]), (1, 2))
+        self.assertEqual(card["next_stage_title"], "R2")
+
+    def test_incremental_stats_match_a_rebuild(self):
+        self.save_progress([self.sub_map.id])
+        StageProgress.objects.create(user=self.user, roadmap=self.roadmap)
+        self.save_progress([self.sub_map.id, self.second_topic.id], track_activity=False)
+        incremental = dashboard_data(self.user)
+        UserDashboardStats.objects.filter(user=self.user).delete()
+        UserCourseStats.objects.filter(user=self.user).delete()
+        self.assertEqual(dashboard_data(self.user), incremental)
+
+    def test_reads_take_two_queries_once_stats_exist(self):
+        self.save_progress([self.sub_map.id])
+        with self.assertNumQueries(2):
+            dashboard_data(self.user)
+
+    def test_catalog_edits_refresh_stale_cards(self):
+        self.save_progress([self.sub_map.id])
+        self.assertEqual(self.card()["total_stages"], 2)
+        SubMap.objects.create(roadmap=self.second_stage, title="S3")
+        self.course.refresh_from_db()
+        self.assertEqual(self.card()["total_stages"], 3)
+
+    def test_streak_extends_on_consecutive_days_and_restarts_after_a_gap(self):
+        today = timezone.localdate()
+        rebuild_user_stats(self.user)
+        for day in (today - timedelta(days=3), today - timedelta(days=1), today):
+            increment_activity(self.user, self.course.id, day)
+            record_activity(self.user, day)
+        stats = UserDashboardStats.objects.get(user=self.user)
+        self.assertEqual(stats.streak_days, 2)
+        self.assertEqual(dashboard_data(self.user)["streak"], 2)
+        self.assertEqual(rebuild_user_stats(self.user).streak_days, 2)
+
+    def test_rebuild_command(self):
+        self.save_progress([self.sub_map.id])
+        UserCourseStats.objects.update(completed_stages=0)
+        out = StringIO()
+        call_command("rebuild_dashboard_stats", stdout=out)
+        self.assertIn("1 user(s)", out.getvalue())
+        self.assertEqual(self.card()["completed_stages"], 1)
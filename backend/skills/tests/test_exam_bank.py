@@ -0,0 +1,146 @@
+import importlib
+from datetime import timedelta
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from skills.models import Quiz, QuizQuestion
+from skills.services import exam_bank
+from skills.services.exam_bank import (
+    add_questions,
+    fill_bank,
+    question_fingerprint,
+    request_refill,
+    sample_exam,
+)
+
+from .utils import make_tree
+
+
+def choice(text):
+    return {"type": "multiple_choice", "question_text": text, "options": ["a", "b", "c", "d"], "correct_index": 2}
+
+
+def short(text):
+    return {"type": "short_answer", "question_text": text, "expected_keywords": ["ownership"]}
+
+
+class FakeGenerator:
+    """Each call returns `per_call` new questions, a third of them short answer."""
+
+    def __init__(self, per_call=6):
+        self.per_call = per_call
+        self.calls = 0
+
+    def __call__(self, roadmap):
+        self.calls += 1
+        base = self.calls * 100
+        return [
+            (short if i % 3 == 0 else choice)(f"Question {base + i}?")
+            for i in range(self.per_call)
+        ]
+
+
+class QuestionFingerprintTests(TestCase):
+    def test_case_spacing_and_punctuation_are_ignored(self):
+        self.assertEqual(question_fingerprint("What is  Ownership?"), question_fingerprint("what is ownership"))
+        self.assertNotEqual(question_fingerprint("What is ownership?"), question_fingerprint("What is borrowing?"))
+
+    def test_migration_copy_matches_the_service(self):
+        migration = importlib.import_module("skills.migrations.0021_exam_question_bank")
+        for text in ["What is  Ownership?", "", None, "Explain `Box<T>`"]:
+            self.assertEqual(migration.question_fingerprint(text), question_fingerprint(text))
+
+
+@override_settings(
+    EXAM_BANK_TARGET_SIZE=12,
+    EXAM_BANK_MAX_ROUNDS=5,
+    EXAM_BANK_MIN_SIZE=8,
+    EXAM_QUESTION_COUNT=5,
+    EXAM_SHORT_ANSWER_COUNT=2,
+    EXAM_QUESTION_MAX_SERVES=0,
+    COURSE_JOB_RUNNER="worker",
+    COURSE_JOB_STALE_SECONDS=900,
+)
+class ExamBankTests(TestCase):
+    def setUp(self):
+        *_, self.roadmap, _ = make_tree()
+        self.quiz = Quiz.objects.create(roadmap=self.roadmap)
+
+    def test_duplicates_are_skipped(self):
+        self.assertEqual(add_questions(self.quiz, [choice("What is ownership?"), choice("what is OWNERSHIP")]), 1)
+        self.assertEqual(add_questions(self.quiz, [choice("What is ownership"), short("Explain borrowing.")]), 1)
+        self.assertEqual(
+            list(self.quiz.questions.values_list("order", "question_type")),
+            [(1, "multiple_choice"), (2, "short_answer")],
+        )
+
+    def test_fill_bank_stops_at_the_target(self):
+        generator = FakeGenerator(per_call=5)
+        with mock.patch.object(exam_bank, "generate_exam_for_roadmap", generator):
+            self.assertEqual(fill_bank(self.roadmap), 15)
+        self.assertEqual(generator.calls, 3)
+
+    def test_fill_bank_gives_up_when_only_duplicates_come_back(self):
+        with mock.patch.object(exam_bank, "generate_exam_for_roadmap", return_value=[choice("Same?")]) as generate:
+            self.assertEqual(fill_bank(self.roadmap), 1)
+        self.assertEqual(generate.call_count, 5)
+
+    def test_empty_bank_is_filled_inline_once(self):
+        generator = FakeGenerator(per_call=6)
+        with mock.patch.object(exam_bank, "generate_exam_for_roadmap", generator):
+            exam = sample_exam(self.roadmap)
+        self.assertEqual(generator.calls, 1)
+        self.assertEqual(len(exam), 5)
+        self.assertEqual(sum(q["type"] == "short_answer" for q in exam), 2)
+        # Below EXAM_BANK_MIN_SIZE: a background refill is flagged.
+        self.quiz.refresh_from_db()
+        self.assertIsNotNone(self.quiz.refill_requested_at)
+
+    def test_full_bank_needs_no_llm_call(self):
+        add_questions(self.quiz, FakeGenerator(per_call=12)(self.roadmap))
+        with mock.patch.object(exam_bank, "generate_exam_for_roadmap") as generate:
+            exam = sample_exam(self.roadmap)
+        generate.assert_not_called()
+        self.assertEqual(len({q["question_text"] for q in exam}), 5)
+        self.assertEqual(sum(QuizQuestion.objects.values_list("times_served", flat=True)), 5)
+        self.quiz.refresh_from_db()
+        self.assertIsNone(self.quiz.refill_requested_at)
+
+    def test_short_answers_top_up_a_small_choice_pool(self):
+        add_questions(self.quiz, [choice("Only choice?")] + [short(f"Short {i}?") for i in range(6)])
+        with mock.patch.object(exam_bank, "generate_exam_for_roadmap"):
+            exam = sample_exam(self.roadmap)
+        self.assertEqual([q["type"] for q in exam].count("multiple_choice"), 1)
+        self.assertEqual(len(exam), 5)
+
+    @override_settings(EXAM_QUESTION_MAX_SERVES=1)
+    def test_served_questions_retire(self):
+        add_questions(self.quiz, FakeGenerator(per_call=12)(self.roadmap))
+        with mock.patch.object(exam_bank, "generate_exam_for_roadmap"):
+            first = {q["question_text"] for q in sample_exam(self.roadmap)}
+            second = {q["question_text"] for q in sample_exam(self.roadmap)}
+        self.assertFalse(first & second)
+        self.assertEqual(exam_bank.active_questions(self.quiz).count(), 2)
+
+    def test_refill_is_requested_once_until_stale(self):
+        self.assertTrue(request_refill(self.quiz))
+        self.assertFalse(request_refill(self.quiz))
+        Quiz.objects.filter(pk=self.quiz.pk).update(refill_requested_at=timezone.now() - timedelta(seconds=1000))
+        self.assertTrue(request_refill(self.quiz))
+
+    def test_refill_clears_the_flag_even_on_failure(self):
+        request_refill(self.quiz)
+        with mock.patch.object(exam_bank, "generate_exam_for_roadmap", side_effect=ValueError("boom")), \
+                self.assertLogs("skills.services.exam_bank", "ERROR"):
+            self.assertEqual(exam_bank.refill_bank(self.quiz), 0)
+        self.quiz.refresh_from_db()
+        self.assertIsNone(self.quiz.refill_requested_at)
+
+    @override_settings(COURSE_JOB_RUNNER="process")
+    def test_process_runner_spawns_a_refill_on_commit(self):
+        with mock.patch.object(exam_bank, "_spawn_refill") as spawn, \
+                self.captureOnCommitCallbacks(execute=True):
+            request_refill(self.quiz)
+        spawn.assert_called_once_with(self.roadmap.id)
@@ -0,0 +1,154 @@
+import base64
+from datetime import timedelta
+from unittest import mock
+
+from cryptography.exceptions import InvalidTag
+from django.contrib.auth import get_user_model
+from django.core import signing
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from skills.models import ExamSession, Quiz, StageProgress, SubmittedExamToken
+from skills.services import exam_sessions
+from skills.services.exam_bank import add_questions
+from skills.services.exam_sessions import (
+    close_exam_session,
+    delete_expired_exam_sessions,
+    issue_exam_session,
+    load_exam_session,
+)
+
+from .utils import make_tree
+
+QUESTIONS = [
+    {"type": "multiple_choice", "question_text": "Owner?", "options": ["a", "b", "c"], "correct_index": 1},
+    {"type": "short_answer", "question_text": "Explain borrowing.", "expected_keywords": ["reference", "lifetime"]},
+]
+
+
+@override_settings(EXAM_SESSION_BACKEND="signed", EXAM_SESSION_MAX_AGE_SECONDS=600)
+class SignedExamSessionTests(TestCase):
+    def setUp(self):
+        *_, self.roadmap, _ = make_tree()
+
+    def test_round_trip_without_storing_anything(self):
+        with self.assertNumQueries(0):
+            key = issue_exam_session(self.roadmap, QUESTIONS)
+            self.assertEqual(load_exam_session(self.roadmap.id, key), QUESTIONS)
+        self.assertNotIn("lifetime", key)
+        self.assertNotIn("lifetime", str(signing.loads(key, salt=exam_sessions._SALT)))
+
+    def test_rejects_other_roadmaps_tampering_and_expiry(self):
+        key = issue_exam_session(self.roadmap, QUESTIONS)
+        self.assertIsNone(load_exam_session(self.roadmap.id + 1, key))
+        self.assertIsNone(load_exam_session(self.roadmap.id, key[:-2] + "xx"))
+        self.assertIsNone(load_exam_session(self.roadmap.id, "garbage"))
+        with override_settings(EXAM_SESSION_MAX_AGE_SECONDS=-1):
+            self.assertIsNone(load_exam_session(self.roadmap.id, key))
+
+    def test_ciphertext_is_authenticated(self):
+        blob = exam_sessions._encrypt(QUESTIONS, self.roadmap.id)
+        raw = bytearray(base64.urlsafe_b64decode(blob + "=" * (-len(blob) % 4)))
+        raw[-1] ^= 1
+        tampered = base64.urlsafe_b64encode(bytes(raw)).decode("ascii")
+        with self.assertRaises(InvalidTag):
+            exam_sessions._decrypt(tampered, self.roadmap.id)
+        # The answer key is bound to its roadmap.
+        with self.assertRaises(InvalidTag):
+            exam_sessions._decrypt(blob, self.roadmap.id + 1)
+
+    def test_keys_are_single_use(self):
+        key = issue_exam_session(self.roadmap, QUESTIONS)
+        other = issue_exam_session(self.roadmap, QUESTIONS)
+        self.assertTrue(close_exam_session(key))
+        self.assertFalse(close_exam_session(key))
+        self.assertTrue(close_exam_session(other))
+        self.assertFalse(close_exam_session("garbage"))
+
+    def test_cleanup_drops_expired_token_ids(self):
+        close_exam_session(issue_exam_session(self.roadmap, QUESTIONS))
+        SubmittedExamToken.objects.create(token_id="old", expires_at=timezone.now() - timedelta(seconds=1))
+        delete_expired_exam_sessions()
+        self.assertEqual(SubmittedExamToken.objects.count(), 1)
+
+
+@override_settings(EXAM_SESSION_BACKEND="database", EXAM_SESSION_MAX_AGE_SECONDS=600)
+class DatabaseExamSessionTests(TestCase):
+    def test_round_trip_and_single_use(self):
+        *_, roadmap, _ = make_tree()
+        key = issue_exam_session(roadmap, QUESTIONS)
+        self.assertEqual(load_exam_session(roadmap.id, key), QUESTIONS)
+        self.assertIsNone(load_exam_session(roadmap.id + 1, key))
+        self.assertTrue(close_exam_session(key))
+        self.assertFalse(close_exam_session(key))
+        self.assertIsNone(load_exam_session(roadmap.id, key))
+
+    def test_cleanup_command(self):
+        *_, roadmap, _ = make_tree()
+        issue_exam_session(roadmap, QUESTIONS)
+        ExamSession.objects.update(created_at=timezone.now() - timedelta(seconds=601))
+        call_command("cleanup_exam_sessions", stdout=mock.Mock())
+        self.assertFalse(ExamSession.objects.exists())
+
+
+@override_settings(EXAM_QUESTION_COUNT=2, EXAM_SHORT_ANSWER_COUNT=1, EXAM_BANK_MIN_SIZE=0)
+class ExamSubmitTests(TestCase):
+    def setUp(self):
+        *_, self.roadmap, _ = make_tree()
+        add_questions(Quiz.objects.create(roadmap=self.roadmap), QUESTIONS)
+        self.client = APIClient(HTTP_HOST="localhost")
+        self.url = f"/api/skills/roadmaps/{self.roadmap.id}/exam/"
+
+    def start(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        for question in response.data["questions"]:
+            self.assertNotIn("correct_index", question)
+            self.assertNotIn("expected_keywords", question)
+        return response.data
+
+    def answers(self, exam):
+        return [
+            1 if q["type"] == "multiple_choice" else "a reference with a lifetime"
+            for q in exam["questions"]
+        ]
+
+    def submit(self, exam, answers):
+        return self.client.post(
+            f"{self.url}submit/", {"session_key": exam["session_key"], "answers": answers}, format="json"
+        )
+
+    def assert_replay_rejected(self):
+        exam = self.start()
+        first = self.submit(exam, self.answers(exam))
+        self.assertEqual(first.status_code, 200)
+        self.assertTrue(first.data["passed"])
+        self.assertEqual(first.data["score"], 100)
+        replay = self.submit(exam, [0, ""])
+        self.assertEqual(replay.status_code, 404)
+        self.assertNotIn("review", replay.data)
+
+    @override_settings(EXAM_SESSION_BACKEND="signed")
+    def test_signed_submission_cannot_be_replayed(self):
+        self.assert_replay_rejected()
+
+    @override_settings(EXAM_SESSION_BACKEND="database")
+    def test_database_submission_cannot_be_replayed(self):
+        self.assert_replay_rejected()
+
+    def test_invalid_submission_keeps_the_session(self):
+        exam = self.start()
+        self.assertEqual(self.submit(exam, [1]).status_code, 400)
+        self.assertEqual(self.submit(exam, self.answers(exam)).status_code, 200)
+
+    def test_passing_a_deleted_roadmap_answers_404(self):
+        user = get_user_model().objects.create_user("learner", password="pw")
+        self.client.force_authenticate(user)
+        exam = self.start()
+        self.roadmap.delete()
+        response = self.submit(exam, self.answers(exam))
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(response.data, {"error": "Roadmap not found"})
+        self.assertFalse(StageProgress.objects.exists())
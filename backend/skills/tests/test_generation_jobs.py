@@ -0,0 +1,99 @@
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from skills.models import CourseCard, CourseGenerationJob
+from skills.services import generation_jobs
+from skills.services.generation_jobs import claim_job, enqueue_generation_job, run_generation_job
+
+from .utils import generated_course
+
+AI_GENERATE = "/api/skills/courses/ai-generate/"
+
+
+def fake_generate(skill, preferred_language="English", on_stage=None):
+    on_stage("llm", 0)
+    on_stage("validation", 0)
+    return generated_course(1, 1, 1, 1, title=f"{skill} Mastery Path")
+
+
+def failing_generate(skill, preferred_language="English", on_stage=None):
+    raise ValueError("AI output rejected")
+
+
+class GenerationJobTests(TestCase):
+    def setUp(self):
+        self.client = APIClient(HTTP_HOST="localhost")
+
+    @override_settings(COURSE_JOB_RUNNER="process")
+    def test_async_request_queues_a_job_and_spawns_a_worker_on_commit(self):
+        with mock.patch.object(generation_jobs, "_spawn_worker") as spawn, \
+                self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(AI_GENERATE, {"skill": "Rust", "async": True}, format="json")
+        self.assertEqual(response.status_code, 202)
+        job = CourseGenerationJob.objects.get()
+        self.assertEqual((job.status, job.stage, job.progress), ("queued", "queued", 0))
+        self.assertEqual(response.data["job_id"], str(job.id))
+        self.assertTrue(response.data["status_url"].endswith(f"/ai-generate/jobs/{job.id}/"))
+        spawn.assert_called_once_with(job.id)
+
+    @override_settings(COURSE_JOB_RUNNER="worker")
+    def test_worker_runner_leaves_the_job_for_the_loop(self):
+        with mock.patch.object(generation_jobs, "_spawn_worker") as spawn, \
+                self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(f"{AI_GENERATE}?async=1", {"skill": "Rust"}, format="json")
+        self.assertEqual(response.status_code, 202)
+        spawn.assert_not_called()
+
+    def test_job_status_endpoint(self):
+        job = CourseGenerationJob.objects.create(skill="Rust", status="running", stage="llm", progress=5)
+        response = self.client.get(f"{AI_GENERATE}jobs/{job.id}/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["status"], "running")
+        self.assertEqual(response.data["progress"], 5)
+        missing = self.client.get(f"{AI_GENERATE}jobs/00000000-0000-0000-0000-000000000000/")
+        self.assertEqual(missing.status_code, 404)
+
+    @override_settings(COURSE_JOB_RUNNER="worker")
+    def test_claimed_job_runs_to_completion(self):
+        queued = enqueue_generation_job("Rust", "English")
+        job = claim_job()
+        self.assertEqual((job.pk, job.status), (queued.pk, "running"))
+        self.assertIsNone(claim_job())
+
+        progress = []
+        real_set_stage = generation_jobs._set_stage
+
+        def record(job_id, stage, value, **fields):
+            progress.append((stage, value))
+            real_set_stage(job_id, stage, value, **fields)
+
+        with mock.patch.object(generation_jobs, "generate_skill_course", fake_generate), \
+                mock.patch.object(generation_jobs, "_set_stage", record):
+            job = run_generation_job(job)
+        self.assertEqual((job.status, job.stage, job.progress), ("succeeded", "done", 100))
+        self.assertEqual(job.course.title, "Rust Mastery Path")
+        self.assertEqual([stage for stage, _ in progress], ["llm", "validation", "persistence", "done"])
+        values = [value for _, value in progress]
+        self.assertEqual(values, sorted(values))
+
+    @override_settings(COURSE_JOB_RUNNER="worker")
+    def test_failed_generation_is_recorded(self):
+        enqueue_generation_job("Rust", "English")
+        with mock.patch.object(generation_jobs, "generate_skill_course", failing_generate), \
+                self.assertLogs("skills.services.generation_jobs", "ERROR"):
+            job = run_generation_job(claim_job())
+        self.assertEqual(job.status, "failed")
+        self.assertEqual(job.error, "AI output rejected")
+        self.assertIsNotNone(job.finished_at)
+        self.assertFalse(CourseCard.objects.exists())
+
+    @override_settings(COURSE_JOB_RUNNER="worker")
+    def test_process_generation_jobs_command_runs_one_job(self):
+        job = enqueue_generation_job("Rust", "English")
+        with mock.patch.object(generation_jobs, "generate_skill_course", fake_generate):
+            call_command("process_generation_jobs", job=str(job.id), stdout=mock.Mock())
+        job.refresh_from_db()
+        self.assertEqual(job.status, "succeeded")
@@ -0,0 +1,74 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from skills.models import CourseGenerationJob
+from skills.services import generation_jobs
+from skills.services.generation_jobs import (
+    coalesce_key,
+    enqueue_generation_job,
+    fail_stale_jobs,
+    start_generation_job,
+)
+
+AI_GENERATE = "/api/skills/courses/ai-generate/"
+
+
+@override_settings(COURSE_JOB_RUNNER="worker", COURSE_JOB_STALE_SECONDS=900)
+class JobCoalescingTests(TestCase):
+    def age(self, job, seconds):
+        past = timezone.now() - timedelta(seconds=seconds)
+        CourseGenerationJob.objects.filter(pk=job.pk).update(created_at=past, updated_at=past)
+
+    def test_key_ignores_spelling_and_case(self):
+        self.assertEqual(coalesce_key("JS Mastery", "English"), coalesce_key("javascript", "english"))
+        self.assertNotEqual(coalesce_key("javascript", "English"), coalesce_key("javascript", "Hindi"))
+
+    def test_followers_join_the_inflight_job(self):
+        leader, is_leader = start_generation_job("JavaScript", "English")
+        follower, follower_leads = start_generation_job("JS", "English")
+        queued = enqueue_generation_job("javascript course", "English")
+        self.assertTrue(is_leader)
+        self.assertFalse(follower_leads)
+        self.assertEqual({follower.pk, queued.pk}, {leader.pk})
+        self.assertEqual(CourseGenerationJob.objects.count(), 1)
+
+    def test_finished_job_releases_the_key(self):
+        job, _ = start_generation_job("Rust", "English")
+        generation_jobs.finish_job(job.id, error="boom")
+        second, is_leader = start_generation_job("Rust", "English")
+        self.assertTrue(is_leader)
+        self.assertNotEqual(second.pk, job.pk)
+
+    def test_stale_running_job_is_taken_over(self):
+        job, _ = start_generation_job("Rust", "English")
+        self.age(job, 1000)
+        second, is_leader = start_generation_job("Rust", "English")
+        self.assertTrue(is_leader)
+        job.refresh_from_db()
+        self.assertEqual(job.status, "failed")
+
+    def test_queued_job_never_claimed_is_failed(self):
+        job = enqueue_generation_job("Rust", "English")
+        self.assertEqual(fail_stale_jobs(), 0)
+        self.age(job, 1000)
+        self.assertEqual(fail_stale_jobs(), 1)
+        job.refresh_from_db()
+        self.assertEqual(job.status, "failed")
+        self.assertIsNotNone(job.finished_at)
+
+        replacement = enqueue_generation_job("Rust", "English")
+        self.assertNotEqual(replacement.pk, job.pk)
+        self.assertEqual(replacement.status, "queued")
+
+    @override_settings(COURSE_JOB_COALESCE_WAIT_SECONDS=0)
+    def test_sync_follower_gets_the_inflight_job(self):
+        leader, _ = start_generation_job("Rust", "English")
+        with mock.patch.object(generation_jobs, "generate_skill_course") as generate:
+            response = APIClient(HTTP_HOST="localhost").post(AI_GENERATE, {"skill": "rust"}, format="json")
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.data["job_id"], str(leader.id))
+        generate.assert_not_called()
@@ -0,0 +1,69 @@
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from skills.services.course_writer import save_generated_course
+
+from .utils import generated_course
+
+
+@override_settings(COURSE_RESPONSE_CACHE_SECONDS=0)
+class LanguageFilterTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        # Three resources per topic: one each in English, Bangla and Hindi.
+        cls.course = save_generated_course(generated_course(paths=1, stages=2, topics=2, resources=3))
+        cls.path = cls.course.path_items.get()
+        cls.roadmap = cls.path.roadmaps.order_by("id").first()
+        cls.sub_map = cls.roadmap.sub_maps.order_by("id").first()
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.client = APIClient(HTTP_HOST="localhost")
+
+    def sub_maps(self, url, params):
+        response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200)
+        data = response.data
+        if "path_items" in data:
+            data = data["path_items"][0]
+        if "roadmaps" in data:
+            data = data["roadmaps"][0]
+        return data["sub_maps"] if "sub_maps" in data else [data]
+
+    def test_every_tree_endpoint_filters_resources(self):
+        urls = [
+            f"/api/skills/courses/{self.course.id}/",
+            f"/api/skills/paths/{self.path.id}/",
+            f"/api/skills/roadmaps/{self.roadmap.id}/",
+            f"/api/skills/submaps/{self.sub_map.id}/",
+        ]
+        for url in urls:
+            with self.subTest(url=url):
+                for sub_map in self.sub_maps(url, {"language": "HINDI"}):
+                    self.assertEqual(list(sub_map["resources"]), ["Hindi"])
+                    self.assertEqual(sub_map["resources_count"], 3)
+                sub_map = self.sub_maps(url, {})[0]
+                self.assertEqual(sorted(sub_map["resources"]), ["Bangla", "English", "Hindi"])
+
+    def test_cached_detail_and_tree_list_filter_too(self):
+        with override_settings(COURSE_RESPONSE_CACHE_SECONDS=3600):
+            detail = self.client.get(f"/api/skills/courses/{self.course.id}/", {"language": "bangla"})
+        sub_map = detail.json()["path_items"][0]["roadmaps"][0]["sub_maps"][0]
+        self.assertEqual(list(sub_map["resources"]), ["Bangla"])
+        listed = self.client.get("/api/skills/courses/", {"expand": "tree", "language": "english"}).data
+        sub_map = listed[0]["path_items"][0]["roadmaps"][0]["sub_maps"][0]
+        self.assertEqual(list(sub_map["resources"]), ["English"])
+
+    def test_filter_runs_in_the_database(self):
+        with self.assertNumQueries(5):
+            self.client.get(f"/api/skills/courses/{self.course.id}/", {"language": "hindi"})
+        with self.assertNumQueries(3):
+            self.client.get(f"/api/skills/roadmaps/{self.roadmap.id}/", {"language": "hindi"})
+
+    def test_unknown_language_is_rejected(self):
+        for url in (f"/api/skills/courses/{self.course.id}/", "/api/skills/courses/", "/api/skills/paths/"):
+            response = self.client.get(url, {"language": "klingon"})
+            self.assertEqual(response.status_code, 400)
+            self.assertIn("language", response.data)
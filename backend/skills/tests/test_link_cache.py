@@ -0,0 +1,170 @@
+import hashlib
+from unittest import mock
+
+from django.core.cache import caches
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from skills.models import VideoMetadata
+from skills.services import groq_ai, link_cache
+from skills.services.link_cache import (
+    MISSING,
+    DjangoLinkCache,
+    LocalLRUCache,
+    TieredLinkCache,
+    VideoMetadataCache,
+    build_link_cache,
+    get_link_cache,
+    reset_link_caches,
+)
+
+from .utils import FakeYouTube
+
+VIDEO = "https://www.youtube.com/watch?v=abcdefghijk"
+
+
+class LocalLRUCacheTests(SimpleTestCase):
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = LocalLRUCache("oembed", ttl=60, negative_ttl=10, max_entries=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        self.assertIs(cache.get("b"), MISSING)
+        self.assertEqual((cache.get("a"), cache.get("c")), (1, 3))
+        self.assertEqual(cache.stats()["evictions"], 1)
+
+    def test_negative_entries_expire_first(self):
+        cache = LocalLRUCache("oembed", ttl=60, negative_ttl=10, max_entries=10)
+        with mock.patch.object(link_cache.time, "monotonic", return_value=1000):
+            cache.set("good", {"ok": True})
+            cache.set("bad", {"ok": False})
+        with mock.patch.object(link_cache.time, "monotonic", return_value=1030):
+            self.assertEqual(cache.get("good"), {"ok": True})
+            self.assertIs(cache.get("bad"), MISSING)
+        with mock.patch.object(link_cache.time, "monotonic", return_value=1061):
+            self.assertIs(cache.get("good"), MISSING)
+
+    def test_hit_rate(self):
+        cache = LocalLRUCache("search", ttl=60, negative_ttl=10, max_entries=10)
+        cache.set("a", "x")
+        cache.get("a")
+        cache.get("missing")
+        self.assertEqual(cache.stats()["hit_rate"], 0.5)
+
+
+class DjangoLinkCacheTests(SimpleTestCase):
+    def setUp(self):
+        caches["default"].clear()
+
+    def test_keys_are_hashed(self):
+        cache = DjangoLinkCache("search", ttl=60, negative_ttl=10)
+        key = "python বাংলা full tutorial::0"
+        cache.set(key, "https://www.youtube.com/watch?v=abcdefghijk")
+        self.assertRegex(cache._key(key), r"^linkcache:search:[0-9a-f]{40}$")
+        self.assertEqual(cache.get(key), "https://www.youtube.com/watch?v=abcdefghijk")
+
+    def test_tiered_cache_copies_shared_hits_locally(self):
+        shared = DjangoLinkCache("search", ttl=60, negative_ttl=10)
+        shared.set("k", "v")
+        tiered = TieredLinkCache(LocalLRUCache("search", 60, 10, 10), shared)
+        self.assertEqual(tiered.get("k"), "v")
+        self.assertEqual(tiered.local.get("k"), "v")
+
+
+class VideoMetadataCacheTests(TestCase):
+    def test_results_are_stored_per_video_id(self):
+        cache = VideoMetadataCache("oembed", ttl=60, negative_ttl=10)
+        cache.set(VIDEO, {"ok": True, "title": "rust", "author": "stub"})
+        row = VideoMetadata.objects.get(video_id="abcdefghijk")
+        self.assertTrue(row.embeddable)
+        self.assertEqual(
+            cache.get("https://youtu.be/abcdefghijk"), {"ok": True, "title": "rust", "author": "stub"}
+        )
+
+    def test_expired_rows_are_misses(self):
+        cache = VideoMetadataCache("oembed", ttl=60, negative_ttl=0)
+        cache.set(VIDEO, {"ok": False, "title": "", "author": ""})
+        self.assertIs(cache.get(VIDEO), MISSING)
+
+    def test_database_backend_is_tiered_for_oembed_only(self):
+        config = {"BACKEND": "database"}
+        oembed = build_link_cache("oembed", config)
+        search = build_link_cache("search", config)
+        self.assertIsInstance(oembed.shared, VideoMetadataCache)
+        self.assertIsInstance(search.shared, DjangoLinkCache)
+
+
+@override_settings(LINK_CACHE={"BACKEND": "database"}, YOUTUBE_BASE_URL="https://www.youtube.com")
+class OEmbedCachingTests(TestCase):
+    def setUp(self):
+        reset_link_caches()
+        self.addCleanup(reset_link_caches)
+
+    def check(self, youtube, url=VIDEO):
+        with mock.patch.object(groq_ai, "urlopen", youtube):
+            return groq_ai._is_embeddable_youtube_video(url)
+
+    def test_embeddable_video_is_cached(self):
+        youtube = FakeYouTube()
+        self.assertTrue(self.check(youtube))
+        reset_link_caches()
+        self.assertTrue(self.check(youtube))
+        self.assertEqual(len(youtube.calls), 1)
+
+    def test_not_found_is_negative_cached(self):
+        youtube = FakeYouTube()
+        url = "https://www.youtube.com/watch?v=deadvideo01"
+        self.assertFalse(self.check(youtube, url))
+        self.assertFalse(VideoMetadata.objects.get(video_id="deadvideo01").embeddable)
+        self.assertFalse(self.check(youtube, url))
+        self.assertEqual(len(youtube.calls), 1)
+
+    def test_transient_failures_are_not_cached(self):
+        for status in (None, 429, 503):
+            with self.subTest(status=status):
+                reset_link_caches()
+                self.assertFalse(self.check(FakeYouTube(failures={"abcdefghijk": status})))
+                self.assertFalse(VideoMetadata.objects.exists())
+                self.assertIs(get_link_cache("oembed").get(VIDEO), MISSING)
+
+        # The video recovers on the next check instead of staying blacklisted.
+        self.assertTrue(self.check(FakeYouTube()))
+        self.assertTrue(VideoMetadata.objects.get(video_id="abcdefghijk").embeddable)
+
+
+@override_settings(LINK_CACHE={"BACKEND": "local"}, YOUTUBE_BASE_URL="https://www.youtube.com")
+class SearchCachingTests(SimpleTestCase):
+    def setUp(self):
+        reset_link_caches()
+        self.addCleanup(reset_link_caches)
+        query = f"Rustlang Basics Ownership {groq_ai.LANGUAGE_QUERY_HINTS['English']} full tutorial"
+        # The second result FakeYouTube lists for this search; the first one is dead.
+        self.video_id = hashlib.sha1(query.encode()).hexdigest()[7:18]
+        self.cache_key = f"{query.lower()}::0"
+
+    def search(self, youtube):
+        with mock.patch.object(groq_ai, "urlopen", youtube):
+            return groq_ai._youtube_search_direct_link("Rustlang", "Basics", "Ownership")
+
+    def test_result_is_cached(self):
+        youtube = FakeYouTube()
+        self.assertEqual(self.search(youtube), f"https://www.youtube.com/watch?v={self.video_id}")
+        self.assertEqual(self.search(youtube), f"https://www.youtube.com/watch?v={self.video_id}")
+        self.assertEqual(len(youtube.fetched("/results")), 1)
+
+    def test_no_result_is_negative_cached_when_every_candidate_is_rejected(self):
+        youtube = FakeYouTube(failures={self.video_id: 404})
+        self.assertIsNone(self.search(youtube))
+        self.assertIsNone(get_link_cache("search").get(self.cache_key))
+        self.assertIsNone(self.search(youtube))
+        self.assertEqual(len(youtube.fetched("/results")), 1)
+
+    def test_no_result_is_not_cached_when_a_check_failed(self):
+        for status in (None, 429, 503):
+            with self.subTest(status=status):
+                reset_link_caches()
+                self.assertIsNone(self.search(FakeYouTube(failures={self.video_id: status})))
+                self.assertIs(get_link_cache("search").get(self.cache_key), MISSING)
+
+        # The next search finds the video once it answers again.
+        self.assertEqual(self.search(FakeYouTube()), f"https://www.youtube.com/watch?v={self.video_id}")
@@ -0,0 +1,129 @@
+import threading
+import time
+from collections import Counter
+from unittest import mock
+
+from django.test import SimpleTestCase, override_settings
+
+from skills.services import groq_ai, link_checks
+from skills.services.link_cache import reset_link_caches
+
+from .utils import FakeYouTube, course_payload
+
+
+@override_settings(LINK_CACHE={"BACKEND": "local"}, YOUTUBE_BASE_URL="https://www.youtube.com")
+class ConcurrentLinkValidationTests(SimpleTestCase):
+    def setUp(self):
+        reset_link_caches()
+        self.addCleanup(reset_link_caches)
+
+    def sanitize(self, payload, concurrency):
+        reset_link_caches()
+        youtube = FakeYouTube()
+        with override_settings(LINK_CHECK_CONCURRENCY=concurrency), \
+                mock.patch.object(groq_ai, "urlopen", youtube):
+            result = groq_ai._sanitize_course_payload("Rustlang", payload, "Bangla")
+        return result, youtube
+
+    def test_concurrent_output_matches_sequential(self):
+        payload = course_payload(paths=2, stages=2, topics=3)
+        sequential, _ = self.sanitize(payload, 1)
+        concurrent, _ = self.sanitize(payload, 8)
+        self.assertEqual(concurrent, sequential)
+
+    def test_dead_videos_are_dropped_and_fallbacks_added(self):
+        result, _ = self.sanitize(course_payload(), 8)
+        for path in result["paths"]:
+            for roadmap in path["roadmaps"]:
+                for sub_map in roadmap["sub_maps"]:
+                    links = [r["link"] for r in sub_map["resources"]]
+                    self.assertFalse(any("v=dead" in link for link in links))
+                    languages = {r["language"] for r in sub_map["resources"]}
+                    self.assertEqual(languages, {"English", "Bangla", "Hindi"})
+
+    def test_each_url_is_fetched_once(self):
+        _, youtube = self.sanitize(course_payload(paths=2, stages=2, topics=3), 8)
+        repeated = [url for url, n in Counter(youtube.calls).items() if n > 1]
+        self.assertEqual(repeated, [])
+        shared = [url for url in youtube.fetched("/oembed") if "sharedvideo1" in url]
+        self.assertEqual(len(shared), 1)
+
+    def test_batching_fetches_no_more_than_the_sequential_pass(self):
+        for shape in ({"paths": 1, "stages": 1, "topics": 1}, {"paths": 2, "stages": 2, "topics": 3}):
+            payload = course_payload(**shape)
+            _, sequential = self.sanitize(payload, 1)
+            _, concurrent = self.sanitize(payload, 8)
+            self.assertLessEqual(len(concurrent.calls), len(sequential.calls), shape)
+            self.assertLessEqual(len(concurrent.fetched("/results")), len(sequential.fetched("/results")), shape)
+
+
+class LinkCheckBatchTests(SimpleTestCase):
+    def test_resolve_without_batch_fetches_directly(self):
+        self.assertEqual(link_checks.resolve("k", lambda x: x * 2, 21, default=0), 42)
+
+    def test_lookups_are_deduplicated_across_planning_passes(self):
+        calls = Counter()
+        lock = threading.Lock()
+
+        def fetch(key):
+            with lock:
+                calls[key] += 1
+            return key.upper()
+
+        def validate():
+            return [link_checks.resolve(key, fetch, key, default=None) for key in ["a", "b", "a"]]
+
+        batch = link_checks.LinkCheckBatch(max_workers=4, deadline=5)
+        self.assertEqual(batch.run(validate), ["A", "B", "A"])
+        self.assertEqual(calls, {"a": 1, "b": 1})
+        self.assertEqual(batch.stats["lookups"], 2)
+
+    def test_fallbacks_wait_for_the_lookup_they_depend_on(self):
+        fetched = []
+
+        def fetch(key):
+            fetched.append(key)
+            return key != "primary"
+
+        def validate():
+            found = [
+                link_checks.resolve(key, fetch, key, default=False)
+                or link_checks.resolve(f"{key} fallback", fetch, f"{key} fallback", default=False)
+                for key in link_checks.independently(["primary", "secondary"])
+            ]
+            return found, link_checks.resolve("after", fetch, "after", default=False)
+
+        batch = link_checks.LinkCheckBatch(max_workers=4, deadline=5)
+        self.assertEqual(batch.run(validate), ([True, True], True))
+        # "secondary fallback" is never needed, so it is never fetched.
+        self.assertEqual(sorted(fetched), ["after", "primary", "primary fallback", "secondary"])
+        self.assertEqual(batch.stats["rounds"], 4)
+
+    def test_lookups_past_the_deadline_resolve_to_their_default(self):
+        release = threading.Event()
+        self.addCleanup(release.set)
+
+        def slow(key):
+            release.wait(5)
+            return "late"
+
+        def validate():
+            return link_checks.resolve("slow", slow, "slow", default="default")
+
+        batch = link_checks.LinkCheckBatch(max_workers=2, deadline=0.1)
+        started = time.monotonic()
+        self.assertEqual(batch.run(validate), "default")
+        self.assertLess(time.monotonic() - started, 2)
+        self.assertEqual(batch.stats["timed_out"], 1)
+
+    def test_nested_run_batched_reuses_the_active_batch(self):
+        seen = []
+
+        def inner():
+            seen.append(link_checks._ACTIVE_BATCH.get())
+            return "ok"
+
+        with override_settings(LINK_CHECK_CONCURRENCY=4):
+            link_checks.run_batched(lambda: link_checks.run_batched(inner))
+        self.assertTrue(seen)
+        self.assertTrue(all(batch is seen[0] for batch in seen))
@@ -0,0 +1,116 @@
+import types
+from array import array
+
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from skills.models import SubMap, UserCourseTracking
+from skills.services.course_structure import CourseStructure
+from skills.services.progress_bitmap import (
+    apply_completed_delta,
+    bits_to_ids,
+    completed_count,
+    decode,
+    encode,
+    ids_to_bits,
+    rebase,
+    set_completed_ids,
+    stored_completed_ids,
+)
+
+from .utils import make_tree
+
+
+def structure(sub_map_ids):
+    return CourseStructure(1, 0, {}, array("q"), [], array("q", sub_map_ids))
+
+
+def tracking():
+    return types.SimpleNamespace(completed_sub_map_ids=[], completed_bitmap=None, completed_base=0)
+
+
+class BitmapEncodingTests(SimpleTestCase):
+    def test_round_trip(self):
+        ids = [100, 101, 107, 164]
+        bits = ids_to_bits(ids, 100)
+        self.assertEqual(bits_to_ids(bits, 100), ids)
+        self.assertEqual(decode(encode(bits)), bits)
+        self.assertEqual(len(encode(bits)), 9)
+        self.assertEqual(encode(0), b"")
+        self.assertEqual(decode(None), 0)
+
+    def test_ids_below_the_base_are_dropped(self):
+        self.assertEqual(bits_to_ids(ids_to_bits([5, 10, 12], 10), 10), [10, 12])
+        self.assertEqual(bits_to_ids(rebase(ids_to_bits([10, 12], 10), 10, 11), 11), [12])
+        self.assertEqual(bits_to_ids(rebase(ids_to_bits([10, 12], 10), 10, 8), 8), [10, 12])
+
+
+@override_settings(PROGRESS_ENCODING="bitmap")
+class BitmapStorageTests(SimpleTestCase):
+    def test_dense_ids_are_stored_as_a_bitmap(self):
+        course = structure(range(200, 300))
+        row = tracking()
+        set_completed_ids(row, list(range(200, 260)), course)
+        self.assertEqual(row.completed_sub_map_ids, [])
+        self.assertEqual(row.completed_base, 200)
+        self.assertEqual(len(row.completed_bitmap), 8)
+        self.assertEqual(stored_completed_ids(row.completed_bitmap, row.completed_base, []), list(range(200, 260)))
+        self.assertEqual(completed_count(row.completed_bitmap, row.completed_base, [], course), 60)
+
+    def test_scattered_ids_stay_a_list(self):
+        course = structure([1, 50_000, 90_000])
+        row = tracking()
+        set_completed_ids(row, [1, 90_000], course)
+        self.assertIsNone(row.completed_bitmap)
+        self.assertEqual(row.completed_sub_map_ids, [1, 90_000])
+
+    def test_delta_on_a_bitmap_row(self):
+        course = structure(range(10, 20))
+        row = tracking()
+        set_completed_ids(row, [10, 11, 12], course)
+        apply_completed_delta(row, [15], [11], course)
+        self.assertEqual(stored_completed_ids(row.completed_bitmap, row.completed_base, []), [10, 12, 15])
+
+    def test_removed_sub_maps_are_not_counted(self):
+        row = tracking()
+        set_completed_ids(row, [10, 11, 12], structure(range(10, 20)))
+        # Sub-map 11 was deleted and the course gained 20.
+        edited = structure([10, 12, 13, 20])
+        self.assertEqual(completed_count(row.completed_bitmap, row.completed_base, [], edited), 2)
+        apply_completed_delta(row, [20], [], edited)
+        self.assertEqual(stored_completed_ids(row.completed_bitmap, row.completed_base, []), [10, 12, 20])
+
+    def test_list_rows_are_converted_on_their_next_write(self):
+        course = structure(range(10, 20))
+        row = tracking()
+        row.completed_sub_map_ids = [10, 11]
+        self.assertEqual(completed_count(None, 0, row.completed_sub_map_ids, course), 2)
+        apply_completed_delta(row, [12], [], course)
+        self.assertIsNotNone(row.completed_bitmap)
+        self.assertEqual(stored_completed_ids(row.completed_bitmap, row.completed_base, []), [10, 11, 12])
+
+    @override_settings(PROGRESS_ENCODING="list")
+    def test_bitmap_rows_are_converted_back_to_lists(self):
+        course = structure(range(10, 20))
+        row = tracking()
+        with override_settings(PROGRESS_ENCODING="bitmap"):
+            set_completed_ids(row, [10, 11], course)
+        apply_completed_delta(row, [12], [10], course)
+        self.assertIsNone(row.completed_bitmap)
+        self.assertEqual(row.completed_sub_map_ids, [11, 12])
+
+
+@override_settings(PROGRESS_ENCODING="bitmap")
+class BitmapTrackingRowTests(TestCase):
+    def test_bitmap_survives_a_save(self):
+        user = get_user_model().objects.create_user("learner", password="pw")
+        course, _, roadmap, sub_map = make_tree()
+        second = SubMap.objects.create(roadmap=roadmap, title="S2")
+        row = UserCourseTracking.objects.create(user=user, course=course)
+        set_completed_ids(row, [sub_map.id, second.id], structure([sub_map.id, second.id]))
+        row.save()
+        row.refresh_from_db()
+        self.assertEqual(
+            stored_completed_ids(row.completed_bitmap, row.completed_base, row.completed_sub_map_ids),
+            [sub_map.id, second.id],
+        )
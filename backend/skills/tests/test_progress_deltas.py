@@ -0,0 +1,64 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from skills.models import SubMap, UserCourseTracking
+
+from .utils import make_tree
+
+
+class ProgressDeltaTests(TestCase):
+    def setUp(self):
+        # Cached course structures are keyed by id, and ids are reused between tests.
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.user = get_user_model().objects.create_user("learner", password="pw")
+        self.course, self.path, roadmap, first = make_tree()
+        self.ids = [first.id] + [SubMap.objects.create(roadmap=roadmap, title=f"S{i}").id for i in range(3)]
+        *_, other_topic = make_tree()
+        self.foreign_id = other_topic.id
+        self.client = APIClient(HTTP_HOST="localhost")
+        self.client.force_authenticate(self.user)
+        self.url = f"/api/skills/courses/{self.course.id}/user-progress/"
+
+    def post(self, **data):
+        response = self.client.post(self.url, data, format="json")
+        self.assertEqual(response.status_code, 200)
+        return response.data["completed_sub_map_ids"]
+
+    def check_deltas(self):
+        a, b, c, d = self.ids
+        self.assertEqual(self.post(add=[b, a]), [a, b])
+        self.assertEqual(self.post(add=[c, str(d), "x", self.foreign_id]), [a, b, c, d])
+        self.assertEqual(self.post(remove=[b, 999999]), [a, c, d])
+        self.assertEqual(self.post(add=[b], remove=[a, d]), [b, c])
+        # Replacing the whole set still works, and deltas apply after it.
+        self.assertEqual(self.post(completed_sub_map_ids=[d], add=[a]), [a, d])
+        self.assertEqual(self.client.get(self.url).data["completed_sub_map_ids"], [a, d])
+
+    def test_deltas_on_a_list_row(self):
+        self.check_deltas()
+        tracking = UserCourseTracking.objects.get(user=self.user, course=self.course)
+        self.assertIsNone(tracking.completed_bitmap)
+
+    @override_settings(PROGRESS_ENCODING="bitmap")
+    def test_deltas_on_a_bitmap_row(self):
+        self.check_deltas()
+        tracking = UserCourseTracking.objects.get(user=self.user, course=self.course)
+        self.assertIsNotNone(tracking.completed_bitmap)
+        self.assertEqual(tracking.completed_sub_map_ids, [])
+
+    def test_other_fields_leave_progress_alone(self):
+        self.post(add=self.ids[:2])
+        response = self.client.post(
+            self.url, {"selected_path_id": self.path.id, "selected_language": "hindi"}, format="json"
+        )
+        self.assertEqual(response.data["completed_sub_map_ids"], self.ids[:2])
+        self.assertEqual(response.data["selected_path_id"], self.path.id)
+        self.assertEqual(response.data["selected_language"], "hindi")
+
+    def test_requires_authentication(self):
+        response = APIClient(HTTP_HOST="localhost").post(self.url, {"add": self.ids}, format="json")
+        self.assertEqual(response.status_code, 401)
+        self.assertFalse(UserCourseTracking.objects.exists())
@@ -0,0 +1,148 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from skills.models import Quiz, StageProgress, UserCourseTracking
+from skills.services.exam_bank import add_questions
+from skills.testing import QueryBudgetMixin, check_query_budget
+
+from .utils import make_tree
+
+QUESTIONS = [
+    {"type": "multiple_choice", "question_text": f"Q{i}?", "options": ["a", "b", "c"], "correct_index": 1}
+    for i in range(8)
+] + [
+    {"type": "short_answer", "question_text": f"Explain {i}.", "expected_keywords": ["borrow"]}
+    for i in range(2)
+]
+
+
+class QueryBudgetTests(QueryBudgetMixin, TestCase):
+    """Declared budgets hold on the most expensive path, JWT user lookup included."""
+
+    def setUp(self):
+        # Cold course structures: the worst case for every progress write.
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.user = get_user_model().objects.create_user("learner", password="pw")
+        self.client = APIClient(HTTP_HOST="localhost")
+        token = RefreshToken.for_user(self.user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        self.course, self.path, self.roadmap, self.sub_map = make_tree()
+
+    def track_other_courses(self, count):
+        for _ in range(count):
+            course, _, roadmap, _ = make_tree()
+            UserCourseTracking.objects.create(user=self.user, course=course)
+            StageProgress.objects.create(user=self.user, roadmap=roadmap)
+
+    def post_progress(self, **data):
+        return self.assertWithinQueryBudget(
+            "post",
+            f"/api/skills/courses/{self.course.id}/user-progress/",
+            {"selected_path_id": self.path.id, "track_activity": True, **data},
+            format="json",
+        )
+
+    def test_first_progress_write_backfills_within_budget(self):
+        self.track_other_courses(5)
+        response = self.post_progress(completed_sub_map_ids=[self.sub_map.id])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.user.course_stats.count(), 6)
+
+    def test_backfill_cost_does_not_grow_with_courses(self):
+        self.track_other_courses(1)
+        few = self.post_progress(add=[self.sub_map.id]).sql_stats.count
+
+        other = get_user_model().objects.create_user("busy", password="pw")
+        self.user = other
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {RefreshToken.for_user(other).access_token}")
+        cache.clear()
+        self.track_other_courses(6)
+        many = self.post_progress(add=[self.sub_map.id]).sql_stats.count
+        self.assertEqual(many, few)
+
+    def test_progress_writes_and_reads_within_budget(self):
+        self.post_progress(add=[self.sub_map.id])
+        cache.clear()
+        # Once the stats exist, a write costs well under the backfill budget.
+        self.assertWithinQueryBudget(
+            "post",
+            f"/api/skills/courses/{self.course.id}/user-progress/",
+            {
+                "selected_path_id": self.path.id,
+                "add": [self.sub_map.id],
+                "remove": [self.sub_map.id + 1000],
+                "track_activity": True,
+            },
+            budget=18,
+            format="json",
+        )
+        self.assertWithinQueryBudget("get", f"/api/skills/courses/{self.course.id}/user-progress/")
+        self.assertWithinQueryBudget("get", "/api/skills/courses/dashboard-summary/", budget=3)
+        self.assertWithinQueryBudget("get", "/api/skills/courses/activity-heatmap/")
+
+    def test_first_dashboard_visit_backfills_within_budget(self):
+        self.track_other_courses(5)
+        response = self.assertWithinQueryBudget("get", "/api/skills/courses/dashboard-summary/")
+        self.assertEqual(len(response.data["active_skills"]), 5)
+
+    def submit_passing_exam(self, budget=None):
+        quiz = Quiz.objects.create(roadmap=self.roadmap)
+        add_questions(quiz, QUESTIONS)
+        exam = self.assertWithinQueryBudget("get", f"/api/skills/roadmaps/{self.roadmap.id}/exam/").json()
+        answers = [1 if q["type"] == "multiple_choice" else "borrow" for q in exam["questions"]]
+        cache.clear()
+        response = self.assertWithinQueryBudget(
+            "post",
+            f"/api/skills/roadmaps/{self.roadmap.id}/exam/submit/",
+            {"session_key": exam["session_key"], "answers": answers},
+            budget=budget,
+            format="json",
+        )
+        self.assertTrue(response.json()["passed"])
+        self.assertTrue(StageProgress.objects.filter(user=self.user, roadmap=self.roadmap).exists())
+        return response
+
+    @override_settings(EXAM_SESSION_BACKEND="signed")
+    def test_first_passing_signed_exam_within_budget(self):
+        self.track_other_courses(3)
+        self.submit_passing_exam()
+
+    @override_settings(EXAM_SESSION_BACKEND="database")
+    def test_first_passing_stored_exam_within_budget(self):
+        self.track_other_courses(3)
+        self.submit_passing_exam()
+
+    @override_settings(EXAM_SESSION_BACKEND="signed")
+    def test_passing_exam_with_existing_stats_within_budget(self):
+        self.post_progress(add=[self.sub_map.id])
+        self.submit_passing_exam(budget=20)
+
+    def test_catalog_within_budget(self):
+        self.assertWithinQueryBudget("get", "/api/skills/courses/")
+        with override_settings(COURSE_RESPONSE_CACHE_SECONDS=0):
+            self.assertWithinQueryBudget("get", f"/api/skills/courses/{self.course.id}/")
+
+
+class CheckQueryBudgetTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.course, *_ = make_tree()
+        self.client = APIClient(HTTP_HOST="localhost")
+
+    def test_over_budget_lists_the_queries(self):
+        with override_settings(SQL_INSTRUMENTATION=True, COURSE_RESPONSE_CACHE_SECONDS=0):
+            response = self.client.get(f"/api/skills/courses/{self.course.id}/")
+        check_query_budget(response)
+        with self.assertRaisesMessage(AssertionError, "CourseViewSet.retrieve exceeded its query budget of 0"):
+            check_query_budget(response, 0)
+
+    def test_requires_instrumentation(self):
+        with override_settings(SQL_INSTRUMENTATION=False):
+            response = self.client.get("/api/skills/courses/")
+        with self.assertRaisesMessage(AssertionError, "SQL_INSTRUMENTATION"):
+            check_query_budget(response)
@@ -0,0 +1,69 @@
+import datetime
+import decimal
+import math
+import random
+import uuid
+from unittest import mock, skipIf
+
+from django.test import SimpleTestCase
+from django.utils import timezone
+from django.utils.translation import gettext_lazy
+from rest_framework.renderers import JSONRenderer
+
+from skills import renderers
+from skills.renderers import FastJSONRenderer
+
+
+@skipIf(renderers.orjson is None, "orjson is not installed")
+class FastJSONRendererTests(SimpleTestCase):
+    def assertSameBytes(self, data):
+        self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def test_course_like_payload(self):
+        self.assertSameBytes({
+            "id": 1,
+            "title": "Rust — systems programming ✓     \"quoted\" \\ </script>",
+            "rating": 4.7,
+            "tags": ["rust", None, True, False],
+            "created_at": timezone.now(),
+            "day": datetime.date(2026, 10, 17),
+            "time": datetime.time(12, 30, 1, 5),
+            "duration": datetime.timedelta(hours=2),
+            "price": decimal.Decimal("19.90"),
+            "job_id": uuid.UUID("5e3b0000-0000-4000-8000-000000000001"),
+            "label": gettext_lazy("Beginner"),
+            "nested": {"paths": [{"roadmaps": [{"sub_maps": []}]}], 3: "int key"},
+            "big": 2 ** 70,
+            "empty": {},
+        })
+
+    def test_floats_match_repr(self):
+        values = [
+            0.0, -0.0, 0.1, 4.7, 1e-4, 1.2e-4, 9.99e-5, 1e-5, 1.5e-7, 5e-324,
+            1e15, 1e16, 1.5e16, 2.0 ** 60, 1e22, 1.7976931348623157e308,
+        ]
+        rng = random.Random(7)
+        values += [rng.uniform(-1, 1) * 10 ** rng.randint(-12, 20) for _ in range(500)]
+        for value in values:
+            with self.subTest(value=value):
+                self.assertSameBytes({"x": [value]})
+        self.assertSameBytes(1e-5)
+        self.assertSameBytes(values)
+
+    def test_float_lookalike_strings_still_render(self):
+        self.assertSameBytes({"t": "a,1e5,b", "u": "x:0.00001"})
+
+    def test_non_finite_floats_become_null(self):
+        self.assertEqual(FastJSONRenderer().render({"x": math.nan, "y": math.inf}), b'{"x":null,"y":null}')
+        with self.assertRaises(ValueError):
+            JSONRenderer().render({"x": math.nan})
+
+    def test_indented_requests_use_the_stdlib(self):
+        data = {"a": [1, 2]}
+        accepted = "application/json; indent=2"
+        self.assertEqual(FastJSONRenderer().render(data, accepted), JSONRenderer().render(data, accepted))
+
+    def test_without_orjson(self):
+        data = {"rating": 1e16, "day": datetime.date(2026, 1, 1)}
+        with mock.patch.object(renderers, "orjson", None):
+            self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
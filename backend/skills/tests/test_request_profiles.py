@@ -0,0 +1,155 @@
+import marshal
+import pstats
+import tempfile
+from pathlib import Path as FilePath
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Permission
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from skills.models import RequestProfile
+from skills.services.request_profiles import claim_profile_slot
+
+from .utils import make_tree
+
+
+def bearer(user):
+    return f"Bearer {RefreshToken.for_user(user).access_token}"
+
+
+@override_settings(REQUEST_PROFILING=True, REQUEST_PROFILE_MAX_PER_HOUR=20, REQUEST_PROFILE_KEEP=200)
+class RequestProfilerMiddlewareTests(TestCase):
+    def setUp(self):
+        # Profiling slots are counted in the cache.
+        cache.clear()
+        self.addCleanup(cache.clear)
+        User = get_user_model()
+        self.staff = User.objects.create_user("staff", password="pw", is_staff=True)
+        self.learner = User.objects.create_user("learner", password="pw")
+        self.course, *_ = make_tree()
+        self.client = APIClient(HTTP_HOST="localhost")
+        self.url = "/api/skills/courses/"
+
+    def get(self, user=None, **extra):
+        if user is not None:
+            extra.setdefault("HTTP_AUTHORIZATION", bearer(user))
+        return self.client.get(self.url, **extra)
+
+    def test_staff_cpu_profile_is_stored(self):
+        response = self.get(self.staff, HTTP_X_PROFILE="1")
+        self.assertEqual(response.status_code, 200)
+        profile = RequestProfile.objects.get(pk=response["X-Profile-Id"])
+        self.assertEqual(profile.user, self.staff)
+        self.assertEqual((profile.method, profile.path, profile.status_code), ("GET", self.url, 200))
+        self.assertEqual(profile.view, "courses-list")
+        self.assertGreater(profile.duration_ms, 0)
+        self.assertIn("cumulative", profile.summary)
+        self.assertEqual(profile.memory_summary, "")
+        self.assertIsNone(profile.memory_peak_kib)
+
+    def test_profile_data_is_a_pstats_file(self):
+        response = self.get(self.staff, HTTP_X_PROFILE="cpu")
+        profile = RequestProfile.objects.get(pk=response["X-Profile-Id"])
+        self.assertIsInstance(marshal.loads(bytes(profile.profile_data)), dict)
+        with tempfile.TemporaryDirectory() as directory:
+            path = FilePath(directory, "request.prof")
+            path.write_bytes(bytes(profile.profile_data))
+            self.assertGreater(pstats.Stats(str(path)).total_calls, 0)
+
+    def test_memory_profile_via_query_parameter(self):
+        response = self.client.get(f"{self.url}?profile=memory", HTTP_AUTHORIZATION=bearer(self.staff))
+        profile = RequestProfile.objects.get(pk=response["X-Profile-Id"])
+        self.assertEqual(profile.path, f"{self.url}?profile=memory")
+        self.assertNotEqual(profile.memory_summary, "")
+        self.assertGreater(profile.memory_peak_kib, 0)
+
+    def test_session_staff_user_is_profiled(self):
+        self.client.force_login(self.staff)
+        response = self.get(HTTP_X_PROFILE="1")
+        self.assertIn("X-Profile-Id", response)
+
+    def test_flag_is_ignored_for_everyone_else(self):
+        for response in (
+            self.get(HTTP_X_PROFILE="1"),
+            self.get(self.learner, HTTP_X_PROFILE="1"),
+            self.get(HTTP_X_PROFILE="1", HTTP_AUTHORIZATION="Bearer not-a-token"),
+            self.get(self.staff, HTTP_X_PROFILE="no"),
+            self.get(self.staff),
+        ):
+            self.assertNotIn("X-Profile-Id", response)
+        self.assertFalse(RequestProfile.objects.exists())
+
+    def test_off_unless_enabled(self):
+        with override_settings(REQUEST_PROFILING=False):
+            response = self.get(self.staff, HTTP_X_PROFILE="1")
+        self.assertNotIn("X-Profile-Id", response)
+
+    @override_settings(REQUEST_PROFILE_MAX_PER_HOUR=2)
+    def test_profiles_per_hour_are_limited(self):
+        profiled = ["X-Profile-Id" in self.get(self.staff, HTTP_X_PROFILE="1") for _ in range(3)]
+        self.assertEqual(profiled, [True, True, False])
+        self.assertEqual(RequestProfile.objects.count(), 2)
+
+    @override_settings(REQUEST_PROFILE_KEEP=2)
+    def test_only_the_newest_profiles_are_kept(self):
+        ids = [int(self.get(self.staff, HTTP_X_PROFILE="1")["X-Profile-Id"]) for _ in range(3)]
+        self.assertEqual(sorted(RequestProfile.objects.values_list("id", flat=True)), ids[1:])
+
+
+class ProfileSlotTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+    @override_settings(REQUEST_PROFILE_MAX_PER_HOUR=3)
+    def test_slots_run_out(self):
+        self.assertEqual([claim_profile_slot() for _ in range(4)], [True, True, True, False])
+
+    @override_settings(REQUEST_PROFILE_MAX_PER_HOUR=0)
+    def test_zero_disables_profiling(self):
+        self.assertFalse(claim_profile_slot())
+
+
+@override_settings(REQUEST_PROFILING=True)
+class RequestProfileAdminTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        User = get_user_model()
+        self.admin = User.objects.create_superuser("admin", "admin@example.com", "pw")
+        response = APIClient(HTTP_HOST="localhost").get(
+            "/api/skills/courses/", HTTP_X_PROFILE="1", HTTP_AUTHORIZATION=bearer(self.admin)
+        )
+        self.profile = RequestProfile.objects.get(pk=response["X-Profile-Id"])
+        self.url = reverse("admin:skills_requestprofile_download", args=[self.profile.pk])
+
+    def test_download_returns_the_raw_profile(self):
+        self.client.force_login(self.admin)
+        response = self.client.get(self.url, HTTP_HOST="localhost")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content, bytes(self.profile.profile_data))
+        self.assertEqual(
+            response["Content-Disposition"],
+            f'attachment; filename="request-profile-{self.profile.pk}.prof"',
+        )
+
+    def test_changelist_links_the_download(self):
+        self.client.force_login(self.admin)
+        response = self.client.get(reverse("admin:skills_requestprofile_changelist"), HTTP_HOST="localhost")
+        self.assertContains(response, self.url)
+
+    def test_download_needs_view_permission(self):
+        staff = get_user_model().objects.create_user("staff", password="pw", is_staff=True)
+        self.client.force_login(staff)
+        self.assertEqual(self.client.get(self.url, HTTP_HOST="localhost").status_code, 403)
+        staff.user_permissions.add(Permission.objects.get(codename="view_requestprofile"))
+        self.assertEqual(self.client.get(self.url, HTTP_HOST="localhost").status_code, 200)
+
+    def test_anonymous_users_are_sent_to_login(self):
+        response = self.client.get(self.url, HTTP_HOST="localhost")
+        self.assertEqual(response.status_code, 302)
+        self.assertIn(reverse("admin:login"), response["Location"])
@@ -0,0 +1,89 @@
+import importlib
+import importlib.util
+from unittest import skipUnless
+
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from skills.models import CourseCard, SkillAlias
+from skills.services import skill_index
+from skills.services.skill_index import find_courses_for_skill, normalize_skill_key, register_skill_aliases
+
+
+class NormalizeSkillKeyTests(TestCase):
+    def test_spelling_variants_share_a_key(self):
+        self.assertEqual(normalize_skill_key("JS Mastery Path"), "javascript")
+        self.assertEqual(normalize_skill_key("Node.js"), normalize_skill_key("nodejs"))
+        self.assertEqual(normalize_skill_key("C++ for beginners"), "cpp")
+        self.assertEqual(normalize_skill_key("Machine Learning"), normalize_skill_key("ML"))
+
+    def test_key_is_order_insensitive(self):
+        self.assertEqual(normalize_skill_key("Data Structures"), normalize_skill_key("structures data"))
+
+    def test_stop_words_only_fall_back_to_plain_words(self):
+        self.assertEqual(normalize_skill_key("Programming"), "programming")
+        self.assertEqual(normalize_skill_key(""), "")
+
+    def test_migration_copy_matches_the_service(self):
+        migration = importlib.import_module("skills.migrations.0019_skillalias")
+        for text in ["JS Mastery Path", "Node.js", "C# and .NET", "Python3 course", "Programming"]:
+            self.assertEqual(migration.normalize_skill_key(text), normalize_skill_key(text))
+
+
+@override_settings(SKILL_MATCH_THRESHOLD=0.6)
+class FindCoursesForSkillTests(TestCase):
+    def setUp(self):
+        self.course = CourseCard.objects.create(title="Rust Systems Programming", category="programming")
+        register_skill_aliases(self.course, "Rust Systems")
+
+    def test_exact_alias_lookup(self):
+        self.assertEqual(find_courses_for_skill("systems rust"), [self.course])
+        self.assertEqual(find_courses_for_skill("Python"), [])
+
+    def test_fuzzy_match_is_registered_as_an_alias(self):
+        key = normalize_skill_key("Rust systems io")
+        self.assertFalse(SkillAlias.objects.filter(key=key).exists())
+        # Two of three tokens shared: 2/3 >= 0.6.
+        self.assertEqual(find_courses_for_skill("Rust systems io"), [self.course])
+        self.assertTrue(SkillAlias.objects.filter(key=key, course=self.course).exists())
+
+    def test_weak_overlap_does_not_match(self):
+        self.assertEqual(find_courses_for_skill("Rust web servers"), [])
+
+    def test_register_is_idempotent(self):
+        register_skill_aliases(self.course, "Rust Systems", "rust systems", "systems RUST")
+        self.assertEqual(SkillAlias.objects.filter(course=self.course, key="rust systems").count(), 1)
+
+
+@skipUnless(connection.vendor == "postgresql", "pg_trgm is PostgreSQL only")
+class TrigramMatchTests(TestCase):
+    def test_prefilter_uses_the_threshold(self):
+        course = CourseCard.objects.create(title="Kubernetes", category="programming")
+        register_skill_aliases(course, "Kubernetes")
+        self.assertEqual(skill_index._trigram_match("kubernetis", 0.4), "kubernetes")
+        self.assertIsNone(skill_index._trigram_match("kubernetis", 0.95))
+
+
+class TrigramQueryTests(SimpleTestCase):
+    """The PostgreSQL query is built without a PostgreSQL server (or django.contrib.postgres)."""
+
+    def test_query_builds_without_contrib_postgres(self):
+        queryset = skill_index._trigram_candidates("kubernetis")
+        self.assertEqual(queryset.query.order_by, ("-similarity",))
+
+    @skipUnless(
+        importlib.util.find_spec("psycopg") or importlib.util.find_spec("psycopg2"),
+        "needs a PostgreSQL driver",
+    )
+    def test_query_compiles_for_postgresql(self):
+        from django.db.backends.postgresql.base import DatabaseWrapper
+
+        postgres = DatabaseWrapper(
+            {**connection.settings_dict, "ENGINE": "django.db.backends.postgresql", "NAME": "skills"},
+            alias="postgres",
+        )
+        queryset = skill_index._trigram_candidates("kubernetis")
+        sql, params = queryset.query.get_compiler(connection=postgres).as_sql()
+        self.assertIn('"skills_skillalias"."key" %% %s', sql)
+        self.assertIn("SIMILARITY(", sql.upper())
+        self.assertIn("kubernetis", params)
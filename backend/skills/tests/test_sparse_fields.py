@@ -0,0 +1,65 @@
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from skills.services.course_writer import save_generated_course
+
+from .utils import generated_course
+
+
+@override_settings(COURSE_RESPONSE_CACHE_SECONDS=0)
+class SparseFieldsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.course = save_generated_course(generated_course(paths=2, stages=2, topics=2, resources=2))
+        cls.path = cls.course.path_items.order_by("id").first()
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.client = APIClient(HTTP_HOST="localhost")
+
+    def get(self, url, **params):
+        response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_fields_are_kept_at_every_level(self):
+        data = self.get(f"/api/skills/courses/{self.course.id}/", fields="id,title,path_items,roadmaps")
+        self.assertEqual(set(data), {"id", "title", "path_items"})
+        self.assertEqual(set(data["path_items"][0]), {"id", "title", "roadmaps"})
+        self.assertEqual(set(data["path_items"][0]["roadmaps"][0]), {"id", "title"})
+
+    def test_depth_limits_nesting(self):
+        url = f"/api/skills/courses/{self.course.id}/"
+        self.assertNotIn("path_items", self.get(url, depth=0))
+        roadmap = self.get(url, depth=2)["path_items"][0]["roadmaps"][0]
+        self.assertNotIn("sub_maps", roadmap)
+        self.assertEqual(roadmap["sub_map_count"], 2)
+        path = self.get(f"/api/skills/paths/{self.path.id}/", depth=1)
+        self.assertNotIn("sub_maps", path["roadmaps"][0])
+
+    def test_shallow_requests_issue_shallow_queries(self):
+        url = f"/api/skills/courses/{self.course.id}/"
+        with self.assertNumQueries(1):
+            self.get(url, depth=0)
+        with self.assertNumQueries(2):
+            self.get(url, fields="id,title,path_items")
+        with self.assertNumQueries(5):
+            self.get(url)
+        with self.assertNumQueries(1):
+            self.get("/api/skills/paths/", depth=0)
+
+    def test_bad_depth_is_rejected(self):
+        for depth in ("-1", "deep"):
+            response = self.client.get(f"/api/skills/courses/{self.course.id}/", {"depth": depth})
+            self.assertEqual(response.status_code, 400)
+            self.assertIn("depth", response.data)
+
+    def test_writes_ignore_sparse_parameters(self):
+        response = self.client.patch(
+            f"/api/skills/paths/{self.path.id}/?fields=id&depth=0", {"title": "Renamed"}, format="json"
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["title"], "Renamed")
+        self.assertIn("roadmaps", response.data)
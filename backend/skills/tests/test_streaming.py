@@ -0,0 +1,133 @@
+import json
+import types
+from unittest import mock
+
+from django.test import SimpleTestCase, TestCase, override_settings
+from rest_framework.test import APIClient
+
+from skills.models import Path
+from skills.services import groq_ai
+from skills.services.incremental_json import WILDCARD, IncrementalJSONParser
+from skills.services.link_cache import reset_link_caches
+
+from .utils import FakeYouTube, course_payload
+
+STAGES = ("paths", WILDCARD, "roadmaps", WILDCARD)
+
+
+class IncrementalJSONParserTests(SimpleTestCase):
+    def test_values_are_emitted_as_they_close(self):
+        document = json.dumps(course_payload(paths=2, stages=2, topics=1))
+        parser = IncrementalJSONParser([STAGES])
+        emitted = []
+        for char in "Sure! " + document:
+            emitted.extend(parser.feed(char))
+        self.assertEqual([path for path, _ in emitted], [
+            ("paths", 0, "roadmaps", 0), ("paths", 0, "roadmaps", 1),
+            ("paths", 1, "roadmaps", 0), ("paths", 1, "roadmaps", 1),
+        ])
+        self.assertTrue(parser.done)
+        self.assertEqual(parser.result(), json.loads(document))
+
+    def test_strings_containing_brackets(self):
+        parser = IncrementalJSONParser([("a", WILDCARD)])
+        emitted = parser.feed('{"a": [{"t": "x}]"}, {"t": "y\\"{"}]}')
+        self.assertEqual([value for _, value in emitted], [{"t": "x}]"}, {"t": 'y"{'}])
+
+    def test_structural_errors_raise_immediately(self):
+        parser = IncrementalJSONParser([STAGES])
+        with self.assertRaises(ValueError):
+            parser.feed('{"paths": [}')
+
+
+def _chunks(text, size=40):
+    for i in range(0, len(text), size):
+        yield types.SimpleNamespace(
+            choices=[types.SimpleNamespace(delta=types.SimpleNamespace(content=text[i:i + size]))]
+        )
+
+
+class _Stream:
+    def __init__(self, text):
+        self._chunks = _chunks(text)
+        self.closed = False
+
+    def __iter__(self):
+        return self._chunks
+
+    def close(self):
+        self.closed = True
+
+
+def _two_level_payload():
+    payload = course_payload(paths=2, stages=1, topics=1)
+    payload["paths"][0].update(title="Advanced path", level="advanced")
+    payload["paths"][1].update(title="Beginner path", level="beginner")
+    return payload
+
+
+@override_settings(LINK_CACHE={"BACKEND": "local"}, YOUTUBE_BASE_URL="https://www.youtube.com")
+class StreamSkillCourseTests(TestCase):
+    def setUp(self):
+        reset_link_caches()
+        self.addCleanup(reset_link_caches)
+
+    def run_stream(self, *texts):
+        streams = [_Stream(text) for text in texts]
+        with mock.patch.object(groq_ai.client.chat.completions, "create", side_effect=streams), \
+                mock.patch.object(groq_ai, "urlopen", FakeYouTube()):
+            events = []
+            generator = groq_ai.stream_skill_course("Rustlang")
+            while True:
+                try:
+                    events.append(next(generator))
+                except StopIteration as stop:
+                    return events, stop.value, streams
+
+    def test_events_and_final_payload(self):
+        payload = _two_level_payload()
+        events, result, _ = self.run_stream(json.dumps(payload))
+        names = [name for name, _ in events]
+        self.assertEqual(names, ["course", "stage", "path", "stage", "path", "path_order"])
+        stages = [data for name, data in events if name == "stage"]
+        self.assertEqual([s["path_index"] for s in stages], [0, 1])
+        # The beginner path (streamed second) is saved first.
+        self.assertEqual(events[-1][1], {"path_indexes": [1, 0]})
+        self.assertEqual([p["title"] for p in result["paths"]], ["Beginner path", "Advanced path"])
+        self.assertEqual(result, groq_ai._sanitize_course_payload("Rustlang", payload, "English"))
+
+    def test_stage_without_topics_aborts_the_attempt(self):
+        broken = course_payload(paths=1, stages=2, topics=1)
+        broken["paths"][0]["roadmaps"][0]["sub_maps"] = []
+        events, result, streams = self.run_stream(json.dumps(broken), json.dumps(_two_level_payload()))
+        names = [name for name, _ in events]
+        # The broken first stage aborts before path 1 is streamed.
+        self.assertEqual(names[:2], ["course", "retry"])
+        self.assertIn("has no topics", events[1][1]["reason"])
+        self.assertTrue(streams[0].closed)
+        self.assertEqual(len(result["paths"]), 2)
+
+
+@override_settings(LINK_CACHE={"BACKEND": "local"}, YOUTUBE_BASE_URL="https://www.youtube.com")
+class StreamEndpointTests(TestCase):
+    def setUp(self):
+        reset_link_caches()
+        self.addCleanup(reset_link_caches)
+
+    def test_done_event_maps_streamed_paths_to_saved_ids(self):
+        text = json.dumps(_two_level_payload())
+        client = APIClient(HTTP_HOST="localhost")
+        with mock.patch.object(groq_ai.client.chat.completions, "create", return_value=_Stream(text)), \
+                mock.patch.object(groq_ai, "urlopen", FakeYouTube()):
+            response = client.post("/api/skills/courses/ai-generate/stream/", {"skill": "Rustlang"}, format="json")
+            body = b"".join(response.streaming_content).decode()
+
+        events = []
+        for block in body.strip().split("\n\n"):
+            name, data = block.split("\n", 1)
+            events.append((name[len("event: "):], json.loads(data[len("data: "):])))
+        path_events = {data["index"]: data for name, data in events if name == "path"}
+        done = events[-1][1]
+        self.assertEqual(events[-1][0], "done")
+        for index, path_id in enumerate(done["path_ids"]):
+            self.assertEqual(Path.objects.get(pk=path_id).title, path_events[index]["title"])
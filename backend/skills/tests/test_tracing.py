@@ -0,0 +1,292 @@
+import io
+import json
+import tempfile
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path as FilePath
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from skills.services import groq_ai, tracing
+from skills.services.course_writer import save_generated_course
+from skills.services.link_cache import link_cache_stats, reset_link_caches
+
+from .utils import FakeYouTube, course_payload, generated_course, make_tree
+
+
+class TraceFileMixin:
+    """Run each test with TRACING on and the file exporter writing to a temporary file."""
+
+    def setUp(self):
+        super().setUp()
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.trace_file = FilePath(directory.name, "traces.jsonl")
+        settings = override_settings(TRACING=True, TRACING_EXPORTER="file", TRACING_FILE=str(self.trace_file))
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+    def exported(self) -> list[dict]:
+        """The written ExportTraceServiceRequests, one per line."""
+        if not self.trace_file.exists():
+            return []
+        return [json.loads(line) for line in self.trace_file.read_text().splitlines()]
+
+    def spans(self) -> list[dict]:
+        return [
+            span
+            for request in self.exported()
+            for resource in request["resourceSpans"]
+            for scope in resource["scopeSpans"]
+            for span in scope["spans"]
+        ]
+
+    def span_named(self, name) -> dict:
+        (span,) = [span for span in self.spans() if span["name"] == name]
+        return span
+
+
+def attributes(span) -> dict:
+    return {item["key"]: item["value"] for item in span["attributes"]}
+
+
+class SpanTests(TraceFileMixin, SimpleTestCase):
+    def test_disabled_tracing_writes_nothing(self):
+        with override_settings(TRACING=False):
+            with tracing.span("outer") as span:
+                span.set_attribute("skills.key", "value")
+                tracing.increment("skills.count")
+        self.assertIs(span, tracing.NOOP_SPAN)
+        self.assertEqual(self.exported(), [])
+
+    def test_nested_spans_are_written_as_one_trace(self):
+        with tracing.span("outer", {"skills.skipped": None}, kind=tracing.SERVER) as outer:
+            with tracing.span("inner", kind=tracing.CLIENT) as inner:
+                self.assertIs(tracing.current_span(), inner)
+            self.assertEqual(self.exported(), [])
+        self.assertIs(tracing.current_span(), tracing.NOOP_SPAN)
+
+        (request,) = self.exported()
+        (resource,) = request["resourceSpans"]
+        self.assertEqual(
+            resource["resource"]["attributes"],
+            [{"key": "service.name", "value": {"stringValue": "skills-backend"}}],
+        )
+        self.assertEqual(resource["scopeSpans"][0]["scope"], {"name": "skills"})
+        first, second = resource["scopeSpans"][0]["spans"]
+        self.assertEqual((first["name"], first["kind"]), ("outer", 2))
+        self.assertEqual((second["name"], second["kind"]), ("inner", 3))
+        self.assertEqual(first["traceId"], outer.trace_id)
+        self.assertEqual(second["traceId"], outer.trace_id)
+        self.assertEqual(len(first["traceId"]), 32)
+        self.assertNotIn("parentSpanId", first)
+        self.assertEqual(second["parentSpanId"], first["spanId"])
+        self.assertEqual(first["attributes"], [])
+        self.assertEqual(first["status"], {})
+        self.assertLessEqual(int(first["startTimeUnixNano"]), int(second["startTimeUnixNano"]))
+        self.assertGreaterEqual(int(first["endTimeUnixNano"]), int(second["endTimeUnixNano"]))
+
+    def test_attribute_values_and_counters(self):
+        with tracing.span("work", {"skills.name": "rust"}) as span:
+            span.set_attribute("skills.rows", 3)
+            span.set_attribute("skills.ratio", 0.5)
+            span.set_attribute("skills.cached", True)
+            span.set_attribute("skills.reasons", ["stop"])
+            span.set_attribute("skills.ignored", None)
+            span.update_name("work renamed")
+            tracing.increment("skills.hits")
+            tracing.increment("skills.hits", 2)
+        self.assertEqual(
+            attributes(self.span_named("work renamed")),
+            {
+                "skills.name": {"stringValue": "rust"},
+                "skills.rows": {"intValue": "3"},
+                "skills.ratio": {"doubleValue": 0.5},
+                "skills.cached": {"boolValue": True},
+                "skills.reasons": {"arrayValue": {"values": [{"stringValue": "stop"}]}},
+                "skills.hits": {"intValue": "3"},
+            },
+        )
+
+    def test_exceptions_mark_the_span_as_failed(self):
+        with self.assertRaisesMessage(ValueError, "bad payload"):
+            with tracing.span("outer"):
+                with tracing.span("inner"):
+                    raise ValueError("bad payload")
+        inner = self.span_named("inner")
+        self.assertEqual(inner["status"], {"code": 2, "message": "bad payload"})
+        (event,) = inner["events"]
+        self.assertEqual(event["name"], "exception")
+        self.assertEqual(attributes(event)["exception.type"], {"stringValue": "ValueError"})
+        self.assertEqual(self.span_named("outer")["status"]["code"], 2)
+
+    def test_spans_work_as_decorators(self):
+        @tracing.span("decorated")
+        def work():
+            return tracing.current_span().name
+
+        self.assertEqual(work(), "decorated")
+        self.assertEqual(work(), "decorated")
+        self.assertEqual(len(self.exported()), 2)
+
+    @override_settings(TRACING_EXPORTER="console", TRACING_SERVICE_NAME="learnoway")
+    def test_console_exporter_writes_to_stderr(self):
+        with mock.patch("sys.stderr", new_callable=io.StringIO) as stderr:
+            with tracing.span("outer"):
+                pass
+        (line,) = stderr.getvalue().splitlines()
+        resource = json.loads(line)["resourceSpans"][0]["resource"]
+        self.assertEqual(attributes(resource), {"service.name": {"stringValue": "learnoway"}})
+        self.assertFalse(self.trace_file.exists())
+
+
+class BindTests(TraceFileMixin, SimpleTestCase):
+    def test_pool_threads_join_the_callers_trace(self):
+        def child(n):
+            with tracing.span(f"child {n}"):
+                tracing.increment("skills.calls")
+            return tracing.current_span().name
+
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            with tracing.span("parent") as parent:
+                names = list(executor.map(tracing.bind(child), range(3)))
+        # The bound function runs under the parent span.
+        self.assertEqual(names, ["parent"] * 3)
+
+        (request,) = self.exported()
+        spans = request["resourceSpans"][0]["scopeSpans"][0]["spans"]
+        self.assertEqual(len(spans), 4)
+        for n in range(3):
+            span = self.span_named(f"child {n}")
+            self.assertEqual(span["traceId"], parent.trace_id)
+            self.assertEqual(span["parentSpanId"], parent.span_id)
+            self.assertEqual(attributes(span)["skills.calls"], {"intValue": "1"})
+
+    def test_bind_without_a_span_returns_the_function(self):
+        def work():
+            pass
+
+        self.assertIs(tracing.bind(work), work)
+
+    def test_counters_from_pool_threads_add_up(self):
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            with tracing.span("parent"):
+                bound = tracing.bind(lambda _: tracing.increment("skills.hits"))
+                list(executor.map(bound, range(100)))
+        self.assertEqual(attributes(self.span_named("parent"))["skills.hits"], {"intValue": "100"})
+
+    def test_spans_started_after_their_trace_are_written_as_a_fragment(self):
+        def late():
+            with tracing.span("late") as span:
+                return span
+
+        # e.g. a pool thread that outlived the request's deadline
+        with tracing.span("parent") as parent:
+            bound = tracing.bind(late)
+        late_span = bound()
+        self.assertIs(tracing.current_span(), tracing.NOOP_SPAN)
+
+        first, second = self.exported()
+        self.assertEqual([s["name"] for s in first["resourceSpans"][0]["scopeSpans"][0]["spans"]], ["parent"])
+        (fragment,) = second["resourceSpans"][0]["scopeSpans"][0]["spans"]
+        self.assertEqual(fragment["name"], "late")
+        self.assertEqual(fragment["traceId"], parent.trace_id)
+        self.assertEqual(fragment["parentSpanId"], parent.span_id)
+        self.assertEqual(late_span.parent, parent)
+
+
+@override_settings(LINK_CACHE={"BACKEND": "local"}, YOUTUBE_BASE_URL="https://www.youtube.com",
+                   LINK_CHECK_CONCURRENCY=4)
+class LinkCheckTracingTests(TraceFileMixin, SimpleTestCase):
+    def setUp(self):
+        super().setUp()
+        reset_link_caches()
+        self.addCleanup(reset_link_caches)
+
+    def test_link_lookups_nest_under_the_fetch_round(self):
+        with mock.patch.object(groq_ai, "urlopen", FakeYouTube()):
+            groq_ai._sanitize_course_payload("Rustlang", course_payload(), "Bangla")
+        spans = self.spans()
+        by_id = {span["spanId"]: span for span in spans}
+        lookups = [span for span in spans if span["name"] == "GET"]
+        self.assertTrue(lookups)
+        self.assertEqual(len({span["traceId"] for span in spans}), 1)
+        for span in lookups:
+            self.assertEqual(span["kind"], 3)
+            self.assertEqual(by_id[span["parentSpanId"]]["name"], "link_checks.fetch")
+            self.assertIn("skills.link_check", attributes(span))
+        batch = self.span_named("link_checks.batch")
+        self.assertGreater(int(attributes(batch)["skills.link_checks.lookups"]["intValue"]), 0)
+
+    def link_cache_counters(self, concurrency):
+        reset_link_caches()
+        self.trace_file.unlink(missing_ok=True)
+        youtube = FakeYouTube()
+        with override_settings(LINK_CHECK_CONCURRENCY=concurrency), \
+                mock.patch.object(groq_ai, "urlopen", youtube), tracing.span("sanitize"):
+            groq_ai._sanitize_course_payload("Rustlang", course_payload(), "Bangla")
+        counters = Counter()
+        for span in self.spans():
+            for key, value in attributes(span).items():
+                if key.startswith("skills.link_cache."):
+                    counters[key] += int(value["intValue"])
+        return counters, youtube
+
+    def test_link_cache_counters_count_each_lookup_once(self):
+        counters, youtube = self.link_cache_counters(4)
+        # Cold cache: every miss is a request, and planning replays count nothing.
+        self.assertEqual(counters["skills.link_cache.oembed.misses"], len(youtube.fetched("/oembed")))
+        self.assertEqual(counters["skills.link_cache.search.misses"], len(youtube.fetched("/results")))
+        self.assertEqual(counters, self.link_cache_counters(1)[0])
+        stats = link_cache_stats()
+        self.assertEqual(stats["oembed"]["misses"], len(youtube.fetched("/oembed")))
+        self.assertEqual(stats["oembed"]["hits"], counters["skills.link_cache.oembed.hits"])
+
+
+class PersistTracingTests(TraceFileMixin, TestCase):
+    def test_course_writes_are_traced(self):
+        save_generated_course(generated_course(paths=1, stages=1, topics=1, resources=1))
+        persist = self.span_named("persist.course")
+        children = {span["name"] for span in self.spans() if span.get("parentSpanId") == persist["spanId"]}
+        self.assertIn("bulk_create skills_path", children)
+        self.assertIn("persist.skill_aliases", children)
+        rows = attributes(self.span_named("bulk_create skills_path"))["skills.rows"]
+        self.assertEqual(rows, {"intValue": "1"})
+
+
+class TracingMiddlewareTests(TraceFileMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.course, *_ = make_tree()
+
+    def test_request_span_is_named_after_the_route(self):
+        response = self.client.get(f"/api/skills/courses/{self.course.id}/", HTTP_HOST="localhost")
+        self.assertEqual(response.status_code, 200)
+        (span,) = [span for span in self.spans() if "parentSpanId" not in span]
+        self.assertEqual(span["name"], "GET /api/skills/courses/{pk}/")
+        self.assertEqual(span["kind"], 2)
+        self.assertEqual(
+            {key: value for key, value in attributes(span).items() if key.startswith(("http", "url"))},
+            {
+                "http.request.method": {"stringValue": "GET"},
+                "url.path": {"stringValue": f"/api/skills/courses/{self.course.id}/"},
+                "http.route": {"stringValue": "/api/skills/courses/{pk}/"},
+                "http.response.status_code": {"intValue": "200"},
+            },
+        )
+
+    def test_unmatched_paths_keep_the_method_name(self):
+        response = self.client.get("/no-such-page/", HTTP_HOST="localhost")
+        self.assertEqual(response.status_code, 404)
+        (span,) = self.spans()
+        self.assertEqual(span["name"], "GET")
+        self.assertEqual(attributes(span)["http.response.status_code"], {"intValue": "404"})
+
+    def test_off_unless_enabled(self):
+        with override_settings(TRACING=False):
+            self.client.get(f"/api/skills/courses/{self.course.id}/", HTTP_HOST="localhost")
+        self.assertEqual(self.exported(), [])
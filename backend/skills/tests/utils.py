@@ -0,0 +1,162 @@
+import hashlib
+import io
+import json
+import threading
+from urllib.error import HTTPError, URLError
+from urllib.parse import parse_qs, urlparse
+
+from skills.models import CourseCard, Path, Roadmap, SubMap
+
+
+class _Response(io.BytesIO):
+    def __init__(self, body: bytes, status: int = 200):
+        super().__init__(body)
+        self.status = status
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+
+class FakeYouTube:
+    """
+    Stands in for groq_ai.urlopen: answers oEmbed and results-page requests
+    like YouTube and records every URL fetched. Video ids starting with
+    "dead" answer oEmbed with a 404; `failures` maps other ids to the HTTP
+    status they answer with, or to None for a timeout (URLError).
+    """
+
+    def __init__(self, title: str = "Rustlang full course", failures=None):
+        self.title = title
+        self.failures = dict(failures or {})
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def __call__(self, request, timeout=None):
+        url = getattr(request, "full_url", request)
+        with self._lock:
+            self.calls.append(url)
+        parsed = urlparse(url)
+        params = parse_qs(parsed.query)
+        if parsed.path == "/oembed":
+            video_id = parse_qs(urlparse(params["url"][0]).query).get("v", [""])[0]
+            if video_id in self.failures:
+                status = self.failures[video_id]
+                if status is None:
+                    raise URLError("timed out")
+                raise HTTPError(url, status, "Error", None, None)
+            if video_id.startswith("dead"):
+                raise HTTPError(url, 404, "Not Found", None, None)
+            body = {"title": self.title, "author_name": "Stub Academy"}
+            return _Response(json.dumps(body).encode())
+        if parsed.path == "/results":
+            digest = hashlib.sha1(params["search_query"][0].encode()).hexdigest()
+            body = f'"videoId":"dead{digest[:7]}""videoId":"{digest[7:18]}""playlistId":"PL{digest[:16]}"'
+            return _Response(body.encode())
+        raise HTTPError(url, 404, "Not Found", None, None)
+
+    def fetched(self, path: str) -> list[str]:
+        return [url for url in self.calls if urlparse(url).path == path]
+
+
+def course_payload(paths: int = 1, stages: int = 2, topics: int = 2) -> dict:
+    """A raw LLM course payload with a valid, a dead and a shared video per topic."""
+    raw_paths = []
+    for p in range(paths):
+        roadmaps = []
+        for r in range(stages):
+            sub_maps = []
+            for t in range(topics):
+                digest = hashlib.sha1(f"{p}-{r}-{t}".encode()).hexdigest()
+                sub_maps.append(
+                    {
+                        "title": f"Ownership topic {t + 1}",
+                        "micro_desc": "Borrowing and lifetimes.",
+                        "resources": [
+                            {"language": "English", "link_type": "Video",
+                             "link": f"https://www.youtube.com/watch?v={digest[:11]}"},
+                            {"language": "English", "link_type": "Video",
+                             "link": f"https://www.youtube.com/watch?v=dead{digest[11:18]}"},
+                            {"language": "Hindi", "link_type": "Video",
+                             "link": "https://www.youtube.com/watch?v=sharedvideo1"},
+                        ],
+                    }
+                )
+            roadmaps.append(
+                {"title": f"Stage {r + 1}", "micro_desc": "Practice.", "duration": "1 week",
+                 "sub_maps": sub_maps}
+            )
+        raw_paths.append(
+            {"title": f"Path {p + 1}", "mini_desc": "Path.", "level": "beginner",
+             "duration": "3 months", "roadmaps": roadmaps}
+        )
+    return {"course": {"title": "Rustlang"}, "paths": raw_paths}
+
+
+def generated_course(paths: int = 2, stages: int = 2, topics: int = 2, resources: int = 2,
+                     title: str = "Rustlang Mastery Path") -> dict:
+    """A sanitized course payload, as save_generated_course receives it."""
+    levels = ["advanced", "beginner", "intermediate"]
+    languages = ["English", "Bangla", "Hindi"]
+    return {
+        "course": {
+            "title": title,
+            "description": "Generated course.",
+            "overview": "Overview.",
+            "icon": "📘",
+            "category": "technology",
+            "level": "beginner",
+            "students": "1M+ learners worldwide",
+            "duration": "6 months",
+            "rating": 4.7,
+            "color": "from-blue-500 to-purple-600",
+            "tags": ["rust"],
+            "career_opportunities": [],
+            "tools_needed": [],
+            "special_features": [],
+        },
+        "paths": [
+            {
+                "title": f"Path {p + 1}",
+                "mini_desc": "Path.",
+                "level": levels[p % len(levels)],
+                "duration": "3 months",
+                "roadmaps": [
+                    {
+                        "title": f"Path {p + 1} stage {r + 1}",
+                        "micro_desc": "Stage.",
+                        "duration": "1 week",
+                        "sub_maps": [
+                            {
+                                "title": f"Topic {t + 1}",
+                                "micro_desc": "Topic.",
+                                "resources": [
+                                    {
+                                        "language": languages[i % len(languages)],
+                                        "link_type": "Video",
+                                        "link": f"https://www.youtube.com/watch?v={p}{r}{t}{i}abcdefgh",
+                                    }
+                                    for i in range(resources)
+                                ],
+                            }
+                            for t in range(topics)
+                        ],
+                    }
+                    for r in range(stages)
+                ],
+            }
+            for p in range(paths)
+        ],
+    }
+
+
+def make_tree():
+    """A saved course with one path, stage and topic; returns (course, path, roadmap, sub_map)."""
+    course = CourseCard.objects.create(title="Rust", description="d", duration="1 month")
+    path = Path.objects.create(course=course, title="P", mini_desc="m", duration="1 month")
+    roadmap = Roadmap.objects.create(path=path, title="R", micro_desc="m", duration="1 week")
+    sub_map = SubMap.objects.create(roadmap=roadmap, title="S")
+    return course, path, roadmap, sub_map
@@ -1,12 +1,50 @@
-from .services.groq_ai import generate_skill_course, generate_exam_for_roadmap
+from .services.groq_ai import stream_skill_course
+from .services.course_writer import save_generated_course
+from .services.activity import activity_heatmap
+from .services.course_structure import get_course_structure
+from .services.course_tree import TREE_LEVELS, course_tree, course_trees, kept_levels
+from .services.dashboard_stats import course_progress_changed, dashboard_data
+from .services.exam_bank import sample_exam
+from .services.exam_sessions import (
+    close_exam_session,
+    issue_exam_session,
+    load_exam_session,
+)
+from .services.generation_jobs import (
+    enqueue_generation_job,
+    finish_job,
+    run_generation_job,
+    serialize_job,
+    start_generation_job,
+    wait_for_job,
+)
+from .services.progress_bitmap import (
+    apply_completed_delta,
+    set_completed_ids,
+    stored_completed_ids,
+)
+from .services.response_cache import (
+    cached_course_response,
+    etag_matches,
+    response_cache_enabled,
+)
+from .services.skill_index import find_courses_for_skill
+from .services import tracing
 from rest_framework import status
 from rest_framework.response import Response
 from rest_framework import viewsets
-from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.permissions import SAFE_METHODS, AllowAny, IsAuthenticated
 from rest_framework.decorators import action
-from collections import defaultdict
-from datetime import timedelta, date
+from rest_framework.exceptions import NotFound, ValidationError
+import json
+import time
+from django.conf import settings
+from django.db import transaction
+from django.db.models import IntegerField, OuterRef, Prefetch, Subquery, Sum
+from django.db.models.functions import Coalesce
 from django.utils import timezone
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpResponse, HttpResponseNotModified, StreamingHttpResponse
 from .models import (
     CourseCard,
     Path,
@@ -16,36 +54,247 @@ from .models import (
     Quiz,
     QuizQuestion,
     StageProgress,
-    ExamSession,
     UserCourseTracking,
+    CourseGenerationJob,
 )
+from .pagination import CatalogCursorPagination
 from .serializers import (
-    CourseSerializer, PathSerializer,
+    CourseSerializer, CourseSummarySerializer, PathSerializer,
     RoadmapSerializer, SubMapSerializer, ResourceSerializer
 )
 
 EXAM_PASS_THRESHOLD = 0.7  # 70% correct to pass
 
 
-LEVEL_RANK = {
-    "beginner": 0,
-    "intermediate": 1,
-    "advanced": 2,
-}
+def _preferred_language(request) -> str:
+    selected_language = str(request.data.get("selected_language", "english")).lower()
+    language_map = {
+        "english": "English",
+        "bangla": "Bangla",
+        "hindi": "Hindi",
+    }
+    return language_map.get(selected_language, "English")
+
+
+def _resource_language(request) -> str | None:
+    """The ?language= filter as a Resource.language value, or None for all languages."""
+    value = request.query_params.get("language", "").strip().lower()
+    if not value:
+        return None
+    for language, _ in Resource.LANGUAGE_CHOICES:
+        if language.lower() == value:
+            return language
+    raise ValidationError({"language": f"Unknown language {value!r}."})
+
+
+def _sparse_fields(request) -> tuple[frozenset | None, int | None]:
+    """?fields= (names kept at every level) and ?depth= (nested levels) of a read request."""
+    if request.method not in SAFE_METHODS:
+        return None, None
+    raw_fields = request.query_params.get("fields", "")
+    fields = frozenset(name.strip() for name in raw_fields.split(",") if name.strip()) or None
+    raw_depth = request.query_params.get("depth", "").strip()
+    if not raw_depth:
+        return fields, None
+    try:
+        depth = int(raw_depth)
+    except ValueError:
+        depth = -1
+    if depth < 0:
+        raise ValidationError({"depth": "Must be a non-negative integer."})
+    return fields, depth
+
+
+class SkillTreeMixin:
+    """
+    ?language=, ?fields= and ?depth= on the skills endpoints. The serializers
+    prune their fields from the context, and the prefetch chain (tree_levels,
+    outermost first) is cut to the levels that are still rendered, so shallow
+    requests issue shallow queries. Resources are prefetched through a
+    language-filtered queryset; resources_count still counts all languages.
+    """
+
+    tree_levels = ()
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context["fields"], context["depth"] = _sparse_fields(self.request)
+        return context
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if not self.tree_levels:
+            return queryset
+        levels = kept_levels(self.tree_levels, *_sparse_fields(self.request))
+        language = _resource_language(self.request)
+        if levels == self.tree_levels and language is None:
+            return queryset
+        queryset = queryset.prefetch_related(None)
+        if not levels:
+            return queryset
+        lookup = "__".join(levels)
+        if levels[-1] == "resources" and language is not None:
+            return queryset.prefetch_related(
+                Prefetch(lookup, queryset=Resource.objects.filter(language=language))
+            )
+        return queryset.prefetch_related(lookup)
+
+
+def _find_cached_course(skill, preferred_language):
+    """An existing course for this skill that already has resources in the requested language."""
+    candidates = {course.id: course for course in find_courses_for_skill(skill)}
+    if not candidates:
+        return None
+    with_language = set(
+        Resource.objects.filter(
+            sub_map__roadmap__path__course_id__in=list(candidates),
+            language=preferred_language,
+        ).values_list("sub_map__roadmap__path__course_id", flat=True).distinct()
+    )
+    for course_id, course in candidates.items():
+        if course_id in with_language:
+            return course
+    return None
+
+
+def _int_ids(values) -> list[int]:
+    ids = []
+    for value in values:
+        try:
+            ids.append(int(value))
+        except Exception:
+            continue
+    return ids
+
 
+def _completed_ids(tracking) -> list[int]:
+    return stored_completed_ids(
+        tracking.completed_bitmap,
+        tracking.completed_base,
+        tracking.completed_sub_map_ids,
+    )
 
-def _path_level_sort_key(path_data):
-    level = str(path_data.get("level") or "").strip().lower()
-    return LEVEL_RANK.get(level, 99)
 
+def _sse(event, data) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, cls=DjangoJSONEncoder)}\n\n"
 
 
-class CourseViewSet(viewsets.ModelViewSet):
+def _wants_job(request) -> bool:
+    """ai-generate runs as a background job with {"async": true} or ?async=1."""
+    flag = request.data.get("async", request.query_params.get("async"))
+    return str(flag).strip().lower() in {"1", "true", "yes", "on"}
+
+
+def _job_accepted(request, job) -> Response:
+    payload = serialize_job(job)
+    payload["status_url"] = request.build_absolute_uri(
+        f"{request.path.rstrip('/')}/jobs/{job.id}/"
+    )
+    return Response(payload, status=status.HTTP_202_ACCEPTED)
+
+
+class CourseViewSet(SkillTreeMixin, viewsets.ModelViewSet):
     queryset = CourseCard.objects.all().prefetch_related(
         'path_items__roadmaps__sub_maps__resources'
     )
+    tree_levels = TREE_LEVELS
     serializer_class = CourseSerializer
     permission_classes = [AllowAny]
+    pagination_class = CatalogCursorPagination
+    # Queries per action, including the JWT user lookup (see SQLBudgetMiddleware).
+    # dashboard_summary and user_progress: a learner's first visit or write also
+    # backfills their dashboard stats (3 and 18 queries afterwards).
+    query_budgets = {
+        "list": 7,
+        "retrieve": 7,
+        "dashboard_summary": 16,
+        "activity_heatmap": 2,
+        "user_progress": 27,
+    }
+
+    def _expand_tree(self) -> bool:
+        expand = self.request.query_params.get("expand", "")
+        return "tree" in expand.split(",")
+
+    def get_queryset(self):
+        if self.action == "user_progress":
+            # Works from the cached course structure; the prefetched tree is not needed.
+            return CourseCard.objects.all()
+        if self.action == "list" and not self._expand_tree():
+            # Catalog cards: one query per page, no tree prefetch.
+            roadmap_count = (
+                Path.objects.filter(course=OuterRef("pk"))
+                .values("course")
+                .annotate(total=Sum("roadmap_count"))
+                .values("total")
+            )
+            return CourseCard.objects.annotate(
+                roadmap_count=Coalesce(Subquery(roadmap_count), 0, output_field=IntegerField())
+            ).order_by("id")
+        if self.action == "list":
+            # Trees are assembled by course_trees from the ids of the page.
+            return CourseCard.objects.only("id").order_by("id")
+        return super().get_queryset()
+
+    def get_serializer_class(self):
+        if self.action == "list" and not self._expand_tree():
+            return CourseSummarySerializer
+        return super().get_serializer_class()
+
+    def list(self, request, *args, **kwargs):
+        """
+        Course cards with their counters. ?expand=tree returns the nested form
+        (pruned by ?language=, ?fields=, ?depth=); ?cursor= / ?page_size=
+        switch to cursor pages.
+        """
+        # Validated on every list request, although summary cards carry no resources.
+        language = _resource_language(request)
+        if not self._expand_tree():
+            return super().list(request, *args, **kwargs)
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        courses = page if page is not None else queryset
+        data = course_trees([course.pk for course in courses], language, *_sparse_fields(request))
+        if page is not None:
+            return self.get_paginated_response(data)
+        return Response(data)
+
+    def retrieve(self, request, *args, **kwargs):
+        """
+        The nested course, served from a cache of rendered JSON keyed by the
+        course's tree_version, with a strong ETag; a matching If-None-Match
+        gets 304 without rendering anything.
+        """
+        if not response_cache_enabled() or request.accepted_renderer.format != "json":
+            return super().retrieve(request, *args, **kwargs)
+        language = _resource_language(request)
+        fields, depth = _sparse_fields(request)
+        try:
+            course_id = int(kwargs[self.lookup_field])
+        except (TypeError, ValueError):
+            raise NotFound()
+        version = (
+            CourseCard.objects.filter(pk=course_id).values_list("tree_version", flat=True).first()
+        )
+        if version is None:
+            raise NotFound()
+
+        def render():
+            tree = course_tree(course_id, language, fields, depth)
+            if tree is None:
+                raise NotFound()
+            return request.accepted_renderer.render(tree)
+
+        variant = f"{language or ''}|{','.join(sorted(fields or ()))}|{'' if depth is None else depth}"
+        etag, body = cached_course_response(course_id, version, render, variant=variant)
+        if etag_matches(request, etag):
+            response = HttpResponseNotModified()
+        else:
+            response = HttpResponse(body, content_type="application/json")
+        response["ETag"] = etag
+        # Clients may keep the body but must revalidate it with the ETag.
+        response["Cache-Control"] = "no-cache"
+        return response
 
     @action(
         detail=False,
@@ -54,158 +303,11 @@ class CourseViewSet(viewsets.ModelViewSet):
         permission_classes=[IsAuthenticated],
     )
     def dashboard_summary(self, request):
-        user = request.user
-        tracking_qs = (
-            UserCourseTracking.objects.filter(user=user)
-            .select_related("course", "selected_path")
-            .order_by("-last_accessed_at")
-        )
-
-        stage_rows = list(
-            StageProgress.objects.filter(user=user).values(
-                "roadmap_id", "roadmap__path__course_id", "passed_at"
-            )
-        )
-        passed_by_course = defaultdict(set)
-        stage_activity_by_day = defaultdict(int)
-        for row in stage_rows:
-            passed_by_course[row["roadmap__path__course_id"]].add(row["roadmap_id"])
-            passed_at = row.get("passed_at")
-            if passed_at:
-                local_day = timezone.localtime(passed_at).date()
-                stage_activity_by_day[local_day] += 1
-
-        roadmaps_by_course = defaultdict(list)
-        for roadmap in Roadmap.objects.select_related("path__course").order_by("id"):
-            roadmaps_by_course[roadmap.path.course_id].append(roadmap)
-
-        submaps_by_course = defaultdict(set)
-        for sub in SubMap.objects.select_related("roadmap__path").all():
-            submaps_by_course[sub.roadmap.path.course_id].add(sub.id)
-
-        today = timezone.localdate()
-        weekly_activity = []
-        weekly_sessions = 0
-        total_activity = defaultdict(int)
-        active_skills = []
-        completed_skills_count = 0
-        tracked_course_ids = set()
-
-        for item in tracking_qs:
-            course_id = item.course_id
-            tracked_course_ids.add(course_id)
-            course_submaps = submaps_by_course.get(course_id, set())
-            completed_submaps = set(
-                [sid for sid in item.completed_sub_map_ids if sid in course_submaps]
-            )
-            total_units = len(course_submaps)
-            completed_units = len(completed_submaps)
-            progress_pct = (
-                round((completed_units / total_units) * 100) if total_units > 0 else 0
-            )
-            if total_units > 0 and completed_units >= total_units:
-                completed_skills_count += 1
-
-            roadmaps = roadmaps_by_course.get(course_id, [])
-            passed_ids = passed_by_course.get(course_id, set())
-            next_stage_title = None
-            for roadmap in roadmaps:
-                if roadmap.id not in passed_ids:
-                    next_stage_title = roadmap.title
-                    break
-
-            active_skills.append(
-                {
-                    "course_id": course_id,
-                    "title": item.course.title,
-                    "icon": item.course.icon,
-                    "level": item.course.level,
-                    "category": item.course.category,
-                    "progress_pct": progress_pct,
-                    "completed_stages": completed_units,
-                    "total_stages": total_units,
-                    "last_activity": item.last_accessed_at,
-                    "next_stage_title": next_stage_title,
-                }
-            )
-
-            for date_key, count in (item.activity_by_date or {}).items():
-                try:
-                    day = date.fromisoformat(date_key)
-                except Exception:
-                    continue
-                total_activity[day] += int(count or 0)
-
-        # Backfill active skill cards for users who have StageProgress but no UserCourseTracking row yet.
-        missing_course_ids = set(passed_by_course.keys()) - tracked_course_ids
-        if missing_course_ids:
-            courses = {
-                c.id: c
-                for c in CourseCard.objects.filter(id__in=list(missing_course_ids))
-            }
-            for course_id in missing_course_ids:
-                course = courses.get(course_id)
-                if not course:
-                    continue
-                course_submaps = submaps_by_course.get(course_id, set())
-                passed_ids = passed_by_course.get(course_id, set())
-                roadmaps = roadmaps_by_course.get(course_id, [])
-                total_units = len(course_submaps)
-                completed_units = min(len(passed_ids), total_units)
-                progress_pct = (
-                    round((completed_units / total_units) * 100) if total_units > 0 else 0
-                )
-                if total_units > 0 and completed_units >= total_units:
-                    completed_skills_count += 1
-
-                next_stage_title = None
-                for roadmap in roadmaps:
-                    if roadmap.id not in passed_ids:
-                        next_stage_title = roadmap.title
-                        break
-
-                active_skills.append(
-                    {
-                        "course_id": course_id,
-                        "title": course.title,
-                        "icon": course.icon,
-                        "level": course.level,
-                        "category": course.category,
-                        "progress_pct": progress_pct,
-                        "completed_stages": completed_units,
-                        "total_stages": total_units,
-                        "last_activity": None,
-                        "next_stage_title": next_stage_title,
-                    }
-                )
-
-        for day, count in stage_activity_by_day.items():
-            total_activity[day] += count
-
-        active_skills.sort(
-            key=lambda x: x["last_activity"].timestamp()
-            if x.get("last_activity")
-            else 0,
-            reverse=True,
-        )
-
-        for i in range(6, -1, -1):
-            d = today - timedelta(days=i)
-            sessions = total_activity.get(d, 0)
-            weekly_sessions += sessions
-            weekly_activity.append(
-                {
-                    "date": d.isoformat(),
-                    "label": d.strftime("%a"),
-                    "sessions": sessions,
-                }
-            )
-
-        streak = 0
-        cursor = today
-        while total_activity.get(cursor, 0) > 0:
-            streak += 1
-            cursor = cursor - timedelta(days=1)
+        """Read from the materialized UserDashboardStats / UserCourseStats rows."""
+        data = dashboard_data(request.user)
+        active_skills = data["active_skills"]
+        weekly_sessions = data["weekly_sessions"]
+        streak = data["streak"]
 
         goals = [
             {
@@ -232,17 +334,37 @@ class CourseViewSet(viewsets.ModelViewSet):
             {
                 "summary": {
                     "active_skills": len(active_skills),
-                    "completed_skills": completed_skills_count,
+                    "completed_skills": data["completed_skills"],
                     "weekly_sessions": weekly_sessions,
                     "estimated_hours": round(weekly_sessions * 0.5, 1),
                     "streak_days": streak,
                 },
                 "active_skills": active_skills,
-                "weekly_activity": weekly_activity,
+                "weekly_activity": data["weekly_activity"],
                 "goals": goals,
             }
         )
 
+    @action(
+        detail=False,
+        methods=["get"],
+        url_path="activity-heatmap",
+        permission_classes=[IsAuthenticated],
+    )
+    def activity_heatmap(self, request):
+        """Per-day activity for the last ?days= days (default 365), optionally for one ?course=."""
+        try:
+            days = int(request.query_params.get("days", 365))
+            course_id = request.query_params.get("course")
+            course_id = int(course_id) if course_id else None
+        except ValueError:
+            return Response(
+                {"error": "days and course must be integers"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        days = max(1, min(days, 366))
+        return Response(activity_heatmap(request.user, days=days, course_id=course_id))
+
     @action(
         detail=True,
         methods=["get", "post"],
@@ -250,19 +372,23 @@ class CourseViewSet(viewsets.ModelViewSet):
         permission_classes=[IsAuthenticated],
     )
     def user_progress(self, request, pk=None):
+        """
+        GET or update the learner's progress. Completed sub-maps are replaced with
+        "completed_sub_map_ids" or changed with "add" / "remove" id lists.
+        """
         course = self.get_object()
-        tracking, _ = UserCourseTracking.objects.get_or_create(
-            user=request.user,
-            course=course,
-        )
 
         if request.method.lower() == "get":
+            tracking, _ = UserCourseTracking.objects.get_or_create(
+                user=request.user,
+                course=course,
+            )
             return Response(
                 {
                     "course_id": course.id,
                     "selected_path_id": tracking.selected_path_id,
                     "selected_language": tracking.selected_language,
-                    "completed_sub_map_ids": tracking.completed_sub_map_ids or [],
+                    "completed_sub_map_ids": _completed_ids(tracking),
                     "last_accessed_at": tracking.last_accessed_at,
                     "last_activity_at": tracking.last_activity_at,
                 }
@@ -271,47 +397,58 @@ class CourseViewSet(viewsets.ModelViewSet):
         selected_path_id = request.data.get("selected_path_id")
         selected_language = request.data.get("selected_language")
         completed_sub_map_ids = request.data.get("completed_sub_map_ids")
+        add_ids = request.data.get("add")
+        remove_ids = request.data.get("remove")
         track_activity = bool(request.data.get("track_activity", False))
+        has_delta = isinstance(add_ids, list) or isinstance(remove_ids, list)
 
+        path = None
         if selected_path_id is not None:
             path = Path.objects.filter(id=selected_path_id, course_id=course.id).first()
-            tracking.selected_path = path
 
-        if selected_language in {"english", "bangla", "hindi"}:
-            tracking.selected_language = selected_language
-
-        if isinstance(completed_sub_map_ids, list):
-            valid_ids = set(
-                SubMap.objects.filter(roadmap__path__course_id=course.id).values_list(
-                    "id", flat=True
-                )
+        with transaction.atomic():
+            # Row lock: concurrent tabs apply their changes one after another.
+            tracking, _ = UserCourseTracking.objects.select_for_update().get_or_create(
+                user=request.user,
+                course=course,
             )
-            cleaned = []
-            for sid in completed_sub_map_ids:
-                try:
-                    n = int(sid)
-                except Exception:
-                    continue
-                if n in valid_ids:
-                    cleaned.append(n)
-            tracking.completed_sub_map_ids = sorted(set(cleaned))
-
-        now = timezone.now()
-        tracking.last_accessed_at = now
-        if track_activity:
-            day_key = timezone.localdate().isoformat()
-            activity = tracking.activity_by_date or {}
-            activity[day_key] = int(activity.get(day_key, 0)) + 1
-            tracking.activity_by_date = activity
-            tracking.last_activity_at = now
-
-        tracking.save()
+            if selected_path_id is not None:
+                tracking.selected_path = path
+
+            if selected_language in {"english", "bangla", "hindi"}:
+                tracking.selected_language = selected_language
+
+            if isinstance(completed_sub_map_ids, list) or has_delta:
+                structure = get_course_structure(course.id, course.tree_version)
+                if isinstance(completed_sub_map_ids, list):
+                    set_completed_ids(
+                        tracking, structure.valid_sub_map_ids(_int_ids(completed_sub_map_ids)), structure
+                    )
+                if has_delta:
+                    # Delta form: only the supplied ids are checked against the course.
+                    apply_completed_delta(
+                        tracking,
+                        structure.valid_sub_map_ids(_int_ids(add_ids or [])),
+                        _int_ids(remove_ids or []),
+                        structure,
+                    )
+
+            now = timezone.now()
+            tracking.last_accessed_at = now
+            if track_activity:
+                # The day's DailyActivity row is incremented by course_progress_changed.
+                tracking.last_activity_at = now
+
+            tracking.save()
+        course_progress_changed(
+            request.user, course.id, activity=track_activity, tree_version=course.tree_version
+        )
         return Response(
             {
                 "course_id": course.id,
                 "selected_path_id": tracking.selected_path_id,
                 "selected_language": tracking.selected_language,
-                "completed_sub_map_ids": tracking.completed_sub_map_ids or [],
+                "completed_sub_map_ids": _completed_ids(tracking),
                 "last_accessed_at": tracking.last_accessed_at,
                 "last_activity_at": tracking.last_activity_at,
             }
@@ -320,13 +457,7 @@ class CourseViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=["post"], url_path="ai-generate")
     def ai_generate(self, request):
         skill = request.data.get("skill")
-        selected_language = str(request.data.get("selected_language", "english")).lower()
-        language_map = {
-            "english": "English",
-            "bangla": "Bangla",
-            "hindi": "Hindi",
-        }
-        preferred_language = language_map.get(selected_language, "English")
+        preferred_language = _preferred_language(request)
 
         if not skill:
             return Response(
@@ -335,92 +466,157 @@ class CourseViewSet(viewsets.ModelViewSet):
             )
 
         # 1️⃣ Check DB (cache)
-        existing = CourseCard.objects.filter(
-            title__icontains=skill
-        ).first()
+        existing = _find_cached_course(skill, preferred_language)
         if existing:
-            has_requested_language = Resource.objects.filter(
-                sub_map__roadmap__path__course=existing,
-                language=preferred_language,
-            ).exists()
-            if has_requested_language:
-                serializer = self.get_serializer(existing)
-                return Response(serializer.data)
-
-        # 2️⃣ Call Grok AI
-        try:
-            ai_data = generate_skill_course(skill, preferred_language=preferred_language)
-        except Exception as e:
+            serializer = self.get_serializer(existing)
+            return Response(serializer.data)
+
+        # 2️⃣ Job mode: queue generation (or join the in-flight one) and let the client poll
+        if _wants_job(request):
+            return _job_accepted(request, enqueue_generation_job(skill, preferred_language))
+
+        # 3️⃣ Call Grok AI, unless the same skill + language is already being generated
+        job, is_leader = start_generation_job(skill, preferred_language)
+        if is_leader:
+            # A job that finished just before ours started may already have saved the course.
+            existing = _find_cached_course(skill, preferred_language)
+            if existing:
+                finish_job(job.id, course=existing)
+                return Response(self.get_serializer(existing).data)
+            # Saves CourseCard → Paths → Roadmaps → SubMaps → Resources in one transaction
+            job = run_generation_job(job)
+        else:
+            wait = getattr(settings, "COURSE_JOB_COALESCE_WAIT_SECONDS", 30)
+            job = wait_for_job(job, timeout=wait)
+            if job.status in ("queued", "running"):
+                return _job_accepted(request, job)
+
+        if job.status == "failed":
             return Response(
-                {"error": "AI generation failed", "details": str(e)},
+                {"error": "AI generation failed", "details": job.error},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
 
-        course_data = ai_data["course"]
-
-        # 3️⃣ Save CourseCard
-        course = CourseCard.objects.create(
-            title=course_data["title"],
-            description=course_data["description"],
-            overview=course_data["overview"],
-            icon=course_data.get("icon"),
-            category=course_data["category"],
-            level=course_data["level"],
-            students=course_data.get("students", "1M+ learners worldwide"),
-            duration=course_data["duration"],
-            rating=course_data.get("rating", 4.5),
-            color=course_data["color"],
-            tags=course_data.get("tags", []),
-            career_opportunities=course_data.get("career_opportunities", []),
-            tools_needed=course_data.get("tools_needed", []),
-            special_features=course_data.get("special_features", []),
-        )
-
-        # 4️⃣ Save Paths → Roadmaps → SubMaps → Resources
-        sorted_paths = sorted(
-            ai_data["paths"],
-            key=_path_level_sort_key,
+        serializer = self.get_serializer(job.course)
+        return Response(
+            serializer.data,
+            status=status.HTTP_201_CREATED if is_leader else status.HTTP_200_OK,
         )
 
-        for path_data in sorted_paths:
-            path = Path.objects.create(
-                course=course,
-                title=path_data["title"],
-                mini_desc=path_data["mini_desc"],
-                level=path_data["level"],
-                duration=path_data["duration"],
+    @action(detail=False, methods=["post"], url_path="ai-generate/stream")
+    def ai_generate_stream(self, request):
+        """
+        Server-sent events version of ai-generate: "course", "path" and "stage"
+        events as the LLM output arrives, "retry" when an attempt is abandoned,
+        then "done" with the saved course_id (or "error"). Events identify
+        paths by their index in the LLM output; "done" maps each of those
+        indexes to the saved path's id (path_ids), since paths are saved
+        sorted by level.
+        """
+        skill = request.data.get("skill")
+        preferred_language = _preferred_language(request)
+        if not skill:
+            return Response(
+                {"error": "Skill is required"},
+                status=status.HTTP_400_BAD_REQUEST
             )
 
-            for rm_data in path_data["roadmaps"]:
-                roadmap = Roadmap.objects.create(
-                    path=path,
-                    title=rm_data["title"],
-                    micro_desc=rm_data["micro_desc"],
-                    duration=rm_data["duration"],
-                )
+        def follow(job):
+            # Another request is generating this skill: relay its job status instead.
+            yield _sse("waiting", serialize_job(job))
+            last_progress = job.progress
+            while job.status in ("queued", "running"):
+                time.sleep(1)
+                job.refresh_from_db()
+                if job.progress != last_progress:
+                    last_progress = job.progress
+                    yield _sse("job", serialize_job(job))
+            if job.status == "failed":
+                yield _sse("error", {"error": "AI generation failed", "details": job.error})
+            else:
+                yield _sse("done", {"course_id": job.course_id, "cached": False, "coalesced": True})
+
+        def event_stream():
+            # The body is produced after the middleware's request span has ended.
+            attributes = {"skills.skill": skill, "skills.language": preferred_language}
+            with tracing.span("ai_generate.stream", attributes):
+                yield from generate_events()
+
+        def generate_events():
+            existing = _find_cached_course(skill, preferred_language)
+            if existing:
+                yield _sse("done", {"course_id": existing.id, "cached": True})
+                return
+
+            job, is_leader = start_generation_job(skill, preferred_language)
+            if not is_leader:
+                yield from follow(job)
+                return
+
+            error = "Client disconnected"
+            course = None
+            path_order = None
+            try:
+                events = stream_skill_course(skill, preferred_language=preferred_language)
+                while True:
+                    try:
+                        event, data = next(events)
+                    except StopIteration as stop:
+                        ai_data = stop.value
+                        break
+                    except Exception as e:
+                        error = str(e) or e.__class__.__name__
+                        yield _sse("error", {"error": "AI generation failed", "details": str(e)})
+                        return
+                    if event == "path_order":
+                        path_order = data["path_indexes"]
+                    elif event == "retry":
+                        path_order = None
+                    yield _sse(event, data)
 
-                for sm_data in rm_data["sub_maps"]:
-                    sub_map = SubMap.objects.create(
-                        roadmap=roadmap,
-                        title=sm_data["title"],
-                        micro_desc=sm_data.get("micro_desc", "")
-                    )
+                try:
+                    course = save_generated_course(ai_data, skill=skill)
+                except Exception as e:
+                    error = str(e) or e.__class__.__name__
+                    raise
+                saved_ids = list(course.path_items.order_by("id").values_list("id", flat=True))
+                path_ids = [None] * len(saved_ids)
+                for position, index in enumerate(path_order or range(len(saved_ids))):
+                    path_ids[index] = saved_ids[position]
+                yield _sse("done", {"course_id": course.id, "cached": False, "path_ids": path_ids})
+            finally:
+                # Always release the skill, or waiting requests would block until it goes stale.
+                if course is not None:
+                    finish_job(job.id, course=course)
+                else:
+                    finish_job(job.id, error=error)
 
-                    for res in sm_data.get("resources", []):
-                        Resource.objects.create(
-                            sub_map=sub_map,
-                            language=res["language"],
-                            link_type=res["link_type"],
-                            link=res.get("link")
-                        )
+        response = StreamingHttpResponse(event_stream(), content_type="text/event-stream")
+        response["Cache-Control"] = "no-cache"
+        response["X-Accel-Buffering"] = "no"
+        return response
 
-        serializer = self.get_serializer(course)
-        return Response(serializer.data, status=status.HTTP_201_CREATED)
+    @action(
+        detail=False,
+        methods=["get"],
+        url_path=r"ai-generate/jobs/(?P<job_id>[0-9a-f-]{36})",
+    )
+    def ai_generate_job(self, request, job_id=None):
+        """Status of a queued ai-generate job: stage, percent progress and course_id once done."""
+        job = CourseGenerationJob.objects.filter(pk=job_id).first()
+        if job is None:
+            return Response(
+                {"error": "Generation job not found"},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+        return Response(serialize_job(job))
 
 
 
-class PathViewSet(viewsets.ModelViewSet):
+class PathViewSet(SkillTreeMixin, viewsets.ModelViewSet):
     queryset = Path.objects.all().prefetch_related('roadmaps__sub_maps__resources')
+    tree_levels = TREE_LEVELS[1:]
+    query_budgets = {"list": 5, "retrieve": 5, "stage_progress": 7}
     serializer_class = PathSerializer
     permission_classes = [AllowAny]
 
@@ -430,25 +626,28 @@ class PathViewSet(viewsets.ModelViewSet):
         path = self.get_object()
         if not request.user.is_authenticated:
             return Response({"passed_roadmap_ids": []})
+        roadmap_ids = get_course_structure(path.course_id).roadmap_ids_for_path(path.id)
         passed = StageProgress.objects.filter(
             user=request.user,
-            roadmap__path_id=path.id,
+            roadmap_id__in=list(roadmap_ids),
         ).values_list("roadmap_id", flat=True)
         return Response({"passed_roadmap_ids": list(passed)})
 
 
-class RoadmapViewSet(viewsets.ModelViewSet):
+class RoadmapViewSet(SkillTreeMixin, viewsets.ModelViewSet):
     queryset = Roadmap.objects.all().prefetch_related('sub_maps__resources')
+    tree_levels = TREE_LEVELS[2:]
+    # submit_exam: a first pass may also backfill the learner's dashboard stats (20 queries otherwise).
+    query_budgets = {"list": 4, "retrieve": 4, "get_exam": 10, "submit_exam": 24}
     serializer_class = RoadmapSerializer
     permission_classes = [AllowAny]
 
     @action(detail=True, methods=["get"], url_path="exam")
     def get_exam(self, request, pk=None):
-        """Generate a fresh AI exam (MC + short answer) for this roadmap every time."""
-        import uuid
+        """Sample a fresh exam (MC + short answer) from this roadmap's question bank."""
         roadmap = self.get_object()
         try:
-            questions_data = generate_exam_for_roadmap(roadmap)
+            questions_data = sample_exam(roadmap)
         except Exception as e:
             return Response(
                 {"error": "Failed to generate exam", "details": str(e)},
@@ -459,12 +658,7 @@ class RoadmapViewSet(viewsets.ModelViewSet):
                 {"error": "No questions generated"},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR,
             )
-        session_key = str(uuid.uuid4())
-        ExamSession.objects.create(
-            session_key=session_key,
-            roadmap=roadmap,
-            questions_json=questions_data,
-        )
+        session_key = issue_exam_session(roadmap, questions_data)
         questions = []
         for i, q in enumerate(questions_data):
             out = {
@@ -484,8 +678,18 @@ class RoadmapViewSet(viewsets.ModelViewSet):
 
     @action(detail=True, methods=["post"], url_path="exam/submit")
     def submit_exam(self, request, pk=None):
-        """Submit answers. Body: { "session_key": "...", "answers": [0, "text", ...] }. Returns passed, score."""
-        roadmap = self.get_object()
+        """
+        Submit answers. Body: { "session_key": "...", "answers": [0, "text", ...] }. Returns passed, score.
+        With signed exam sessions the roadmap is not loaded: the key is bound to its id.
+        Each session_key is graded once; resubmitting it answers 404.
+        """
+        try:
+            roadmap_id = int(pk)
+        except (TypeError, ValueError):
+            return Response(
+                {"error": "Roadmap not found"},
+                status=status.HTTP_404_NOT_FOUND,
+            )
         session_key = request.data.get("session_key")
         answers = request.data.get("answers")
         if not session_key:
@@ -498,16 +702,12 @@ class RoadmapViewSet(viewsets.ModelViewSet):
                 {"error": "answers array required"},
                 status=status.HTTP_400_BAD_REQUEST,
             )
-        try:
-            session = ExamSession.objects.get(
-                session_key=session_key, roadmap=roadmap
-            )
-        except ExamSession.DoesNotExist:
+        questions = load_exam_session(roadmap_id, str(session_key))
+        if questions is None:
             return Response(
                 {"error": "Exam session not found or expired. Start a new exam."},
                 status=status.HTTP_404_NOT_FOUND,
             )
-        questions = session.questions_json
         if len(answers) != len(questions):
             return Response(
                 {"error": "Answer count does not match question count"},
@@ -586,11 +786,32 @@ class RoadmapViewSet(viewsets.ModelViewSet):
             review.append(item)
         score = correct / len(questions) if questions else 0
         passed = score >= EXAM_PASS_THRESHOLD
+        if not close_exam_session(session_key):
+            # Already submitted: a replay must not be graded or reveal the answers again.
+            return Response(
+                {"error": "Exam session not found or expired. Start a new exam."},
+                status=status.HTTP_404_NOT_FOUND,
+            )
         if passed and request.user.is_authenticated:
-            StageProgress.objects.get_or_create(
-                user=request.user, roadmap=roadmap
+            # The signed key outlives its roadmap: check it still exists before recording the pass.
+            course = (
+                Roadmap.objects.filter(pk=roadmap_id)
+                .values_list("path__course_id", "path__course__tree_version")
+                .first()
             )
-        session.delete()
+            if course is None:
+                return Response(
+                    {"error": "Roadmap not found"},
+                    status=status.HTTP_404_NOT_FOUND,
+                )
+            _, created = StageProgress.objects.get_or_create(
+                user=request.user, roadmap_id=roadmap_id
+            )
+            if created:
+                course_id, tree_version = course
+                course_progress_changed(
+                    request.user, course_id, activity=True, tree_version=tree_version
+                )
         return Response({
             "passed": passed,
             "score": round(score * 100),
@@ -600,14 +821,17 @@ class RoadmapViewSet(viewsets.ModelViewSet):
         })
 
 
-class SubMapViewSet(viewsets.ModelViewSet):
+class SubMapViewSet(SkillTreeMixin, viewsets.ModelViewSet):
     queryset = SubMap.objects.all().prefetch_related('resources')
+    tree_levels = TREE_LEVELS[3:]
+    query_budgets = {"list": 3, "retrieve": 3}
     serializer_class = SubMapSerializer
     permission_classes = [AllowAny]
 
 
-class ResourceViewSet(viewsets.ModelViewSet):
+class ResourceViewSet(SkillTreeMixin, viewsets.ModelViewSet):
     queryset = Resource.objects.all()
+    query_budgets = {"list": 2, "retrieve": 2}
     serializer_class = ResourceSerializer
     permission_classes = [AllowAny]
 